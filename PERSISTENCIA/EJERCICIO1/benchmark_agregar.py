@@ -0,0 +1,48 @@
+import json
+import os
+import sys
+import tempfile
+
+from charango import Charango, ArchivoCharango
+from almacenamiento import medir
+
+# Uso: python benchmark_agregar.py [N] [N_ANTERIOR]
+# N          -> cantidad de inserciones con el diario (por defecto 100000)
+# N_ANTERIOR -> inserciones con el método anterior (cargar + guardar todo).
+#               Es O(N²): con 100000 tardaría horas, así que se mide con menos
+#               registros y se extrapola cuadráticamente.
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+N_ANTERIOR = int(sys.argv[2]) if len(sys.argv) > 2 else 3_000
+
+
+def agregar_anterior(charango):
+    """Implementación original de ArchivoCharango.agregar (reescribe todo el archivo)."""
+    lista = ArchivoCharango.cargar()
+    lista.append(charango)
+    with open(ArchivoCharango.archivo, "w") as f:
+        json.dump([c.to_dict() for c in lista], f, indent=4)
+
+
+def insertar(funcion, n):
+    for i in range(n):
+        funcion(Charango(f"Material{i % 7}", [i % 2 == 0] * 10))
+
+
+with tempfile.TemporaryDirectory() as carpeta:
+    ArchivoCharango.archivo = os.path.join(carpeta, "anterior.json")
+    ArchivoCharango.diario = os.path.join(carpeta, "anterior.jsonl")
+    t_anterior, _ = medir(lambda: insertar(agregar_anterior, N_ANTERIOR))
+
+    ArchivoCharango.archivo = os.path.join(carpeta, "charangos.json")
+    ArchivoCharango.diario = os.path.join(carpeta, "charangos.jsonl")
+    t_diario, _ = medir(lambda: insertar(ArchivoCharango.agregar, N))
+
+    t_cargar, charangos = medir(ArchivoCharango.cargar)
+    total = len(charangos)
+
+estimado = t_anterior * (N / N_ANTERIOR) ** 2
+print(f"Antes  (cargar+guardar): {N_ANTERIOR} inserciones en {t_anterior:.2f} s "
+      f"-> {N} estimadas en {estimado:.0f} s")
+print(f"Ahora  (diario JSONL):   {N} inserciones en {t_diario:.2f} s "
+      f"({N / t_diario:,.0f} inserciones/s)")
+print(f"Cargar (instantánea + diario): {total} charangos en {t_cargar:.2f} s")
@@ -1,7 +1,13 @@
 import json
 import os
+import sys
+
+# --- Persistencia compartida (carpeta PERSISTENCIA/almacenamiento) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from almacenamiento import BackendJSON, escribir_atomico
 
 class Charango:
+    __slots__ = ("material", "cuerdas", "nroCuerdas")
     def __init__(self, material, cuerdas):
         self.material = material
         self.cuerdas = cuerdas
@@ -24,28 +30,117 @@ class Charango:
 
 class ArchivoCharango:
     archivo = "charangos.json"
+    # Diario de altas (JSON Lines): un charango por línea, solo se agrega al final
+    diario = "charangos.jsonl"
+    # Tamaño mínimo (bytes) del diario antes de compactarlo automáticamente
+    limite_diario = 64 * 1024
 
     # Cargar archivo
     @staticmethod
     def cargar():
-        if not os.path.exists(ArchivoCharango.archivo):
-            return []
-        with open(ArchivoCharango.archivo, "r") as f:
-            data = json.load(f)
-            return [Charango.from_dict(d) for d in data]
+        return list(ArchivoCharango.iterar())
+
+    # Recorrer de a un charango sin armar la lista completa
+    @staticmethod
+    def iterar():
+        ArchivoCharango._terminar_guardado()
+        for d in BackendJSON().iterar(ArchivoCharango.archivo):
+            yield Charango.from_dict(d)
+        # Reproducir el diario sobre la última instantánea
+        if os.path.exists(ArchivoCharango.diario):
+            with open(ArchivoCharango.diario, "r") as f:
+                for linea in f:
+                    try:
+                        yield Charango.from_dict(json.loads(linea))
+                    except json.JSONDecodeError:
+                        # Línea incompleta (corte durante la escritura): se saltea y se sigue con las demás
+                        continue
 
-    # Guardar en archivo
+    # Guardar en archivo (reescribe la instantánea y vacía el diario)
     @staticmethod
     def guardar(lista):
-        with open(ArchivoCharango.archivo, "w") as f:
+        # La instantánea nueva ya incluye el diario. Primero se escribe completa en
+        # "<archivo>.nuevo" (temporal + rename: nunca queda a medias); recién
+        # después se borra el diario y se reemplaza la anterior. Si un corte deja
+        # el .nuevo, el próximo uso termina el guardado en vez de reproducir el
+        # diario sobre una instantánea que ya lo contiene.
+        with escribir_atomico(ArchivoCharango._instantanea_nueva()) as f:
             json.dump([c.to_dict() for c in lista], f, indent=4)
+        ArchivoCharango._terminar_guardado()
 
-    # Agregar objeto
+    # Agregar objeto: O(1) en E/S, solo añade una línea al diario
     @staticmethod
     def agregar(charango):
-        lista = ArchivoCharango.cargar()
-        lista.append(charango)
-        ArchivoCharango.guardar(lista)
+        ArchivoCharango._reparar_diario()
+        with open(ArchivoCharango.diario, "a") as f:
+            f.write(json.dumps(charango.to_dict()) + "\n")
+        if ArchivoCharango._debe_compactar():
+            ArchivoCharango.compactar()
+
+    # Agregar varios: una sola apertura del diario y a lo sumo una compactación
+    @staticmethod
+    def agregarLote(charangos):
+        ArchivoCharango._reparar_diario()
+        with open(ArchivoCharango.diario, "a") as f:
+            lineas = [json.dumps(c.to_dict()) + "\n" for c in charangos]
+            f.writelines(lineas)
+        if ArchivoCharango._debe_compactar():
+            ArchivoCharango.compactar()
+        return {"guardados": len(lineas)}
+
+    # Vuelca el diario en la instantánea
+    @staticmethod
+    def compactar():
+        ArchivoCharango.guardar(ArchivoCharango.cargar())
+
+    @staticmethod
+    def _instantanea_nueva():
+        return ArchivoCharango.archivo + ".nuevo"
+
+    @staticmethod
+    def _terminar_guardado():
+        # Un .nuevo completo es un guardado confirmado: el diario ya está adentro
+        nueva = ArchivoCharango._instantanea_nueva()
+        if not os.path.exists(nueva):
+            return
+        if os.path.exists(ArchivoCharango.diario):
+            os.remove(ArchivoCharango.diario)
+        os.replace(nueva, ArchivoCharango.archivo)
+
+    @staticmethod
+    def _reparar_diario():
+        ArchivoCharango._terminar_guardado()
+        # Si un corte dejó la última línea a medias, se recorta antes de agregar:
+        # si no, la línea nueva quedaría pegada a esa y también se perdería
+        if not os.path.exists(ArchivoCharango.diario):
+            return
+        with open(ArchivoCharango.diario, "rb+") as f:
+            tam = f.seek(0, os.SEEK_END)
+            if tam == 0:
+                return
+            f.seek(tam - 1)
+            if f.read(1) == b"\n":
+                return
+            # Se busca hacia atrás el último salto de línea completo
+            fin = tam
+            while fin > 0:
+                inicio = max(0, fin - 4096)
+                f.seek(inicio)
+                bloque = f.read(fin - inicio)
+                pos = bloque.rfind(b"\n")
+                if pos != -1:
+                    f.truncate(inicio + pos + 1)
+                    return
+                fin = inicio
+            f.truncate(0)
+
+    @staticmethod
+    def _debe_compactar():
+        # Se compacta cuando el diario supera a la instantánea: cada compactación
+        # reescribe a lo sumo el doble de lo agregado, así agregar sigue siendo O(1) amortizado
+        tam_diario = os.path.getsize(ArchivoCharango.diario)
+        tam_base = os.path.getsize(ArchivoCharango.archivo) if os.path.exists(ArchivoCharango.archivo) else 0
+        return tam_diario > max(tam_base, ArchivoCharango.limite_diario)
 
     # b) Eliminar charangos con más de 6 cuerdas malas
     @staticmethod
@@ -57,14 +152,14 @@ class ArchivoCharango:
     # c) Listar por material
     @staticmethod
     def listar_material(mat):
-        for c in ArchivoCharango.cargar():
+        for c in ArchivoCharango.iterar():
             if c.material.lower() == mat.lower():
                 print(c.to_dict())
 
     # d) Buscar con 10 cuerdas
     @staticmethod
     def buscar_10():
-        for c in ArchivoCharango.cargar():
+        for c in ArchivoCharango.iterar():
             if c.nroCuerdas == 10:
                 print(c.to_dict())
 
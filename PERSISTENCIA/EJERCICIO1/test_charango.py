@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from charango import Charango, ArchivoCharango
+
+# Uso: python -m pytest test_charango.py (desde EJERCICIO1)
+# Compactar el diario no puede duplicar charangos aunque el programa se corte a mitad.
+
+
+@pytest.fixture(autouse=True)
+def rutas(tmp_path, monkeypatch):
+    monkeypatch.setattr(ArchivoCharango, "archivo", str(tmp_path / "charangos.json"))
+    monkeypatch.setattr(ArchivoCharango, "diario", str(tmp_path / "charangos.jsonl"))
+
+
+def materiales():
+    return [c.material for c in ArchivoCharango.cargar()]
+
+
+def preparar():
+    ArchivoCharango.guardar([Charango("Naranjillo", [True] * 10)])
+    ArchivoCharango.agregarLote([Charango("Cedro", [True] * 10), Charango("Nogal", [False] * 10)])
+    assert os.path.exists(ArchivoCharango.diario)
+
+
+def test_corte_despues_de_escribir_la_instantanea_nueva(monkeypatch):
+    preparar()
+    with monkeypatch.context() as m:
+        m.setattr(ArchivoCharango, "_terminar_guardado", staticmethod(lambda: None))  # corte antes de tocar el diario
+        ArchivoCharango.compactar()
+    assert materiales() == ["Naranjillo", "Cedro", "Nogal"]
+    assert not os.path.exists(ArchivoCharango.diario)
+
+
+def test_corte_despues_de_borrar_el_diario(monkeypatch):
+    preparar()
+    reemplazar = os.replace
+    with monkeypatch.context() as m:
+        m.setattr(os, "replace", lambda a, b: reemplazar(a, b) if not a.endswith(".nuevo") else None)
+        ArchivoCharango.compactar()  # diario borrado, .nuevo sin mover
+    assert not os.path.exists(ArchivoCharango.diario)
+    ArchivoCharango.agregar(Charango("Pino", [True] * 10))
+    assert materiales() == ["Naranjillo", "Cedro", "Nogal", "Pino"]
+
+
+def test_compactacion_automatica_no_duplica(monkeypatch):
+    monkeypatch.setattr(ArchivoCharango, "limite_diario", 0)
+    for i in range(20):
+        ArchivoCharango.agregar(Charango(f"Material{i}", [True] * 10))
+    assert materiales() == [f"Material{i}" for i in range(20)]
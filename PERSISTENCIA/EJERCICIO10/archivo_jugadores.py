@@ -1,30 +1,119 @@
 from jugador import Jugador
+from indice_jugadores import IndiceJugadores
+from escaner_jugadores import EscanerJugadores
+from ranking_jugadores import RankingJugadores
+from nombres_jugadores import NombresJugadores
 import os
 
 class ArchivoJugadores:
     def __init__(self, archivo="jugadores.txt"):
         self.archivo = archivo
+        self.indice = IndiceJugadores(archivo) # nombre -> offset de la línea (jugadores.txt.idx)
+        self.ranking = RankingJugadores(archivo, self.indice) # puestos por puntaje (jugadores.txt.rank)
+        self.nombres = NombresJugadores(self.indice) # prefijos y nombres parecidos, en memoria
 
     def guardar(self, jugador):
-        with open(self.archivo, "a") as f:
-            f.write(jugador.to_line())
+        # Se escribe en binario para conocer el offset exacto de la línea
+        linea = jugador.to_line().replace("\n", os.linesep).encode("utf-8")
+        with open(self.archivo, "ab") as f:
+            offset = f.tell()
+            f.write(linea)
+        self.indice.registrar(jugador.nombre, offset, linea)
+        self.ranking.registrar(offset, linea, jugador)
+
+    def guardarMuchos(self, jugadores):
+        """Agrega varios jugadores con una sola apertura del archivo y del índice."""
+        entradas = []
+        with open(self.archivo, "ab") as f:
+            offset = f.tell()
+            for jugador in jugadores:
+                linea = jugador.to_line().replace("\n", os.linesep).encode("utf-8")
+                f.write(linea)
+                entradas.append((offset, linea, jugador))
+                offset += len(linea)
+        self.indice.registrar_lote([(o, l, j.nombre) for o, l, j in entradas])
+        self.ranking.registrar_lote(entradas)
+        return {"guardados": len(entradas)}
 
     def mostrar_todos(self):
         if not os.path.exists(self.archivo):
             print("No hay jugadores registrados.")
             return
-        with open(self.archivo, "r") as f:
-            for linea in f:
-                print(Jugador.from_line(linea))
+        # Por bloques con mmap y una escritura por bloque, sin un print ni un Jugador por línea
+        EscanerJugadores(self.archivo).volcar()
 
     def buscar(self, nombre):
         if not os.path.exists(self.archivo):
             print("Archivo no encontrado.")
             return
-        with open(self.archivo, "r") as f:
-            for linea in f:
-                jugador = Jugador.from_line(linea)
-                if jugador.nombre.lower() == nombre.lower():
-                    print("\nJugador encontrado:\n", jugador)
-                    return
+        jugador = self._buscar_por_indice(nombre)
+        if jugador:
+            print("\nJugador encontrado:\n", jugador)
+            return
         print("No se encontró al jugador.")
+
+    def buscar_prefijo(self, p, limit=10):
+        """Jugadores cuyo nombre empieza con p (sin distinguir mayúsculas), en orden alfabético."""
+        if not os.path.exists(self.archivo):
+            return []
+        leidos = (self._leer_en(offset) for _, offset in self.nombres.prefijo(p, limit))
+        return [j for j in leidos if j]
+
+    def buscar_aproximado(self, nombre, max_dist=2, limit=10):
+        """(distancia, jugador) de los nombres a lo sumo a max_dist ediciones de nombre, los más cercanos primero."""
+        if not os.path.exists(self.archivo):
+            return []
+        leidos = ((d, self._leer_en(offset)) for d, _, offset in self.nombres.aproximado(nombre, max_dist, limit))
+        return [(d, j) for d, j in leidos if j]
+
+    def reconstruir_indice(self):
+        """Regenera el índice de nombres (si falta, está dañado o quedó desactualizado)."""
+        self.indice.reconstruir()
+        self.ranking.reconstruir()
+        print(f"Índice reconstruido: {len(self.indice.offsets)} nombres.")
+
+    def mostrar_ranking(self, n=10):
+        jugadores = self.ranking.top(n)
+        if not jugadores:
+            print("No hay jugadores registrados.")
+            return
+        for puesto, jugador in enumerate(jugadores, 1):
+            print(f"{puesto}. {jugador}")
+
+    def mostrar_posicion(self, nombre):
+        resultado = self.ranking.posicion(nombre)
+        if resultado is None:
+            print("No se encontró al jugador.")
+            return
+        puesto, jugador = resultado
+        print(f"\nPuesto {puesto} de {self.ranking.total()}:\n", jugador)
+
+    def mostrar_top_nivel(self, nivel, n=10):
+        jugadores = self.ranking.top_por_nivel(nivel, n)
+        if not jugadores:
+            print("No hay jugadores en ese nivel.")
+            return
+        for puesto, jugador in enumerate(jugadores, 1):
+            print(f"{puesto}. {jugador}")
+
+    def _leer_en(self, offset):
+        """Lee directamente la línea que empieza en offset."""
+        with open(self.archivo, "rb") as f:
+            f.seek(offset)
+            linea = f.readline()
+        try:
+            return Jugador.from_line(linea)  # también un byte inválido en UTF-8 es ValueError
+        except ValueError:
+            return None
+
+    def _buscar_por_indice(self, nombre):
+        for _ in range(2):
+            offset = self.indice.buscar(nombre)
+            if offset is None:
+                return None
+            jugador = self._leer_en(offset)
+            if jugador and jugador.nombre.lower() == nombre.lower():
+                return jugador
+            # El archivo cambió por fuera: el índice apunta mal, se regenera y se reintenta
+            self.indice.reconstruir()
+        return None
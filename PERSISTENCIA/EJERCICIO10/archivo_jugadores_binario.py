@@ -0,0 +1,178 @@
+from jugador import Jugador
+import mmap
+import os
+import sys
+
+MAGIA = b"JUG1" # Primeros bytes del archivo: identifican el formato y su versión
+
+
+class ArchivoJugadoresBinario:
+    """Jugadores en registros binarios (ver Jugador.to_bytes) en lugar de líneas con comas.
+
+    El nombre va precedido de su largo, así que puede contener comas o saltos de
+    línea, y leer un registro no parsea texto ni convierte enteros. Las lecturas
+    usan mmap: el sistema operativo trae las páginas a demanda y no hay una copia
+    del archivo en memoria de Python. Solo se agregan registros al final.
+    """
+
+    def __init__(self, archivo="jugadores.bin"):
+        self.archivo = archivo
+        self.offsets = None # nombre en minúsculas -> offset de su primer registro (se arma al primer uso)
+        self.cubierto = len(MAGIA) # bytes del archivo ya indexados
+        self._f = None
+        self._mm = None
+        self._id = None # (dispositivo, inodo) del archivo mapeado
+
+    def guardar(self, jugador):
+        self.guardarMuchos([jugador])
+
+    def guardarMuchos(self, jugadores):
+        """Agrega varios jugadores con una sola escritura."""
+        registros = [(j.nombre.lower(), j.to_bytes()) for j in jugadores]
+        self._asegurar_indice()
+        with open(self.archivo, "ab") as f:
+            if f.tell() == 0:
+                f.write(MAGIA)
+            elif f.tell() > self.cubierto:
+                # Registro a medio escribir al final (corte): se descarta, sin mapas abiertos sobre esa parte
+                self.cerrar()
+                f.truncate(self.cubierto)
+                f.seek(self.cubierto)
+            offset = f.tell()
+            f.write(b"".join(r for _, r in registros))
+        for nombre, registro in registros:
+            self.offsets.setdefault(nombre, offset)
+            offset += len(registro)
+        self.cubierto = offset
+        return {"guardados": len(registros)}
+
+    def iterar(self):
+        """Recorre los jugadores en el orden del archivo."""
+        m = self._mapa()
+        if m is None:
+            return
+        for _, _, jugador in _registros(m, len(MAGIA)):
+            yield jugador
+
+    def mostrar_todos(self):
+        if not os.path.exists(self.archivo):
+            print("No hay jugadores registrados.")
+            return
+        for jugador in self.iterar():
+            print(jugador)
+
+    def buscar(self, nombre):
+        if not os.path.exists(self.archivo):
+            print("Archivo no encontrado.")
+            return
+        jugador = self._buscar_por_indice(nombre)
+        if jugador:
+            print("\nJugador encontrado:\n", jugador)
+            return
+        print("No se encontró al jugador.")
+
+    def cerrar(self):
+        """Libera el mapa y el descriptor (se vuelven a abrir solos en la próxima lectura)."""
+        if self._mm is not None:
+            self._mm.close()
+        if self._f is not None:
+            self._f.close()
+        self._f = self._mm = None
+
+    def _buscar_por_indice(self, nombre):
+        m = self._asegurar_indice()
+        offset = self.offsets.get(nombre.lower())
+        if offset is None:
+            return None
+        return Jugador.from_bytes(m, offset)[0]
+
+    def _asegurar_indice(self):
+        """Arma el índice o lo completa con los registros agregados por fuera; retorna el mapa vigente."""
+        m = self._mapa()
+        if self.offsets is None:
+            self.offsets, self.cubierto = {}, len(MAGIA)
+        if m is not None:
+            for offset, fin, jugador in _registros(m, self.cubierto):
+                self.offsets.setdefault(jugador.nombre.lower(), offset)
+                self.cubierto = fin
+        return m
+
+    def _mapa(self):
+        """mmap de solo lectura del archivo completo, al día con su tamaño; None si todavía no tiene registros."""
+        try:
+            st = os.stat(self.archivo)
+        except FileNotFoundError:
+            self.cerrar()
+            self._id = self.offsets = None
+            return None
+        if self._id != (st.st_dev, st.st_ino):
+            # El archivo se reemplazó (p. ej. con convertir_desde_texto): el índice ya no sirve
+            self.cerrar()
+            self._id, self.offsets = (st.st_dev, st.st_ino), None
+        if self._f is None:
+            self._f = open(self.archivo, "rb")
+        if st.st_size <= len(MAGIA):
+            return None
+        if self._mm is None or len(self._mm) != st.st_size:
+            # El mapa anterior no se cierra: lo puede estar usando un iterar() en curso
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._mm[:len(MAGIA)] != MAGIA:
+                raise ValueError(f"'{self.archivo}' no es un archivo de jugadores binario.")
+        return self._mm
+
+
+def _registros(m, desde):
+    """(offset, fin, jugador) de cada registro completo a partir de 'desde'.
+
+    Es Jugador.from_bytes desenrollado: en un recorrido completo la llamada y el
+    try por registro se notan.
+    """
+    unpack, tam, total = Jugador.CABECERA.unpack_from, Jugador.CABECERA.size, len(m)
+    pos = desde
+    while pos + tam <= total:
+        nivel, puntaje, largo = unpack(m, pos)
+        inicio = pos + tam
+        fin = inicio + largo
+        if fin > total:
+            return # Registro a medio escribir
+        yield pos, fin, Jugador(m[inicio:fin].decode("utf-8"), nivel, puntaje)
+        pos = fin
+
+
+def convertir_desde_texto(origen="jugadores.txt", destino="jugadores.bin"):
+    """Genera el archivo binario a partir del de texto, en el mismo orden.
+
+    Una línea con más de dos comas se interpreta como un nombre que contiene comas
+    (nivel y puntaje son siempre los dos últimos campos). Las líneas que ni así se
+    pueden leer se saltean y se informan por número.
+    """
+    convertidos, recuperados, invalidas = 0, 0, []
+    temporal = destino + ".tmp"
+    try:
+        with open(origen, "r", encoding="utf-8") as entrada, open(temporal, "wb") as salida:
+            salida.write(MAGIA)
+            for nro, linea in enumerate(entrada, 1):
+                linea = linea.rstrip("\r\n")
+                if not linea.strip():
+                    continue
+                try:
+                    jugador = Jugador.from_line(linea)
+                    salida.write(jugador.to_bytes())
+                except ValueError:
+                    invalidas.append(nro)
+                    continue
+                convertidos += 1
+                recuperados += "," in jugador.nombre
+        os.replace(temporal, destino) # El binario anterior (si había) se reemplaza entero o no se toca
+    finally:
+        if os.path.exists(temporal): # La conversión falló a mitad: no queda un .tmp a medio escribir
+            os.remove(temporal)
+    return {"convertidos": convertidos, "nombres_con_comas": recuperados, "lineas_invalidas": invalidas}
+
+
+if __name__ == "__main__":
+    # Uso: python archivo_jugadores_binario.py [jugadores.txt] [jugadores.bin]
+    reporte = convertir_desde_texto(*sys.argv[1:3])
+    print(f"Convertidos: {reporte['convertidos']} (con comas en el nombre: {reporte['nombres_con_comas']})")
+    if reporte["lineas_invalidas"]:
+        print(f"Líneas que no se pudieron leer: {reporte['lineas_invalidas']}")
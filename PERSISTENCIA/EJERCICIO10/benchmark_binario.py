@@ -0,0 +1,49 @@
+import os
+import random
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jugador import Jugador
+from archivo_jugadores import ArchivoJugadores
+from archivo_jugadores_binario import ArchivoJugadoresBinario, convertir_desde_texto
+from almacenamiento import medir
+
+# Uso: python benchmark_binario.py [JUGADORES] [BUSQUEDAS]
+# Compara jugadores.txt (líneas con comas + índice .idx) con el formato binario
+# (registros con largo + mmap): recorrido completo y búsquedas por nombre.
+N_JUGADORES = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+N_BUSQUEDAS = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+
+
+def recorrer_texto(ruta):
+    with open(ruta, "r", encoding="utf-8") as f:
+        return sum(1 for linea in f if Jugador.from_line(linea))
+
+
+with tempfile.TemporaryDirectory() as carpeta:
+    txt, binario = os.path.join(carpeta, "jugadores.txt"), os.path.join(carpeta, "jugadores.bin")
+    ArchivoJugadores(txt).guardarMuchos(Jugador(f"Jugador{i}", i % 50, i * 7) for i in range(N_JUGADORES))
+    t_conv, _ = medir(lambda: convertir_desde_texto(txt, binario))
+
+    random.seed(1)
+    nombres = [f"Jugador{random.randrange(N_JUGADORES)}" for _ in range(N_BUSQUEDAS)]
+    arch_txt, arch_bin = ArchivoJugadores(txt), ArchivoJugadoresBinario(binario)
+    arch_txt._buscar_por_indice(nombres[0]) # Índices cargados antes de medir las búsquedas
+    arch_bin._buscar_por_indice(nombres[0])
+
+    filas = []
+    for nombre, arch, recorrer in (("texto (.txt + .idx)", arch_txt, lambda: recorrer_texto(txt)),
+                                   ("binario (mmap)", arch_bin, lambda: sum(1 for _ in arch_bin.iterar()))):
+        t_rec, n = medir(recorrer)
+        assert n == N_JUGADORES
+        t_bus, hallados = medir(lambda: [arch._buscar_por_indice(x) for x in nombres])
+        assert all(j is not None for j in hallados)
+        filas.append((nombre, os.path.getsize(arch.archivo), t_rec, t_bus))
+    arch_bin.cerrar()
+
+print(f"{N_JUGADORES:,} jugadores, {N_BUSQUEDAS:,} búsquedas por nombre; conversión txt -> bin: {t_conv:.2f} s")
+print(f"{'Formato':20} {'tamaño (MB)':>12} {'recorrido (reg/s)':>18} {'búsquedas/s':>12}")
+for nombre, tamano, t_rec, t_bus in filas:
+    print(f"{nombre:20} {tamano / 2**20:12.1f} {N_JUGADORES / t_rec:18,.0f} {N_BUSQUEDAS / t_bus:12,.0f}")
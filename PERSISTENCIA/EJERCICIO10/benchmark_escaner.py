@@ -0,0 +1,92 @@
+import heapq
+import os
+import sys
+import tempfile
+from collections import Counter
+from contextlib import redirect_stdout
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jugador import Jugador
+from escaner_jugadores import EscanerJugadores
+from almacenamiento import medir
+
+# Uso: python benchmark_escaner.py [GB] [MB_LINEA_A_LINEA]
+# Arma un jugadores.txt de GB gigabytes y mide, en registros por segundo:
+#   - agregados (top 10, conteo por nivel, histograma) con EscanerJugadores.resumen
+#     sobre el archivo completo;
+#   - lo mismo línea por línea con Jugador.from_line, y el listado con un print por
+#     jugador contra EscanerJugadores.volcar, sobre los primeros MB_LINEA_A_LINEA MB
+#     (línea por línea el archivo completo tardaría varios minutos).
+GB = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+MB_LINEA_A_LINEA = int(sys.argv[2]) if len(sys.argv) > 2 else 512
+MB_BLOQUE_DATOS = 64
+
+
+def generar(ruta, total_bytes):
+    """Escribe un bloque de ~64 MB de jugadores distintos y lo repite hasta llegar al tamaño pedido."""
+    lineas, tam, i = [], 0, 0
+    while tam < MB_BLOQUE_DATOS * 2**20:
+        linea = Jugador(f"Jugador{i}", i % 50, (i * 7919) % 1_000_000).to_line()
+        lineas.append(linea)
+        tam += len(linea)
+        i += 1
+    bloque = "".join(lineas).encode("utf-8")
+    with open(ruta, "wb") as f:
+        for _ in range(max(1, round(total_bytes / len(bloque)))):
+            f.write(bloque)
+    return len(lineas)
+
+
+def recortar(ruta, destino, mb):
+    """Copia los primeros mb megabytes de ruta (cortando en un salto de línea)."""
+    with open(ruta, "rb") as f:
+        crudo = f.read(mb * 2**20)
+    with open(destino, "wb") as f:
+        f.write(crudo[:crudo.rfind(b"\n") + 1])
+
+
+def agregados_linea_a_linea(ruta):
+    jugadores = 0
+    por_nivel, por_rango, top = Counter(), Counter(), []
+    with open(ruta, "r", encoding="utf-8") as f:
+        for pos, linea in enumerate(f):
+            j = Jugador.from_line(linea)
+            jugadores += 1
+            por_nivel[j.nivel] += 1
+            por_rango[j.puntaje // 100] += 1
+            heapq.heappush(top, (j.puntaje, -pos, j.nombre)) if len(top) < 10 else \
+                heapq.heappushpop(top, (j.puntaje, -pos, j.nombre))
+    return jugadores
+
+
+def listado_print(ruta):
+    with open(ruta, "r", encoding="utf-8") as f:
+        for linea in f:
+            print(Jugador.from_line(linea))
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as carpeta:
+        grande, chico = os.path.join(carpeta, "jugadores.txt"), os.path.join(carpeta, "prefijo.txt")
+        generar(grande, GB * 2**30)
+        recortar(grande, chico, MB_LINEA_A_LINEA)
+        tam_grande, tam_chico = os.path.getsize(grande), os.path.getsize(chico)
+
+        filas = []
+        t, r = medir(lambda: EscanerJugadores(grande).resumen(top_n=10, ancho=100))
+        filas.append(("agregados mmap + NumPy", tam_grande, r["registros"], t))
+        t, r = medir(lambda: EscanerJugadores(chico).resumen(top_n=10, ancho=100))
+        filas.append(("agregados mmap + NumPy", tam_chico, r["registros"], t))
+        t, n = medir(lambda: agregados_linea_a_linea(chico))
+        filas.append(("agregados línea a línea", tam_chico, n, t))
+        with open(os.devnull, "w", encoding="utf-8") as nulo:
+            t, n = medir(lambda: EscanerJugadores(chico).volcar(nulo))
+            filas.append(("listado por bloques", tam_chico, n, t))
+            with redirect_stdout(nulo):
+                t, _ = medir(lambda: listado_print(chico))
+            filas.append(("listado con print", tam_chico, n, t))
+
+    print(f"{'Recorrido':26} {'archivo (GB)':>13} {'registros':>14} {'segundos':>9} {'registros/s':>13} {'MB/s':>7}")
+    for nombre, tam, n, t in filas:
+        print(f"{nombre:26} {tam / 2**30:13.2f} {n:14,} {t:9.1f} {n / t:13,.0f} {tam / 2**20 / t:7.0f}")
@@ -0,0 +1,86 @@
+import os
+import random
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jugador import Jugador
+from archivo_jugadores import ArchivoJugadores
+from nombres_jugadores import _siguiente_fila
+from almacenamiento import medir
+
+# Uso: python benchmark_nombres.py [JUGADORES] [CONSULTAS]
+# Latencia de buscar_prefijo y buscar_aproximado (lista ordenada como trie)
+# contra recorrer jugadores.txt comparando cada nombre.
+N_JUGADORES = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+N_CONSULTAS = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+SILABAS = ["ka", "ro", "mi", "lu", "te", "sa", "no", "vi", "da", "re", "xo", "pe"]
+
+
+def nombre_al_azar():
+    return "".join(random.choice(SILABAS) for _ in range(random.randrange(2, 5))) + str(random.randrange(100))
+
+
+def con_error(nombre):
+    """El nombre con una letra cambiada (un error de tipeo)."""
+    i = random.randrange(len(nombre))
+    return nombre[:i] + random.choice("aeioukrst") + nombre[i + 1:]
+
+
+def distancia(a, b):
+    fila = list(range(len(b) + 1))
+    for letra in a:
+        fila = _siguiente_fila(fila, b, letra)
+    return fila[-1]
+
+
+def prefijo_recorriendo(ruta, p, limite):
+    with open(ruta, "r", encoding="utf-8") as f:
+        nombres = {j.nombre.lower() for j in map(Jugador.from_line, f)}
+    return sorted(n for n in nombres if n.startswith(p.lower()))[:limite]
+
+
+def aproximado_recorriendo(ruta, nombre, max_dist, limite):
+    with open(ruta, "r", encoding="utf-8") as f:
+        nombres = {j.nombre.lower() for j in map(Jugador.from_line, f)}
+    return sorted((d, n) for n in nombres if (d := distancia(n, nombre.lower())) <= max_dist)[:limite]
+
+
+if __name__ == "__main__":
+    random.seed(1)
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "jugadores.txt")
+        archivo = ArchivoJugadores(ruta)
+        archivo.guardarMuchos(Jugador(nombre_al_azar(), 1, i) for i in range(N_JUGADORES))
+        t_armar, _ = medir(lambda: archivo.buscar_prefijo("ka"))  # carga el .idx y ordena los nombres
+        distintos = len(archivo.nombres.claves)
+
+        existentes = [n for n, _ in random.sample(list(archivo.indice.nombres().items()), N_CONSULTAS)]
+        prefijos = [n[:3] for n in existentes]
+        errados = [con_error(n) for n in existentes]
+        filas = []
+        for nombre, funcion in (
+                ("prefijo (3 letras, 10)", lambda: [archivo.buscar_prefijo(p, 10) for p in prefijos]),
+                ("aproximado (max_dist=1)", lambda: [archivo.buscar_aproximado(n, 1) for n in errados]),
+                ("aproximado (max_dist=2)", lambda: [archivo.buscar_aproximado(n, 2) for n in errados])):
+            t, resultados = medir(funcion)
+            filas.append((nombre, t / N_CONSULTAS, sum(map(len, resultados)) / N_CONSULTAS))
+        archivo.ranking.total()  # el .rank se carga antes: acá se mide solo el alta en el índice y los nombres
+        contador = iter(range(N_CONSULTAS))
+        t_alta, _ = medir(lambda: (archivo.guardar(Jugador(f"Nuevo{next(contador)}", 1, 1)),
+                                   archivo.buscar_prefijo("nuevo")), N_CONSULTAS)
+
+        esperado = [(d, j.nombre.lower()) for d, j in archivo.buscar_aproximado(errados[0], 2)]
+        t, obtenido = medir(lambda: aproximado_recorriendo(ruta, errados[0], 2, 10))
+        assert obtenido == esperado
+        filas.append(("aproximado recorriendo .txt", t, len(obtenido)))
+        t, obtenido = medir(lambda: prefijo_recorriendo(ruta, prefijos[0], 10))
+        assert obtenido == [j.nombre.lower() for j in archivo.buscar_prefijo(prefijos[0], 10)]
+        filas.append(("prefijo recorriendo .txt", t, len(obtenido)))
+
+    print(f"{N_JUGADORES:,} jugadores ({distintos:,} nombres distintos); primera consulta (carga y orden): "
+          f"{t_armar:.2f} s; guardar + consulta con el nombre nuevo: {t_alta * 1000:.2f} ms")
+    print(f"{'Búsqueda':28} {'ms por consulta':>16} {'resultados':>11}")
+    for nombre, t, n in filas:
+        print(f"{nombre:28} {t * 1000:16.2f} {n:11.1f}")
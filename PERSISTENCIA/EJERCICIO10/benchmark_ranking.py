@@ -0,0 +1,60 @@
+import os
+import random
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jugador import Jugador
+from archivo_jugadores import ArchivoJugadores
+from almacenamiento import medir
+
+# Uso: python benchmark_ranking.py [JUGADORES] [CONSULTAS]
+# Latencia de las consultas de ranking con jugadores.txt.rank contra recorrer
+# el archivo de texto para responder lo mismo, y costo de guardar con el
+# ranking al día.
+N_JUGADORES = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+N_CONSULTAS = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+
+def puesto_recorriendo(ruta, nombre):
+    """Puesto de nombre leyendo todo el archivo (lo que habría que hacer sin el ranking)."""
+    buscado, vistos, jugadores = nombre.lower(), set(), []
+    with open(ruta, "r", encoding="utf-8") as f:
+        for pos, linea in enumerate(f):
+            j = Jugador.from_line(linea)
+            if j.nombre.lower() not in vistos:
+                vistos.add(j.nombre.lower())
+                jugadores.append((-j.puntaje, pos, j.nombre.lower()))
+    jugadores.sort()
+    return next(i for i, (_, _, n) in enumerate(jugadores, 1) if n == buscado)
+
+
+if __name__ == "__main__":
+    random.seed(1)
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "jugadores.txt")
+        t_carga, _ = medir(lambda: ArchivoJugadores(ruta).guardarMuchos(
+            Jugador(f"Jugador{i}", i % 50, random.randrange(1_000_000)) for i in range(N_JUGADORES)))
+
+        archivo = ArchivoJugadores(ruta)
+        t_abrir, _ = medir(lambda: archivo.ranking.total())  # lee el .rank y el .idx una vez
+        nombres = [f"Jugador{random.randrange(N_JUGADORES)}" for _ in range(N_CONSULTAS)]
+        filas = [
+            ("top(100)", medir(lambda: archivo.ranking.top(100), 20)[0]),
+            ("top_por_nivel(n, 10)", medir(lambda: archivo.ranking.top_por_nivel(random.randrange(50), 10), 200)[0]),
+            ("posicion(nombre)", medir(lambda: [archivo.ranking.posicion(n) for n in nombres])[0] / N_CONSULTAS),
+        ]
+        contador = iter(range(N_JUGADORES, N_JUGADORES + N_CONSULTAS))
+        filas.append(("guardar (con .idx y .rank)", medir(
+            lambda: archivo.guardar(Jugador(f"Jugador{next(contador)}", 1, random.randrange(1_000_000))),
+            N_CONSULTAS)[0]))
+        t_recorrer, puesto = medir(lambda: puesto_recorriendo(ruta, nombres[0]))
+        assert puesto == archivo.ranking.posicion(nombres[0])[0]
+        filas.append(("puesto recorriendo el .txt", t_recorrer))
+
+    print(f"{N_JUGADORES:,} jugadores; armado inicial con guardarMuchos: {t_carga:.1f} s; "
+          f"primera consulta (carga del .rank): {t_abrir:.2f} s")
+    print(f"{'Operación':28} {'ms por operación':>17}")
+    for nombre, t in filas:
+        print(f"{nombre:28} {t * 1000:17.3f}")
@@ -0,0 +1,263 @@
+import mmap
+import os
+import sys
+from typing import Dict, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # dependencia opcional: solo la necesitan los agregados
+    np = None
+
+from jugador import Jugador
+
+# ====================================================================
+# --- RECORRIDO COMPLETO CON MMAP ---
+# ====================================================================
+# mostrar_todos y cualquier consulta sobre todos los jugadores leían el
+# archivo línea por línea: un str, un split, dos int() y un Jugador por
+# registro. Aquí el archivo se mapea con mmap y se procesa por bloques
+# grandes (alineados a saltos de línea):
+#   - agregados: NumPy ve el bloque sin copiarlo, ubica comas y saltos de
+#     línea y convierte nivel y puntaje de todos los registros a la vez;
+#     solo se arman Jugador para el top final.
+#   - listado: si el bloque está escrito como lo deja to_line, se marcan las
+#     dos comas de cada línea y el texto de salida se arma con tres
+#     bytes.replace y una sola escritura, en lugar de un print por jugador.
+#     Un bloque con líneas raras (espacios, ceros a la izquierda, ilegibles)
+#     se formatea línea por línea con Jugador, como antes.
+# El nombre es todo lo que está antes de las dos últimas comas, como en
+# Jugador.from_line, así que un nombre con comas no rompe el registro.
+
+BLOQUE = 64 * 2**20  # bytes por bloque: acota la memoria de los arreglos temporales
+_PREFIJO = b"Jugador: "  # Jugador.__str__: "Jugador: {nombre} | Nivel: {nivel} | Puntaje: {puntaje}"
+# Primer byte de un nombre que str.strip() recortaría (espacios ASCII y comienzo de espacios Unicode en UTF-8)
+_ESPACIOS = (9, 10, 11, 12, 13, 28, 29, 30, 31, 32, 0xC2, 0xE1, 0xE2, 0xE3)
+
+
+class _Campos(NamedTuple):
+    """Posiciones y valores de cada línea de un bloque (arreglos alineados por línea)."""
+    desde: "np.ndarray"      # inicio de la línea
+    c1: "np.ndarray"         # coma antes del nivel
+    c2: "np.ndarray"         # coma antes del puntaje
+    niveles: "np.ndarray"
+    puntajes: "np.ndarray"
+    validas: "np.ndarray"    # se pudo leer nivel y puntaje
+    canonicas: "np.ndarray"  # además está escrita tal cual la escribe to_line
+    vacias: int              # líneas en blanco (no cuentan como ilegibles)
+
+
+class EscanerJugadores:
+    """Recorridos completos de un archivo de jugadores en texto (jugadores.txt) sin un objeto por línea."""
+
+    def __init__(self, archivo: str = "jugadores.txt", bloque: int = BLOQUE):
+        self.archivo = archivo
+        self.bloque = bloque
+
+    # --- Listado con salida por lotes ---
+    def volcar(self, salida: Optional[TextIO] = None) -> int:
+        """Escribe todos los jugadores (un bloque por escritura). Retorna cuántos se mostraron.
+
+        Las líneas ilegibles se omiten y se informa cuántas fueron al final.
+        """
+        salida = salida or sys.stdout
+        mostrados = omitidas = 0
+        with self._mapa() as m:
+            for inicio, fin in self._rangos(m):
+                texto, n, malas = _formatear(bytearray(m[inicio:fin]))
+                salida.write(texto)
+                mostrados += n
+                omitidas += malas
+        salida.flush()
+        if omitidas:
+            print(f"Líneas ilegibles omitidas: {omitidas}")
+        return mostrados
+
+    # --- Agregados (NumPy) ---
+    def top(self, n: int = 10) -> List[Jugador]:
+        """Los n jugadores con mayor puntaje, de mayor a menor (empates: el primero del archivo)."""
+        return self.resumen(top_n=n)["top"]
+
+    def conteo_por_nivel(self) -> Dict[int, int]:
+        """Cantidad de jugadores por nivel, ordenado por nivel."""
+        return self.resumen(top_n=0)["por_nivel"]
+
+    def histograma(self, ancho: int = 100) -> List[Tuple[int, int, int]]:
+        """(desde, hasta, cantidad) por rango de puntaje [desde, hasta), solo rangos no vacíos."""
+        return self.resumen(top_n=0, ancho=ancho)["histograma"]
+
+    def resumen(self, top_n: int = 10, ancho: int = 100) -> dict:
+        """Top, conteo por nivel e histograma de puntajes en una sola pasada por el archivo."""
+        if np is None:
+            raise ImportError("Los agregados necesitan NumPy. Instálalo con: pip install numpy")
+        if ancho <= 0:
+            raise ValueError("El ancho del histograma debe ser positivo.")
+        registros = invalidas = 0
+        por_nivel: Dict[int, int] = {}
+        por_rango: Dict[int, int] = {}
+        cand_puntaje = np.empty(0, np.int64)
+        cand_offset = np.empty(0, np.int64)
+        with self._mapa() as m:
+            for offsets, niveles, puntajes, malas in self._columnas(m):
+                registros += len(puntajes)
+                invalidas += malas
+                _sumar(por_nivel, niveles)
+                _sumar(por_rango, puntajes // ancho)
+                if top_n > 0 and len(puntajes):
+                    # Candidatos del bloque: todos los que alcanzan su n-ésimo puntaje
+                    k = min(top_n, len(puntajes))
+                    umbral = np.partition(puntajes, len(puntajes) - k)[len(puntajes) - k]
+                    elegidos = np.flatnonzero(puntajes >= umbral)
+                    cand_puntaje = np.concatenate((cand_puntaje, puntajes[elegidos]))
+                    cand_offset = np.concatenate((cand_offset, offsets[elegidos]))
+                    orden = np.lexsort((cand_offset, -cand_puntaje))[:top_n]
+                    cand_puntaje, cand_offset = cand_puntaje[orden], cand_offset[orden]
+            top = [_jugador_en(m, int(o)) for o in cand_offset] if top_n > 0 else []
+        return {
+            "registros": registros,
+            "invalidas": invalidas,
+            "top": top,
+            "por_nivel": dict(sorted(por_nivel.items())),
+            "histograma": [(r * ancho, (r + 1) * ancho, c) for r, c in sorted(por_rango.items())],
+        }
+
+    # --- Recorrido por bloques ---
+    def _mapa(self):
+        """Contexto con el mmap del archivo (None si falta o está vacío)."""
+        return _Mapa(self.archivo)
+
+    def _rangos(self, m) -> Iterator[Tuple[int, int]]:
+        """[inicio, fin) de cada bloque; todos terminan justo después de un salto de línea (salvo el último)."""
+        inicio, total = 0, len(m) if m is not None else 0
+        while inicio < total:
+            fin = inicio + self.bloque
+            if fin >= total:
+                fin = total
+            else:
+                corte = m.rfind(b"\n", inicio, fin)
+                fin = corte + 1 if corte >= 0 else m.find(b"\n", fin) + 1 or total  # Línea más larga que un bloque
+            yield inicio, fin
+            inicio = fin
+
+    def _columnas(self, m) -> Iterator[Tuple["np.ndarray", "np.ndarray", "np.ndarray", int]]:
+        """Por bloque: (offset de la línea, nivel, puntaje) de las líneas válidas y cuántas no lo eran."""
+        for inicio, fin in self._rangos(m):
+            buf = np.frombuffer(m, dtype=np.uint8, count=fin - inicio, offset=inicio)  # vista, sin copia
+            c = _campos(buf)
+            del buf  # Libera la vista antes de que se cierre el mapa
+            v = c.validas
+            yield c.desde[v] + inicio, c.niveles[v], c.puntajes[v], len(v) - int(v.sum()) - c.vacias
+
+
+class _Mapa:
+    """with-statement para un mmap de solo lectura que tolera archivos vacíos o inexistentes."""
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self.f = self.m = None
+
+    def __enter__(self):
+        if os.path.exists(self.ruta) and os.path.getsize(self.ruta) > 0:
+            self.f = open(self.ruta, "rb")
+            self.m = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.m
+
+    def __exit__(self, *exc):
+        if self.m is not None:
+            self.m.close()
+        if self.f is not None:
+            self.f.close()
+
+
+def _campos(buf: "np.ndarray") -> _Campos:
+    """Ubica las dos últimas comas de cada línea del bloque y convierte nivel y puntaje."""
+    saltos = np.flatnonzero(buf == 10)
+    if buf[-1] != 10:
+        saltos = np.append(saltos, len(buf))  # Última línea sin salto de línea
+    comas = np.flatnonzero(buf == 44)
+    desde = np.concatenate(([0], saltos[:-1] + 1))
+    hasta = saltos - ((saltos > desde) & (buf[np.maximum(saltos - 1, 0)] == 13))  # sin '\r'
+    ultima = np.searchsorted(comas, saltos) - 1  # última coma de cada línea
+    c2 = comas[np.maximum(ultima, 0)] if len(comas) else np.zeros_like(saltos)
+    c1 = comas[np.maximum(ultima - 1, 0)] if len(comas) else np.zeros_like(saltos)
+    con_campos = (ultima >= 1) & (c1 >= desde)
+    niveles, ok_nivel, canon_nivel = _enteros(buf, c1 + 1, c2)
+    puntajes, ok_puntaje, canon_puntaje = _enteros(buf, c2 + 1, hasta)
+    validas = con_campos & ok_nivel & ok_puntaje
+    canonicas = (validas & canon_nivel & canon_puntaje & (c1 > desde)
+                 & ~np.isin(buf[np.minimum(desde, len(buf) - 1)], _ESPACIOS))
+    vacias = int(np.count_nonzero(hasta == desde))
+    return _Campos(desde, c1, c2, niveles, puntajes, validas, canonicas, vacias)
+
+
+def _enteros(buf: "np.ndarray", desde: "np.ndarray",
+             hasta: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Convierte a la vez los enteros escritos en buf[desde:hasta] de cada línea.
+
+    Retorna (valores, válidos, canónicos); canónico es que str(valor) da el mismo texto.
+    """
+    ultimo = len(buf) - 1
+    recortado = np.zeros(len(desde), bool)
+    # Espacios alrededor del número (int() los acepta): casi nunca hay, así que casi siempre es una sola pasada
+    while True:
+        primero, ultimo_car, hay = buf[np.minimum(desde, ultimo)], buf[np.maximum(hasta - 1, 0)], hasta > desde
+        antes = hay & ((primero == 32) | (primero == 9))
+        despues = hay & ((ultimo_car == 32) | (ultimo_car == 9))
+        if not (antes.any() or despues.any()):
+            break
+        desde, hasta = desde + antes, hasta - despues
+        recortado |= antes | despues
+    negativo = hay & (primero == 45)
+    desde = desde + negativo
+    largo = hasta - desde
+    ok = (largo > 0) & (largo <= 18)  # hasta 18 dígitos entran en int64 sin desbordar
+    valores = np.zeros(len(desde), np.int64)
+    potencia = 1
+    for k in range(int(largo[ok].max()) if ok.any() else 0):  # k-ésimo dígito contando desde la derecha
+        activo = largo > k
+        digito = buf[np.maximum(hasta - 1 - k, 0)] - np.uint8(48)  # uint8: lo que no es dígito da > 9
+        ok &= ~activo | (digito <= 9)
+        valores += (digito * activo).astype(np.int64) * potencia
+        potencia *= 10
+    if negativo.any():
+        primero = buf[np.minimum(desde, ultimo)]
+    sin_cero_inicial = (largo == 1) | (primero != 48)
+    canonicos = ok & ~recortado & sin_cero_inicial & ~(negativo & (valores == 0))
+    return np.where(negativo, -valores, valores), ok, canonicos
+
+
+def _formatear(crudo: bytearray) -> Tuple[str, int, int]:
+    """Texto de salida de un bloque: (texto, jugadores mostrados, líneas ilegibles omitidas)."""
+    if np is not None and b"\x01" not in crudo and b"\x02" not in crudo:
+        buf = np.frombuffer(crudo, dtype=np.uint8)
+        c = _campos(buf)
+        if c.canonicas.all():
+            # Todo el bloque como lo escribe to_line: las comas se marcan y se reemplazan por el formato de __str__
+            buf[c.c1], buf[c.c2] = 1, 2
+            del buf
+            texto = bytes(crudo).replace(b"\r\n", b"\n")
+            if not texto.endswith(b"\n"):
+                texto += b"\n"
+            texto = (_PREFIJO + texto.replace(b"\x01", b" | Nivel: ").replace(b"\x02", b" | Puntaje: ")
+                     .replace(b"\n", b"\n" + _PREFIJO))[:-len(_PREFIJO)]
+            return texto.decode("utf-8"), len(c.canonicas), 0
+        del buf
+    lineas, omitidas = [], 0
+    for linea in crudo.decode("utf-8").split("\n"):
+        if not linea.strip():
+            continue
+        try:
+            lineas.append(str(Jugador.from_line(linea)))
+        except ValueError:
+            omitidas += 1
+    return "".join(l + "\n" for l in lineas), len(lineas), omitidas
+
+
+def _sumar(conteos: Dict[int, int], valores: "np.ndarray") -> None:
+    claves, cantidades = np.unique(valores, return_counts=True)
+    for clave, cantidad in zip(claves.tolist(), cantidades.tolist()):
+        conteos[clave] = conteos.get(clave, 0) + cantidad
+
+
+def _jugador_en(m, offset: int) -> Jugador:
+    fin = m.find(b"\n", offset)
+    return Jugador.from_line(m[offset:fin if fin >= 0 else len(m)])
@@ -0,0 +1,141 @@
+import os
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+
+from jugador import Jugador
+
+Linea = Tuple[int, int, int] # (offset, largo, crc32) de una línea del archivo de datos
+
+
+def firma_datos(archivo: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, tamaño) del archivo de datos, o None si no existe."""
+    try:
+        st = os.stat(archivo)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def linea_intacta(archivo: str, linea: Optional[Linea]) -> bool:
+    """La línea indexada sigue en el mismo lugar y con los mismos bytes (el archivo solo creció al final)."""
+    if linea is None:
+        return True
+    offset, largo, crc = linea
+    try:
+        with open(archivo, "rb") as f:
+            f.seek(offset)
+            datos = f.read(largo)
+    except OSError:
+        return False
+    return len(datos) == largo and zlib.crc32(datos) == crc
+
+
+class IndiceJugadores:
+    """Índice auxiliar: nombre en minúsculas -> offset (bytes) de su línea en el archivo de jugadores.
+
+    Se guarda en "<archivo>.idx" con una línea "offset,largo,crc,nombre" por jugador y
+    solo se agregan líneas al final, igual que en el archivo de datos. El crc32
+    de la última línea indexada es la firma: si el archivo de datos cambió y esa
+    línea ya no está igual en su lugar, el archivo se reescribió y el índice se
+    reconstruye.
+    """
+
+    def __init__(self, archivo: str):
+        self.archivo = archivo
+        self.archivo_indice = archivo + ".idx"
+        self.offsets: Optional[Dict[str, int]] = None  # se carga al primer uso
+        self.cubierto = 0  # bytes del archivo de datos que ya están indexados
+        self.ultima: Optional[Linea] = None  # la línea indexada que termina en cubierto
+        self._verificada: Optional[Tuple[int, int]] = None  # firma del archivo de datos ya comparada con ultima
+
+    def buscar(self, nombre: str) -> Optional[int]:
+        """Offset de la primera línea con ese nombre, o None si no está."""
+        self._asegurar()
+        return self.offsets.get(nombre.lower())
+
+    def nombres(self) -> Dict[str, int]:
+        """Nombre en minúsculas -> offset, en el orden en que se agregaron al índice (no modificar)."""
+        self._asegurar()
+        return self.offsets
+
+    def primeros(self) -> Set[int]:
+        """Offsets de la primera línea de cada nombre."""
+        self._asegurar()
+        return set(self.offsets.values())
+
+    def registrar(self, nombre: str, offset: int, linea: bytes) -> None:
+        """Agrega al índice la línea recién escrita en el archivo de datos."""
+        self.registrar_lote([(offset, linea, nombre)])
+
+    def registrar_lote(self, entradas: List[Tuple[int, bytes, str]]) -> None:
+        """Agrega (offset, bytes de la línea, nombre) de varias líneas recién escritas, con una sola escritura."""
+        self._asegurar()  # si estaba atrasado, ponerse al día ya incluye estas líneas
+        self._agregar([(o, len(l), zlib.crc32(l), n.lower()) for o, l, n in entradas if self.cubierto < o + len(l)])
+
+    def reconstruir(self) -> None:
+        """Vuelve a generar el índice completo desde el archivo de datos."""
+        if os.path.exists(self.archivo_indice):
+            os.remove(self.archivo_indice)
+        self.offsets, self.cubierto, self.ultima, self._verificada = {}, 0, None, None
+        self._ponerse_al_dia()
+
+    def _asegurar(self) -> None:
+        """Carga el índice y lo completa si el archivo de datos creció sin pasar por él."""
+        if self.offsets is None and not self._cargar():
+            self.reconstruir()  # .idx dañado o de un formato anterior
+            return
+        firma = firma_datos(self.archivo)
+        if firma != self._verificada:
+            if not linea_intacta(self.archivo, self.ultima):
+                self.reconstruir()  # el archivo de datos se reescribió o se achicó: el índice no sirve
+                return
+            self._verificada = firma
+        if firma is not None and self.cubierto < firma[1]:
+            self._ponerse_al_dia()
+
+    def _cargar(self) -> bool:
+        """Lee el .idx; retorna False si alguna línea no se puede interpretar."""
+        self.offsets, self.cubierto, self.ultima, self._verificada = {}, 0, None, None
+        if not os.path.exists(self.archivo_indice):
+            return True
+        with open(self.archivo_indice, "r", encoding="utf-8") as f:
+            for linea in f:
+                try:
+                    offset, largo, crc, nombre = linea.rstrip("\n").split(",", 3)
+                    offset, largo, crc = int(offset), int(largo), int(crc)
+                except ValueError:
+                    return False
+                self.offsets.setdefault(nombre, offset)
+                if offset + largo > self.cubierto:
+                    self.cubierto, self.ultima = offset + largo, (offset, largo, crc)
+        return True
+
+    def _ponerse_al_dia(self) -> None:
+        """Indexa las líneas completas que están después de la parte ya cubierta."""
+        if not os.path.exists(self.archivo):
+            return
+        nuevas: List[Tuple[int, int, int, str]] = []
+        with open(self.archivo, "rb") as f:
+            f.seek(self.cubierto)
+            offset = self.cubierto
+            for linea in f:
+                if not linea.endswith(b"\n"):
+                    break  # línea a medio escribir
+                try:
+                    nombre = Jugador.from_line(linea).nombre.lower()
+                except ValueError:
+                    nombre = None  # línea ilegible: ningún lector la devuelve, no se indexa
+                if nombre is not None:
+                    nuevas.append((offset, len(linea), zlib.crc32(linea), nombre))
+                offset += len(linea)
+        self._agregar(nuevas)
+
+    def _agregar(self, entradas: List[Tuple[int, int, int, str]]) -> None:
+        if not entradas:
+            return
+        with open(self.archivo_indice, "a", encoding="utf-8") as f:
+            for offset, largo, crc, nombre in entradas:
+                f.write(f"{offset},{largo},{crc},{nombre}\n")
+                self.offsets.setdefault(nombre, offset)
+                if offset + largo > self.cubierto:
+                    self.cubierto, self.ultima = offset + largo, (offset, largo, crc)
@@ -1,4 +1,12 @@
+import struct
+
+
 class Jugador:
+    __slots__ = ("nombre", "nivel", "puntaje")
+    # Formato binario: nivel (int32), puntaje (int64) y largo del nombre (uint16), seguidos del nombre en UTF-8
+    CABECERA = struct.Struct("<iqH")
+    RANGO_NIVEL = (-2**31, 2**31 - 1)
+    RANGO_PUNTAJE = (-2**63, 2**63 - 1)
     def __init__(self, nombre, nivel, puntaje):
         self.nombre = nombre
         self.nivel = nivel
@@ -9,8 +17,39 @@ class Jugador:
 
     @staticmethod
     def from_line(linea):
-        nombre, nivel, puntaje = linea.strip().split(",")
+        """Jugador de una línea del archivo de texto (str o bytes en UTF-8); ValueError si no se puede leer.
+
+        Nivel y puntaje son siempre los dos últimos campos: el nombre es todo lo
+        anterior, así que puede tener comas. Todos los que leen jugadores.txt
+        (índice, ranking, escáner, conversión a binario) parsean con este método.
+        """
+        if isinstance(linea, bytes):
+            linea = linea.decode("utf-8")
+        nombre, nivel, puntaje = linea.strip().rsplit(",", 2)
         return Jugador(nombre, int(nivel), int(puntaje))
 
+    def to_bytes(self):
+        nombre = self.nombre.encode("utf-8")
+        if len(nombre) > 0xFFFF:
+            raise ValueError("Nombre demasiado largo para el formato binario.")
+        if not Jugador.RANGO_NIVEL[0] <= self.nivel <= Jugador.RANGO_NIVEL[1]:
+            raise ValueError(f"Nivel fuera de rango para el formato binario (int32): {self.nivel}.")
+        if not Jugador.RANGO_PUNTAJE[0] <= self.puntaje <= Jugador.RANGO_PUNTAJE[1]:
+            raise ValueError(f"Puntaje fuera de rango para el formato binario (int64): {self.puntaje}.")
+        return Jugador.CABECERA.pack(self.nivel, self.puntaje, len(nombre)) + nombre
+
+    @staticmethod
+    def from_bytes(buffer, offset=0):
+        """Lee el registro que empieza en offset (bytes o mmap); retorna (jugador, offset del siguiente)."""
+        try:
+            nivel, puntaje, largo = Jugador.CABECERA.unpack_from(buffer, offset)
+        except struct.error:
+            raise ValueError("Registro incompleto.") from None
+        inicio = offset + Jugador.CABECERA.size
+        fin = inicio + largo
+        if fin > len(buffer):
+            raise ValueError("Registro incompleto.")
+        return Jugador(buffer[inicio:fin].decode("utf-8"), nivel, puntaje), fin
+
     def __str__(self):
         return f"Jugador: {self.nombre} | Nivel: {self.nivel} | Puntaje: {self.puntaje}"
@@ -8,7 +8,13 @@ while True:
     print("1. Registrar jugador")
     print("2. Mostrar todos")
     print("3. Buscar por nombre")
-    print("4. Salir")
+    print("4. Reconstruir índice de nombres")
+    print("5. Ranking (top 10 por puntaje)")
+    print("6. Puesto de un jugador")
+    print("7. Top 10 de un nivel")
+    print("8. Autocompletar nombre (prefijo)")
+    print("9. Buscar nombre parecido")
+    print("10. Salir")
 
     op = input("Elige una opción: ")
 
@@ -27,6 +33,36 @@ while True:
         archivo.buscar(nombre)
 
     elif op == "4":
+        archivo.reconstruir_indice()
+
+    elif op == "5":
+        archivo.mostrar_ranking()
+
+    elif op == "6":
+        nombre = input("Nombre del jugador: ")
+        archivo.mostrar_posicion(nombre)
+
+    elif op == "7":
+        nivel = int(input("Nivel: "))
+        archivo.mostrar_top_nivel(nivel)
+
+    elif op == "8":
+        prefijo = input("Comienzo del nombre: ")
+        jugadores = archivo.buscar_prefijo(prefijo)
+        if not jugadores:
+            print("Ningún jugador empieza así.")
+        for jugador in jugadores:
+            print(jugador)
+
+    elif op == "9":
+        nombre = input("Nombre aproximado: ")
+        parecidos = archivo.buscar_aproximado(nombre)
+        if not parecidos:
+            print("No hay nombres parecidos.")
+        for distancia, jugador in parecidos:
+            print(f"{jugador} (diferencias: {distancia})")
+
+    elif op == "10":
         break
     else:
         print("Opción no válida.")
@@ -0,0 +1,87 @@
+from bisect import bisect_left, insort
+from itertools import islice
+from os.path import commonprefix
+from typing import Dict, List, Optional, Tuple
+
+from indice_jugadores import IndiceJugadores
+
+FIN = "\U0010ffff" # Mayor que cualquier carácter: p + FIN queda después de todo lo que empieza con p
+
+
+class NombresJugadores:
+    """Búsqueda por prefijo y aproximada (distancia de edición) sobre los nombres del índice.
+
+    Los nombres en minúsculas se guardan en una lista ordenada, que funciona como
+    un trie implícito: todos los nombres que empiezan con un prefijo quedan
+    juntos y se ubican con bisect. La búsqueda aproximada recorre ese trie
+    compartiendo las filas de la distancia entre nombres con el mismo prefijo, y
+    salta con bisect las ramas que ya no pueden quedar dentro de max_dist.
+
+    No tiene archivo propio: toma los nombres de IndiceJugadores y, antes de
+    cada consulta, inserta solo los que se agregaron desde la anterior.
+    """
+
+    def __init__(self, indice: IndiceJugadores):
+        self.indice = indice
+        self.claves: List[str] = []
+        self._origen: Optional[Dict[str, int]] = None # diccionario del índice del que salen las claves
+        self._cantidad = 0 # nombres del índice ya insertados
+
+    def prefijo(self, p: str, limite: int = 10) -> List[Tuple[str, int]]:
+        """(nombre, offset) de hasta 'limite' nombres que empiezan con p, en orden alfabético."""
+        offsets = self._asegurar()
+        p = p.lower()
+        inicio = bisect_left(self.claves, p)
+        fin = bisect_left(self.claves, p + FIN, inicio)
+        return [(c, offsets[c]) for c in self.claves[inicio:min(fin, inicio + limite)]]
+
+    def aproximado(self, nombre: str, max_dist: int = 2, limite: int = 10) -> List[Tuple[int, str, int]]:
+        """(distancia, nombre, offset) de los nombres a distancia de edición <= max_dist, los más cercanos primero."""
+        offsets = self._asegurar()
+        buscado, claves = nombre.lower(), self.claves
+        filas = [list(range(len(buscado) + 1))] # filas[d]: distancias del prefijo de largo d contra buscado
+        anterior, i, hallados = "", 0, []
+        while i < len(claves):
+            clave = claves[i]
+            del filas[len(commonprefix((anterior, clave))) + 1:]
+            for letra in clave[len(filas) - 1:]:
+                fila = _siguiente_fila(filas[-1], buscado, letra)
+                filas.append(fila)
+                if min(fila) > max_dist:
+                    break # Nada que empiece así puede quedar cerca
+            else:
+                if filas[-1][-1] <= max_dist:
+                    hallados.append((filas[-1][-1], clave, offsets[clave]))
+                anterior, i = clave, i + 1
+                continue
+            anterior = clave[:len(filas) - 1]
+            i = bisect_left(claves, anterior + FIN, i)
+        hallados.sort()
+        return hallados[:limite]
+
+    def _asegurar(self) -> Dict[str, int]:
+        """Pone las claves al día con el índice de nombres y retorna su diccionario nombre -> offset."""
+        offsets = self.indice.nombres()
+        if offsets is not self._origen or len(offsets) < self._cantidad:
+            # Índice recién cargado o reconstruido
+            self.claves, self._origen = sorted(offsets), offsets
+        elif len(offsets) > self._cantidad:
+            # Los nombres nuevos son los últimos del diccionario (se agregan con setdefault);
+            # se toman desde el final para no recorrer los que ya estaban
+            nuevas = list(islice(reversed(offsets), len(offsets) - self._cantidad))
+            if len(nuevas) * 16 < len(self.claves):
+                for clave in nuevas:
+                    insort(self.claves, clave)
+            else:
+                self.claves.extend(nuevas)
+                self.claves.sort()
+        self._cantidad = len(offsets)
+        return offsets
+
+
+def _siguiente_fila(anterior: List[int], buscado: str, letra: str) -> List[int]:
+    """Fila de distancias de edición al agregar 'letra' al prefijo cuya fila es 'anterior'."""
+    fila = [anterior[0] + 1]
+    for j, c in enumerate(buscado):
+        fila.append(min(fila[j] + 1, anterior[j + 1] + 1, anterior[j] + (c != letra)))
+    return fila
@@ -0,0 +1,229 @@
+import os
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Set, Tuple
+
+from jugador import Jugador
+from indice_jugadores import IndiceJugadores, Linea, firma_datos, linea_intacta
+
+
+class _Tabla:
+    """Posiciones ordenadas por puntaje descendente y, a igual puntaje, por offset (el registrado antes gana).
+
+    Dos arreglos paralelos en lugar de una lista de tuplas: -puntaje y offset.
+    Con bisect sobre el primero se ubica el grupo de ese puntaje y dentro del
+    grupo (ordenado por offset) el jugador, así que una posición es O(log n).
+    """
+
+    def __init__(self, pares: List[Tuple[int, int]] = ()):
+        self._armar(sorted(pares))
+
+    def __len__(self) -> int:
+        return len(self.claves)
+
+    def insertar(self, puntaje: int, offset: int) -> None:
+        i = self.antes_de(puntaje, offset)
+        self.claves.insert(i, -puntaje)
+        self.offsets.insert(i, offset)
+
+    def insertar_muchos(self, pares: List[Tuple[int, int]]) -> None:
+        """Inserta (puntaje, offset) de varios jugadores; si son muchos, reordena todo de una vez."""
+        if len(pares) * 16 < len(self):
+            for puntaje, offset in pares:
+                self.insertar(puntaje, offset)
+            return
+        todos = list(zip(self.claves, self.offsets))
+        todos.extend((-puntaje, offset) for puntaje, offset in pares)
+        todos.sort()
+        self._armar(todos)
+
+    def antes_de(self, puntaje: int, offset: int) -> int:
+        """Cantidad de jugadores que quedan por delante de (puntaje, offset)."""
+        inicio = bisect_left(self.claves, -puntaje)
+        fin = bisect_right(self.claves, -puntaje, inicio)
+        return bisect_left(self.offsets, offset, inicio, fin)
+
+    def primeros(self, n: int) -> List[int]:
+        return self.offsets[:n].tolist()
+
+    def _armar(self, pares: List[Tuple[int, int]]) -> None:
+        self.claves = array("q", [c for c, _ in pares])  # -puntaje
+        self.offsets = array("q", [o for _, o in pares])
+
+
+class RankingJugadores:
+    """Ranking por puntaje de jugadores.txt, al día con cada guardar.
+
+    Se guarda en "<archivo>.rank" con una línea "offset,largo,crc,nivel,puntaje" por
+    línea del archivo de datos ("offset,largo,crc" si la línea no se puede leer) y,
+    como el índice de nombres, solo crece al final y usa el crc32 de la última
+    línea cubierta para notar que el archivo de datos se reescribió. En memoria queda una _Tabla
+    general y una por nivel. Cuenta solo la primera línea de cada nombre (la
+    misma que devuelve buscar), así un nombre repetido no ocupa dos puestos.
+    """
+
+    def __init__(self, archivo: str, indice: IndiceJugadores):
+        self.archivo = archivo
+        self.archivo_ranking = archivo + ".rank"
+        self.indice = indice
+        self.general: Optional[_Tabla] = None  # se carga al primer uso
+        self.por_nivel: Dict[int, _Tabla] = {}
+        self.cubierto = 0  # bytes del archivo de datos que ya están en el ranking
+        self.ultima: Optional[Linea] = None  # la línea cubierta que termina en cubierto
+        self._verificada: Optional[Tuple[int, int]] = None  # firma del archivo de datos ya comparada con ultima
+
+    def top(self, n: int = 100) -> List[Jugador]:
+        """Los n mejores puntajes, de mayor a menor."""
+        self._asegurar()
+        return self._leer(self.general.primeros(n))
+
+    def top_por_nivel(self, nivel: int, n: int = 10) -> List[Jugador]:
+        self._asegurar()
+        tabla = self.por_nivel.get(nivel)
+        return self._leer(tabla.primeros(n)) if tabla else []
+
+    def posicion(self, nombre: str) -> Optional[Tuple[int, Jugador]]:
+        """(puesto empezando en 1, jugador) del nombre, o None si no está. No recorre el archivo de datos."""
+        self._asegurar()
+        offset = self.indice.buscar(nombre)
+        if offset is None:
+            return None
+        leidos = self._leer([offset])
+        if not leidos:
+            return None
+        jugador = leidos[0]
+        return self.general.antes_de(jugador.puntaje, offset) + 1, jugador
+
+    def total(self) -> int:
+        self._asegurar()
+        return len(self.general)
+
+    def registrar(self, offset: int, linea: bytes, jugador: Jugador) -> None:
+        """Agrega al ranking la línea recién escrita (el índice de nombres ya debe tenerla)."""
+        self.registrar_lote([(offset, linea, jugador)])
+
+    def registrar_lote(self, entradas: List[Tuple[int, bytes, Jugador]]) -> None:
+        """Agrega (offset, bytes de la línea, jugador) de varias líneas recién escritas, con una sola escritura."""
+        if not entradas:
+            return
+        if self.general is None:
+            self._asegurar()  # carga el .rank (o lo reconstruye si está dañado)
+        if self.cubierto != entradas[0][0] or not linea_intacta(self.archivo, self.ultima):
+            # Atrasado, o el archivo se achicó o reescribió: ponerse al día ya incluye estas líneas
+            self._asegurar()
+            entradas = [e for e in entradas if self.cubierto < e[0] + len(e[1])]
+        primeros = {o for o, _, j in entradas if self.indice.buscar(j.nombre) == o}
+        self._agregar([(o, len(l), zlib.crc32(l), j.nivel, j.puntaje) for o, l, j in entradas], primeros)
+
+    def reconstruir(self) -> None:
+        """Vuelve a generar el ranking completo desde el archivo de datos."""
+        if os.path.exists(self.archivo_ranking):
+            os.remove(self.archivo_ranking)
+        self.general, self.por_nivel, self.cubierto, self.ultima, self._verificada = _Tabla(), {}, 0, None, None
+        self._ponerse_al_dia()
+
+    def _asegurar(self) -> None:
+        """Carga el ranking y lo completa si el archivo de datos creció sin pasar por él."""
+        if self.general is None and not self._cargar():
+            self.reconstruir()  # .rank dañado o de un formato anterior
+            return
+        firma = firma_datos(self.archivo)
+        if firma != self._verificada:
+            if not linea_intacta(self.archivo, self.ultima):
+                self.reconstruir()  # el archivo de datos se reescribió o se achicó: el ranking no sirve
+                return
+            self._verificada = firma
+        if firma is not None and self.cubierto < firma[1]:
+            self._ponerse_al_dia()
+
+    def _cargar(self) -> bool:
+        """Lee el .rank y ordena de una vez (más rápido que insertar línea por línea).
+
+        Dos programas abiertos sobre el mismo archivo pueden haber agregado la
+        misma línea al .rank; por eso las filas se juntan por offset. Retorna
+        False si alguna línea no se puede interpretar.
+        """
+        primeros = self.indice.primeros()
+        filas: Dict[int, Tuple[int, int]] = {}  # offset -> (nivel, puntaje)
+        self.general, self.por_nivel, self.cubierto, self.ultima, self._verificada = _Tabla(), {}, 0, None, None
+        if os.path.exists(self.archivo_ranking):
+            with open(self.archivo_ranking, "r", encoding="utf-8") as f:
+                for linea in f:
+                    try:
+                        campos = [int(c) for c in linea.rstrip("\n").split(",")]
+                    except ValueError:
+                        return False
+                    if len(campos) not in (3, 5):
+                        return False
+                    offset, largo, crc = campos[:3]
+                    if offset + largo > self.cubierto:
+                        self.cubierto, self.ultima = offset + largo, (offset, largo, crc)
+                    if len(campos) == 5 and offset in primeros:
+                        filas[offset] = (campos[3], campos[4])
+        general: List[Tuple[int, int]] = []
+        por_nivel: Dict[int, List[Tuple[int, int]]] = {}
+        for offset, (nivel, puntaje) in filas.items():
+            general.append((-puntaje, offset))
+            por_nivel.setdefault(nivel, []).append((-puntaje, offset))
+        self.general = _Tabla(general)
+        self.por_nivel = {nivel: _Tabla(pares) for nivel, pares in por_nivel.items()}
+        return True
+
+    def _ponerse_al_dia(self) -> None:
+        """Agrega las líneas completas que están después de la parte ya cubierta."""
+        if not os.path.exists(self.archivo):
+            return
+        nuevas: List[Tuple[int, int, int, Optional[int], Optional[int]]] = []
+        with open(self.archivo, "rb") as f:
+            f.seek(self.cubierto)
+            offset = self.cubierto
+            for linea in f:
+                if not linea.endswith(b"\n"):
+                    break  # línea a medio escribir
+                jugador = _jugador(linea)
+                if jugador:
+                    nuevas.append((offset, len(linea), zlib.crc32(linea), jugador.nivel, jugador.puntaje))
+                else:
+                    nuevas.append((offset, len(linea), zlib.crc32(linea), None, None))
+                offset += len(linea)
+        self._agregar(nuevas, self.indice.primeros())
+
+    def _agregar(self, entradas: List[Tuple[int, int, int, Optional[int], Optional[int]]], primeros: Set[int]) -> None:
+        if not entradas:
+            return
+        general: List[Tuple[int, int]] = []
+        por_nivel: Dict[int, List[Tuple[int, int]]] = {}
+        with open(self.archivo_ranking, "a", encoding="utf-8") as f:
+            for offset, largo, crc, nivel, puntaje in entradas:
+                if offset + largo > self.cubierto:
+                    self.cubierto, self.ultima = offset + largo, (offset, largo, crc)
+                if puntaje is None:
+                    f.write(f"{offset},{largo},{crc}\n")
+                    continue
+                f.write(f"{offset},{largo},{crc},{nivel},{puntaje}\n")
+                if offset in primeros:
+                    general.append((puntaje, offset))
+                    por_nivel.setdefault(nivel, []).append((puntaje, offset))
+        self.general.insertar_muchos(general)
+        for nivel, pares in por_nivel.items():
+            self.por_nivel.setdefault(nivel, _Tabla()).insertar_muchos(pares)
+
+    def _leer(self, offsets: List[int]) -> List[Jugador]:
+        """Lee directamente las líneas que empiezan en esos offsets, en ese orden."""
+        jugadores = []
+        with open(self.archivo, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                jugador = _jugador(f.readline())
+                if jugador:
+                    jugadores.append(jugador)
+        return jugadores
+
+
+def _jugador(linea: bytes) -> Optional[Jugador]:
+    """Jugador de una línea del archivo (ver Jugador.from_line); None si no se puede leer."""
+    try:
+        return Jugador.from_line(linea)
+    except ValueError:
+        return None
@@ -0,0 +1,35 @@
+import os
+
+from jugador import Jugador
+from archivo_jugadores import ArchivoJugadores
+
+# Uso: python -m pytest test_nombres_jugadores.py (desde EJERCICIO10)
+# Nombres con comas: nivel y puntaje son los dos últimos campos de la línea, y
+# el índice, el ranking y las búsquedas tienen que leerla igual.
+
+
+def test_from_line_nombre_con_comas():
+    for linea in ("Pérez, Juan,3,500\n", "Pérez, Juan,3,500\r\n".encode("utf-8")):
+        j = Jugador.from_line(linea)
+        assert (j.nombre, j.nivel, j.puntaje) == ("Pérez, Juan", 3, 500)
+
+
+def test_buscar_prefijo_nombre_con_coma(tmp_path):
+    archivo = ArchivoJugadores(str(tmp_path / "jugadores.txt"))
+    archivo.guardar(Jugador("Pérez, Juan", 3, 500))
+    archivo.guardar(Jugador("Peralta", 1, 100))
+    assert [j.nombre for j in archivo.buscar_prefijo("pér")] == ["Pérez, Juan"]
+    assert [j.nombre for _, j in archivo.buscar_aproximado("perez, juan", 1)] == ["Pérez, Juan"]
+
+
+def test_ranking_igual_en_el_proceso_que_escribe_y_en_uno_nuevo(tmp_path):
+    ruta = str(tmp_path / "jugadores.txt")
+    escritor = ArchivoJugadores(ruta)
+    escritor.guardarMuchos([Jugador("Pérez, Juan", 3, 500), Jugador("ana", 1, 100)])
+    with open(ruta, "ab") as f:  # escrito por fuera del gestor
+        f.write(f"Gómez, Ana,2,900{os.linesep}".encode("utf-8"))
+    nuevo = ArchivoJugadores(ruta)
+    for archivo in (escritor, nuevo):
+        assert [j.nombre for j in archivo.ranking.top(10)] == ["Gómez, Ana", "Pérez, Juan", "ana"]
+        assert archivo.ranking.posicion("pérez, juan")[0] == 2
+        assert archivo._buscar_por_indice("Gómez, Ana").puntaje == 900
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from jugador import Jugador
+from archivo_jugadores import ArchivoJugadores
+from ranking_jugadores import RankingJugadores
+
+# Uso: python -m pytest test_ranking_jugadores.py (desde EJERCICIO10)
+# El .rank que mantiene un gestor lo reutiliza otro recién abierto, sin rearmarlo.
+
+
+@pytest.fixture
+def ruta(tmp_path):
+    random.seed(3)
+    ruta = str(tmp_path / "jugadores.txt")
+    ArchivoJugadores(ruta).guardarMuchos(Jugador(f"Jugador{i}", i % 5, random.randrange(10_000)) for i in range(1_000))
+    return ruta
+
+
+def test_segundo_gestor_reutiliza_el_rank(ruta, monkeypatch):
+    escritor = ArchivoJugadores(ruta)
+    escritor.guardar(Jugador("Nuevo", 2, 5_000))
+    esperado_top = [(j.nombre, j.puntaje) for j in escritor.ranking.top(20)]
+    esperado_nivel = [j.nombre for j in escritor.ranking.top_por_nivel(2, 10)]
+    esperado_puesto = escritor.ranking.posicion("nuevo")[0]
+
+    rearmados = []
+    monkeypatch.setattr(RankingJugadores, "reconstruir", lambda self: rearmados.append(self))
+    lector = ArchivoJugadores(ruta)
+    assert [(j.nombre, j.puntaje) for j in lector.ranking.top(20)] == esperado_top
+    assert [j.nombre for j in lector.ranking.top_por_nivel(2, 10)] == esperado_nivel
+    assert lector.ranking.posicion("nuevo")[0] == esperado_puesto
+    assert lector.ranking.total() == 1_001
+    assert rearmados == []
+
+
+def test_guardar_desde_un_gestor_recien_abierto(ruta, monkeypatch):
+    rearmados = []
+    monkeypatch.setattr(RankingJugadores, "reconstruir", lambda self: rearmados.append(self))
+    archivo = ArchivoJugadores(ruta)
+    archivo.guardar(Jugador("Campeon", 1, 10_000))
+    assert archivo.ranking.posicion("campeon")[0] == 1
+    assert ArchivoJugadores(ruta).ranking.top(1)[0].nombre == "Campeon"
+    assert rearmados == []
@@ -0,0 +1,160 @@
+import itertools
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # dependencia opcional: solo la necesita el modo analítico
+    np = None
+
+from trabajador import ArchivoTrabajador, Trabajador
+from almacenamiento import bloqueo_escritura, escribir_atomico, firma_archivo, iterar_data
+
+# ====================================================================
+# --- MODO ANALÍTICO (columnas NumPy) ---
+# ====================================================================
+# Carga solo carnet y salario en un arreglo estructurado de NumPy y responde
+# máximo, top-k, percentiles, orden y aumentos masivos con operaciones
+# vectorizadas, sin armar un Trabajador por fila. Las columnas se guardan en
+# "<archivo>.npy" precedidas por la firma (mtime, tamaño) del JSON del que
+# salieron; el sidecar vale solo si esa firma coincide con la actual.
+
+COLUMNAS = [("carnet", "i8"), ("salario", "f8")]
+
+
+class AnaliticaSalarios:
+    """Consultas de salarios sobre columnas NumPy de un ArchivoTrabajador."""
+
+    def __init__(self, archivo: ArchivoTrabajador, usar_npy: bool = True):
+        if np is None:
+            raise ImportError("El modo analítico necesita NumPy. Instálalo con: pip install numpy")
+        self.archivo = archivo
+        self.ruta_npy = archivo.nombre_arch + ".npy" if usar_npy else None
+        self._columnas = None
+        self._firma = None  # firma del JSON con la que se armaron las columnas
+
+    @property
+    def bloqueo(self):
+        """El bloqueo del archivo de trabajadores (para @bloqueo_escritura)."""
+        return self.archivo.bloqueo
+
+    def columnas(self) -> "np.ndarray":
+        """Arreglo estructurado (carnet, salario) en el orden del archivo."""
+        firma = firma_archivo(self.archivo.nombre_arch)
+        if self._columnas is None or firma != self._firma:
+            col = self._leer_npy(firma)
+            self._columnas = col if col is not None else self._construir(firma)
+            self._firma = firma
+        return self._columnas
+
+    # d) Mayor salario (el primero del archivo en caso de empate, igual que buscarMayorSalario)
+    def mayor_salario(self) -> Optional[Trabajador]:
+        col = self.columnas()
+        if not len(col):
+            return None
+        return self._trabajador_en(int(np.argmax(col["salario"])))
+
+    def top_k(self, k: int) -> List[Tuple[int, float]]:
+        """Los k salarios más altos como (carnet, salario), de mayor a menor."""
+        col = self.columnas()
+        salarios = col["salario"]
+        if k <= 0 or not len(salarios):
+            return []
+        k = min(k, len(salarios))
+        # Selección O(n): todos los que alcanzan el k-ésimo valor; los empates se ordenan por posición
+        umbral = np.partition(salarios, len(salarios) - k)[len(salarios) - k]
+        candidatos = np.flatnonzero(salarios >= umbral)
+        elegidos = candidatos[np.lexsort((candidatos, -salarios[candidatos]))][:k]
+        return list(zip(col["carnet"][elegidos].tolist(), salarios[elegidos].tolist()))
+
+    def percentiles(self, qs: Sequence[float] = (25, 50, 75, 90)) -> Dict[float, float]:
+        """Percentiles de salario ({} si no hay trabajadores)."""
+        salarios = self.columnas()["salario"]
+        if not len(salarios):
+            return {}
+        return dict(zip(qs, np.percentile(salarios, qs).tolist()))
+
+    # e) Orden por salario: carnets en el mismo orden que ordenarPorSalario (estable)
+    def orden(self, ascendente: bool = False) -> "np.ndarray":
+        col = self.columnas()
+        clave = col["salario"] if ascendente else -col["salario"]
+        return col["carnet"][np.argsort(clave, kind="stable")]
+
+    # c) aumentaSalario aplicado a muchos carnets con una sola escritura
+    @bloqueo_escritura
+    def aumentar_salarios(self, aumento: float, carnets: Iterable[int]) -> int:
+        """Suma el aumento a todos los carnets dados. Retorna cuántos trabajadores se modificaron.
+
+        Todo bajo el bloqueo de escritura del archivo: las columnas se leen al
+        día, el aumento se aplica con isin sobre la columna de salarios, el JSON
+        se escribe una vez y el .npy queda con la firma del JSON nuevo.
+        """
+        col = self.columnas()
+        mascara = np.isin(col["carnet"], np.fromiter(carnets, dtype=np.int64))
+        modificados = int(mascara.sum())
+        if not modificados:
+            return 0
+        nuevos = col["salario"].copy()
+        nuevos[mascara] += aumento
+
+        trabajadores = self.archivo._cargar_trabajadores()
+        if len(trabajadores) != len(nuevos):  # sin bloqueo=True otro gestor pudo escribir en el medio
+            return self.archivo.aumentaSalarios(aumento, col["carnet"][mascara].tolist())
+        for t, salario in zip(trabajadores, nuevos.tolist()):
+            t.salario = salario
+        if not self.archivo._guardar_lista(trabajadores):
+            self._columnas = None
+            return 0
+
+        col = col.copy()
+        col["salario"] = nuevos
+        self._columnas, self._firma = col, firma_archivo(self.archivo.nombre_arch)
+        self._escribir_npy(col, self._firma)
+        return modificados
+
+    def _descartar_cache(self) -> None:
+        """Tras un aumento cortado: se olvidan las columnas y los objetos en cache del archivo."""
+        self._columnas = None
+        self.archivo._descartar_cache()
+
+    def _construir(self, firma: Optional[Tuple[int, int]]) -> "np.ndarray":
+        """Recorre el archivo una vez (o los objetos del cache si está al día) y arma las columnas."""
+        cache = self.archivo.cache
+        en_cache = cache.vigente(self.archivo.nombre_arch) if cache is not None else None
+        if en_cache is not None:
+            filas = ((t.carnet, t.salario) for t in en_cache)
+        else:
+            filas = ((d["carnet"], d["salario"]) for d in iterar_data(self.archivo.nombre_arch, self.archivo.backend))
+        col = np.fromiter(filas, dtype=COLUMNAS)
+        self._escribir_npy(col, firma)
+        return col
+
+    def _leer_npy(self, firma: Optional[Tuple[int, int]]) -> Optional["np.ndarray"]:
+        """Columnas del .npy si se armaron con la versión del JSON de esa firma; None si no (o si está dañado)."""
+        if self.ruta_npy is None or firma is None or not os.path.exists(self.ruta_npy):
+            return None
+        try:
+            with open(self.ruta_npy, 'rb') as f:
+                if tuple(np.load(f, allow_pickle=False).tolist()) != tuple(firma):
+                    return None
+                col = np.load(f, allow_pickle=False)
+        except (OSError, ValueError, TypeError):
+            return None
+        return col if col.dtype == np.dtype(COLUMNAS) else None
+
+    def _escribir_npy(self, col: "np.ndarray", firma: Optional[Tuple[int, int]]) -> None:
+        if self.ruta_npy is None or firma is None:
+            return
+        try:
+            with escribir_atomico(self.ruta_npy, 'wb') as f:
+                np.save(f, np.array(firma, dtype=np.int64), allow_pickle=False)
+                np.save(f, col, allow_pickle=False)
+        except OSError as e:
+            print(f" No se pudo escribir '{self.ruta_npy}': {e}")
+
+    def _trabajador_en(self, posicion: int) -> Optional[Trabajador]:
+        """Arma solo el Trabajador de esa posición (por índice si el archivo lo tiene)."""
+        if self.archivo.indice is not None:
+            data = self.archivo.indice.buscar(int(self.columnas()["carnet"][posicion]))
+            return Trabajador.from_dict(data) if data else None
+        return next(itertools.islice(self.archivo.iterar(), posicion, None), None)
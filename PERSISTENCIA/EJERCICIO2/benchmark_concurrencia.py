@@ -0,0 +1,72 @@
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+from trabajador import ArchivoTrabajador, Trabajador
+from almacenamiento import ConflictoVersion, medir
+
+# Uso: python benchmark_concurrencia.py [PROCESOS] [OPERACIONES] [TRABAJADORES]
+# Cada proceso hace OPERACIONES ciclos cargar/modificar/guardar sobre el mismo archivo:
+# aumenta en 1 el salario del trabajador 1 y guarda un trabajador nuevo (carnet propio).
+# Al final se cuentan las actualizaciones perdidas (aumentos y altas que no quedaron en el archivo).
+N_PROCESOS = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+N_OPERACIONES = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+N_TRABAJADORES = int(sys.argv[3]) if len(sys.argv) > 3 else 1_000
+
+MODOS = [
+    ("sin bloqueo", False, False),
+    ("bloqueo exclusivo", True, False),
+    ("optimista (version + reintento)", True, True),
+]
+
+
+def trabajar(ruta, nro, con_bloqueo, optimista, conflictos):
+    arch = ArchivoTrabajador(ruta, bloqueo=con_bloqueo)
+    with redirect_stdout(io.StringIO()):
+        for i in range(N_OPERACIONES):
+            if optimista:
+                # Se lee la versión fuera del bloqueo y se escribe solo si nadie cambió el archivo
+                while True:
+                    version = arch.bloqueo.version()
+                    try:
+                        with arch.bloqueo.escritura(version_esperada=version):
+                            arch.aumentaSalario(1, 1)
+                        break
+                    except ConflictoVersion:
+                        with conflictos.get_lock():
+                            conflictos.value += 1
+            else:
+                arch.aumentaSalario(1, 1)
+            arch.guardarTrabajador(Trabajador(f"Proceso{nro}", 1_000_000 * (nro + 1) + i, 1000.0))
+
+
+def escenario(nombre, con_bloqueo, optimista, carpeta):
+    ruta = os.path.join(carpeta, f"trabajadores_{len(os.listdir(carpeta))}.json")
+    with redirect_stdout(io.StringIO()):
+        arch = ArchivoTrabajador(ruta)
+        arch.guardarMuchos(Trabajador(f"Trabajador{c}", c, 0.0) for c in range(1, N_TRABAJADORES + 1))
+    conflictos = multiprocessing.Value("i", 0)
+    procesos = [multiprocessing.Process(target=trabajar, args=(ruta, nro, con_bloqueo, optimista, conflictos))
+                for nro in range(N_PROCESOS)]
+    segundos, _ = medir(lambda: ([p.start() for p in procesos], [p.join() for p in procesos]))
+
+    trabajadores = arch._cargar_trabajadores()
+    esperado = N_PROCESOS * N_OPERACIONES
+    aumentos_perdidos = esperado - int(next(t.salario for t in trabajadores if t.carnet == 1))
+    altas_perdidas = esperado - (len(trabajadores) - N_TRABAJADORES)
+    ops = 2 * esperado / segundos
+    return nombre, ops, aumentos_perdidos, altas_perdidas, conflictos.value
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as carpeta:
+        filas = [escenario(nombre, con_bloqueo, optimista, carpeta) for nombre, con_bloqueo, optimista in MODOS]
+
+    print(f"{N_PROCESOS} procesos x {N_OPERACIONES} x (aumentaSalario + guardarTrabajador) "
+          f"sobre {N_TRABAJADORES:,} trabajadores")
+    print(f"{'Modo':32} {'ops/s':>8} {'aumentos perdidos':>18} {'altas perdidas':>15} {'conflictos':>11}")
+    for nombre, ops, aumentos, altas, conflictos in filas:
+        print(f"{nombre:32} {ops:8.1f} {aumentos:18} {altas:15} {conflictos:11}")
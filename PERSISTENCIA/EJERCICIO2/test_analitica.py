@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from analitica import AnaliticaSalarios
+from trabajador import ArchivoTrabajador, Trabajador
+
+# Uso: python -m pytest test_analitica.py (desde EJERCICIO2)
+# Aumentos masivos vectorizados: una escritura del JSON y el .npy al día.
+
+
+@pytest.fixture
+def archivo(tmp_path):
+    archivo = ArchivoTrabajador(str(tmp_path / "trabajadores.json"), bloqueo=True)
+    archivo.guardarMuchos(Trabajador(f"T{c}", c, 100.0 * c) for c in range(1, 6))
+    return archivo
+
+
+def test_aumentar_salarios_escribe_json_y_npy(archivo, monkeypatch):
+    analitica = AnaliticaSalarios(archivo)
+    analitica.columnas()
+    escrituras = []
+    guardar = archivo._guardar_lista
+    monkeypatch.setattr(archivo, "_guardar_lista", lambda ts: escrituras.append(1) or guardar(ts))
+
+    assert analitica.aumentar_salarios(10, [2, 4, 99]) == 2
+    assert escrituras == [1]
+    assert {t.carnet: t.salario for t in archivo.iterar()} == {1: 100, 2: 210, 3: 300, 4: 410, 5: 500}
+
+    # Otra instancia toma las columnas del .npy (firma del JSON nuevo) sin recorrer el archivo
+    otra = AnaliticaSalarios(archivo)
+    monkeypatch.setattr(otra, "_construir", lambda firma: pytest.fail("el .npy quedó desactualizado"))
+    assert otra.columnas()["salario"].tolist() == [100, 210, 300, 410, 500]
+
+
+def test_aumentar_salarios_sin_coincidencias_no_escribe(archivo, monkeypatch):
+    analitica = AnaliticaSalarios(archivo)
+    monkeypatch.setattr(archivo, "_guardar_lista", lambda ts: pytest.fail("no debía escribir"))
+    assert analitica.aumentar_salarios(10, [99]) == 0
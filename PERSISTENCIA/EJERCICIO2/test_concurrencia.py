@@ -0,0 +1,35 @@
+import io
+import multiprocessing
+from contextlib import redirect_stdout
+
+from trabajador import ArchivoTrabajador, Trabajador
+
+# Uso: python -m pytest test_concurrencia.py (desde EJERCICIO2)
+# Varios procesos con bloqueo=True sobre el mismo archivo: no se pierde ningún aumento ni alta.
+N_PROCESOS = 4
+N_OPERACIONES = 10
+
+
+def trabajar(ruta, nro):
+    arch = ArchivoTrabajador(ruta, bloqueo=True)
+    with redirect_stdout(io.StringIO()):
+        for i in range(N_OPERACIONES):
+            arch.aumentaSalario(1, 1)
+            arch.guardarTrabajador(Trabajador(f"Proceso{nro}", 1_000 * (nro + 1) + i, 1000.0))
+
+
+def test_procesos_concurrentes_con_bloqueo(tmp_path):
+    ruta = str(tmp_path / "trabajadores.json")
+    arch = ArchivoTrabajador(ruta, bloqueo=True)
+    arch.guardarMuchos(Trabajador(f"Trabajador{c}", c, 0.0) for c in range(1, 11))
+
+    procesos = [multiprocessing.Process(target=trabajar, args=(ruta, nro)) for nro in range(N_PROCESOS)]
+    for p in procesos:
+        p.start()
+    for p in procesos:
+        p.join(timeout=60)
+    assert all(p.exitcode == 0 for p in procesos)
+
+    trabajadores = {t.carnet: t for t in arch.iterar()}
+    assert trabajadores[1].salario == N_PROCESOS * N_OPERACIONES
+    assert len(trabajadores) == 10 + N_PROCESOS * N_OPERACIONES
@@ -0,0 +1,62 @@
+import pytest
+
+from trabajador import ArchivoTrabajador, Trabajador
+from almacenamiento import BackendJSON, BackendJSONL, IndicePrimario
+
+# Uso: python -m pytest test_indice_trabajadores.py (desde EJERCICIO2)
+# Índice persistente por carnet (<archivo>.idx): búsqueda, duplicados y altas al final.
+
+
+@pytest.fixture(params=[BackendJSON, BackendJSONL], ids=["json", "jsonl"])
+def archivo(tmp_path, request):
+    archivo = ArchivoTrabajador(str(tmp_path / "trabajadores.json"), request.param(), indexado=True)
+    archivo.guardarMuchos(Trabajador(f"T{c}", c, 100.0 * c) for c in range(1, 6))
+    return archivo
+
+
+@pytest.fixture
+def reconstrucciones(monkeypatch):
+    llamadas = []
+    reconstruir = IndicePrimario.reconstruir
+    monkeypatch.setattr(IndicePrimario, "reconstruir", lambda self: llamadas.append(1) or reconstruir(self))
+    return llamadas
+
+
+def test_busqueda_por_carnet(archivo):
+    assert archivo.indice.buscar(3) == Trabajador("T3", 3, 300.0).to_dict()
+    assert archivo.indice.buscar(99) is None
+    # Otro gestor toma el .idx del disco
+    assert ArchivoTrabajador(archivo.nombre_arch, archivo.backend, indexado=True).indice.buscar(5)["nombre"] == "T5"
+
+
+def test_duplicado_rechazado(archivo, capsys):
+    archivo.guardarTrabajador(Trabajador("Otro", 2, 1.0))
+    assert "ya existe" in capsys.readouterr().out
+    assert archivo.guardarMuchos([Trabajador("Otro", 4, 1.0), Trabajador("Nuevo", 6, 1.0)]) == \
+        {"guardados": 1, "duplicados": [4]}
+    assert [t.carnet for t in archivo.iterar()] == [1, 2, 3, 4, 5, 6]
+    assert archivo.indice.buscar(2)["nombre"] == "T2"
+
+
+def test_altas_al_final_indexan_solo_la_cola(archivo, reconstrucciones):
+    archivo.indice.buscar(1)
+    archivo.guardarTrabajador(Trabajador("T6", 6, 600.0))
+    # Otro gestor agrega al mismo archivo: el primero lee su .idx y no recorre todo de nuevo
+    otro = ArchivoTrabajador(archivo.nombre_arch, archivo.backend, indexado=True)
+    otro.guardarMuchos([Trabajador("T7", 7, 700.0)])
+
+    assert archivo.indice.buscar(6)["nombre"] == "T6"
+    assert archivo.indice.buscar(7)["nombre"] == "T7"
+    assert archivo.indice.contiene(7)
+    assert reconstrucciones == []
+
+
+def test_alta_fallida_no_se_informa_como_guardada(archivo, monkeypatch, capsys):
+    def falla(ruta, registros):
+        raise OSError("disco lleno")
+    monkeypatch.setattr(archivo.backend, "agregar", falla)
+    archivo.guardarTrabajador(Trabajador("T6", 6, 600.0))
+    salida = capsys.readouterr().out
+    assert "disco lleno" in salida
+    assert "guardado con éxito" not in salida
+    assert not archivo.indice.contiene(6)
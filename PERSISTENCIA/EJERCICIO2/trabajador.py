@@ -1,10 +1,17 @@
-import json
 import os
-from typing import List, Optional
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# --- Persistencia compartida (carpeta PERSISTENCIA/almacenamiento) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from almacenamiento import (Backend, BackendJSON, BloqueoArchivo, CacheArchivos, EnvoltorioAsincrono, IndicePrimario,
+                            ErrorAlmacenamiento, agregar_registros, bloqueo_escritura, bloqueo_lectura, iterar_data,
+                            respaldar_corrupto, separar_duplicados)
 
 # --- Definición de la Clase Trabajador ---
 class Trabajador:
     """Representa un trabajador individual con nombre, carnet y salario."""
+    __slots__ = ("nombre", "carnet", "salario")
     def __init__(self, nombre: str, carnet: int, salario: float):
         self.nombre = nombre
         self.carnet = carnet
@@ -30,45 +37,91 @@ class Trabajador:
 # --- Definición de la Clase ArchivoTrabajador ---
 class ArchivoTrabajador:
     """Gestiona la colección de Trabajadores y la persistencia de datos usando JSON."""
-    def __init__(self, nombre_arch: str):
+    def __init__(self, nombre_arch: str, backend: Optional[Backend] = None,
+                 cache: Optional[CacheArchivos] = None, indexado: bool = False, bloqueo: bool = False):
         self.nombre_arch = nombre_arch
+        self.backend = backend or BackendJSON() # Formato en disco (JSON con sangría por defecto)
+        self.cache = cache # Cache opcional de objetos ya parseados (compartible entre gestores)
+        self.indice = IndicePrimario(nombre_arch, "carnet", self.backend) if indexado else None # Índice persistente por carnet (.idx)
+        self.bloqueo = BloqueoArchivo.para(nombre_arch) if bloqueo else None # Bloqueo entre procesos (<archivo>.lock)
 
     # a) Implementa un método para crear y guardar el archivo.
+    @bloqueo_escritura
     def crearArchivo(self) -> None:
         """Inicializa el archivo JSON con una lista vacía de trabajadores."""
         try:
-            with open(self.nombre_arch, 'w') as f:
-                json.dump([], f, indent=4)
+            self.backend.guardar(self.nombre_arch, [])
             print(f"✅ Archivo '{self.nombre_arch}' creado y guardado con éxito.")
         except Exception as e:
             print(f"❌ Error al crear el archivo: {e}")
 
+    @bloqueo_lectura
     def _cargar_trabajadores(self) -> List[Trabajador]:
         """Método interno para cargar la lista de Trabajadores desde el archivo JSON."""
         if not os.path.exists(self.nombre_arch):
             self.crearArchivo()
 
+        if self.cache is not None:
+            return self.cache.obtener(self.nombre_arch, self._leer_trabajadores)
+        return self._leer_trabajadores()
+
+    def _leer_trabajadores(self) -> List[Trabajador]:
+        """Lee y parsea el archivo completo (sin pasar por el cache)."""
         try:
-            with open(self.nombre_arch, 'r') as f:
-                data = json.load(f)
-                return [Trabajador.from_dict(d) for d in data]
-        except (json.JSONDecodeError, FileNotFoundError, IOError) as e:
+            data = self.backend.cargar(self.nombre_arch)
+            return [Trabajador.from_dict(d) for d in data]
+        except ErrorAlmacenamiento:
+            # Archivo ilegible: se aparta para que el próximo guardado no lo pise
+            respaldar_corrupto(self.nombre_arch)
+            return []
+        except (FileNotFoundError, IOError) as e:
             # Maneja archivos corruptos o vacíos
             print(f"❌ Error al cargar trabajadores del archivo: {e}. Retornando lista vacía.")
             return []
 
-    def _guardar_lista(self, trabajadores: List[Trabajador]) -> None:
+    def iterar(self) -> Iterator[Trabajador]:
+        """Recorre los trabajadores de a uno sin armar la lista completa (memoria constante)."""
+        en_cache = self.cache.vigente(self.nombre_arch) if self.cache is not None else None
+        if en_cache is not None:
+            yield from en_cache
+            return
+        for d in iterar_data(self.nombre_arch, self.backend):
+            yield Trabajador.from_dict(d)
+
+    def _guardar_lista(self, trabajadores: List[Trabajador]) -> bool:
         """Método interno para guardar la lista completa de Trabajadores al archivo JSON."""
         data = [t.to_dict() for t in trabajadores]
         try:
-            with open(self.nombre_arch, 'w') as f:
-                json.dump(data, f, indent=4)
+            self.backend.guardar(self.nombre_arch, data)
+            if self.cache is not None:
+                self.cache.recordar(self.nombre_arch, trabajadores)
+            if self.indice is not None:
+                self.indice.registrar_claves(t.carnet for t in trabajadores)
+            return True
         except Exception as e:
+            self._descartar_cache()
             print(f"❌ Error al guardar la lista en el archivo: {e}")
+            return False
+
+    def _descartar_cache(self) -> None:
+        """Olvida los objetos en cache de este archivo (p. ej. si una modificación se cortó antes de guardar)."""
+        if self.cache is not None:
+            self.cache.invalidar(self.nombre_arch)
 
     # b) Implementa un método para guardar trabajadores.
+    @bloqueo_escritura
     def guardarTrabajador(self, t: Trabajador) -> None:
         """Carga la lista, añade el nuevo trabajador y guarda la lista de vuelta al archivo."""
+        # Con índice el duplicado se detecta en O(1) y el trabajador se agrega al final, sin cargar el archivo
+        if self.indice is not None:
+            if self.indice.contiene(t.carnet):
+                print(f"⚠️ Trabajador con carnet {t.carnet} ya existe. No se añadió.")
+                return
+            if not agregar_registros(self.nombre_arch, [t], self.backend, self.indice, self.cache):
+                return # agregar_registros ya informó el error
+            print(f"➕ Trabajador '{t.nombre}' guardado con éxito.")
+            return
+
         trabajadores = self._cargar_trabajadores()
         
         if any(tr.carnet == t.carnet for tr in trabajadores):
@@ -79,7 +132,26 @@ class ArchivoTrabajador:
         self._guardar_lista(trabajadores)
         print(f"➕ Trabajador '{t.nombre}' guardado con éxito.")
 
+    @bloqueo_escritura
+    def guardarMuchos(self, trabajadores: Iterable[Trabajador]) -> Dict[str, Any]:
+        """Guarda un lote de trabajadores con una sola carga y una sola escritura.
+
+        Los duplicados (carnet ya existente o repetido en el lote) no se imprimen:
+        vuelven en el reporte {"guardados": n, "duplicados": [carnets]}.
+        """
+        if self.indice is not None:
+            nuevos, reporte = separar_duplicados(trabajadores, self.indice.claves(), lambda x: x.carnet)
+            if nuevos and not agregar_registros(self.nombre_arch, nuevos, self.backend, self.indice, self.cache):
+                reporte["guardados"] = 0
+            return reporte
+        actuales = self._cargar_trabajadores()
+        nuevos, reporte = separar_duplicados(trabajadores, {x.carnet for x in actuales}, lambda x: x.carnet)
+        if nuevos and not self._guardar_lista(actuales + nuevos):
+            reporte["guardados"] = 0
+        return reporte
+
     # c) Implementa un método para aumentar el salario de un trabajador t.
+    @bloqueo_escritura
     def aumentaSalario(self, aumento: float, carnet_t: int) -> bool:
         """Aumenta el salario del trabajador identificado por su carnet."""
         trabajadores = self._cargar_trabajadores()
@@ -100,15 +172,29 @@ class ArchivoTrabajador:
             print(f"⚠️ Trabajador con carnet {carnet_t} no encontrado.")
             return False
 
+    @bloqueo_escritura
+    def aumentaSalarios(self, aumento: float, carnets: Iterable[int]) -> int:
+        """aumentaSalario para muchos carnets con una sola carga y una sola escritura.
+
+        El aumento se aplica por carnet sobre los trabajadores tal como están en
+        el archivo al tomar el bloqueo. Retorna cuántos se modificaron.
+        """
+        carnets = set(carnets)
+        trabajadores = self._cargar_trabajadores()
+        modificados = 0
+        for t in trabajadores:
+            if t.carnet in carnets:
+                t.salario += aumento
+                modificados += 1
+        if modificados and not self._guardar_lista(trabajadores):
+            return 0
+        return modificados
+
     # d) Buscar el trabajador con el mayor salario.
     def buscarMayorSalario(self) -> Optional[Trabajador]:
         """Busca y retorna el trabajador con el salario más alto."""
-        trabajadores = self._cargar_trabajadores()
-        
-        if not trabajadores:
-            return None
-        
-        trabajador_mayor_salario = max(trabajadores, key=lambda t: t.salario)
+        # max() sobre el iterador: no se arma la lista completa
+        trabajador_mayor_salario = max(self.iterar(), key=lambda t: t.salario, default=None)
         return trabajador_mayor_salario
 
     # e) Ordenar a los trabajadores por su salario.
@@ -117,4 +203,12 @@ class ArchivoTrabajador:
         trabajadores = self._cargar_trabajadores()
         
         trabajadores_ordenados = sorted(trabajadores, key=lambda t: t.salario, reverse=not ascendente)
-        return trabajadores_ordenados
\ No newline at end of file
+        return trabajadores_ordenados
+
+
+# --- Versión asíncrona (asyncio) ---
+class AsyncArchivoTrabajador(EnvoltorioAsincrono):
+    """ArchivoTrabajador con métodos awaitable (E/S y parseo fuera del event loop)."""
+    lecturas = ("buscarMayorSalario", "ordenarPorSalario")
+    mutaciones = ("crearArchivo", "guardarTrabajador", "guardarMuchos", "aumentaSalario", "aumentaSalarios")
+    carga = "_cargar_trabajadores"
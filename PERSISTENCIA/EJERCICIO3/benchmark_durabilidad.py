@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+
+from producto import Producto
+from almacenamiento import BackendJSON, DURABILIDADES, medir
+
+# Uso: python benchmark_durabilidad.py [REPETICIONES] [PRODUCTOS_GRANDE]
+# Mide lo que cuesta cada guardado completo (lo que hace _guardar_lista) con
+# cada nivel de durabilidad, para un archivo chico y uno grande.
+REPETICIONES = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+N_GRANDE = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+
+CASOS = [
+    ("chico (100 productos)", 100, REPETICIONES),
+    (f"grande ({N_GRANDE:,} productos)", N_GRANDE, max(3, REPETICIONES // 50)),
+]
+
+
+def guardado_ms(durabilidad, data, repeticiones, carpeta):
+    backend = BackendJSON(durabilidad=durabilidad)
+    ruta = os.path.join(carpeta, f"productos_{durabilidad}.json")
+    backend.guardar(ruta, data)  # el archivo ya existe, como en el uso normal
+    return medir(lambda: backend.guardar(ruta, data), repeticiones)[0] * 1000
+
+
+with tempfile.TemporaryDirectory(dir=".") as carpeta:
+    print(f"{'Caso':28} " + " ".join(f"{d + ' (ms)':>14}" for d in DURABILIDADES))
+    for nombre, n, repeticiones in CASOS:
+        data = [Producto(i, f"Producto {i}", round(i * 0.37 % 500, 2)).to_dict() for i in range(n)]
+        tiempos = [guardado_ms(d, data, repeticiones, carpeta) for d in DURABILIDADES]
+        print(f"{nombre:28} " + " ".join(f"{t:14.2f}" for t in tiempos))
+
+print("\nninguna: sin protección (un corte a mitad deja el archivo truncado)")
+print("flush  : temporal + rename, seguro ante caídas del programa")
+print("fsync  : además fuerza a disco, seguro ante cortes de luz")
@@ -1,10 +1,17 @@
-import json
 import os
-from typing import List, Optional
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# --- Persistencia compartida (carpeta PERSISTENCIA/almacenamiento) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from almacenamiento import (Backend, BackendJSON, BloqueoArchivo, CacheArchivos, EnvoltorioAsincrono, IndicePrimario,
+                            ErrorAlmacenamiento, agregar_registros, bloqueo_escritura, bloqueo_lectura, iterar_data, respaldar_corrupto,
+                            separar_duplicados)
 
 # --- Definición de la Clase Producto ---
 class Producto:
     """Representa un producto individual con código, nombre y precio."""
+    __slots__ = ("codigo", "nombre", "precio")
     def __init__(self, codigo: int, nombre: str, precio: float):
         # Atributos: codigo: int, nombre: String, precio: float
         self.codigo = codigo
@@ -31,47 +38,93 @@ class Producto:
 # --- Definición de la Clase ArchivoProducto ---
 class ArchivoProducto:
     """Gestiona la colección de Productos y la persistencia de datos usando JSON."""
-    def __init__(self, noma: str):
+    def __init__(self, noma: str, backend: Optional[Backend] = None,
+                 cache: Optional[CacheArchivos] = None, indexado: bool = False, bloqueo: bool = False):
         # Atributo noma: String (Nombre del archivo)
         self.noma = noma
+        self.backend = backend or BackendJSON() # Formato en disco (JSON con sangría por defecto)
+        self.cache = cache # Cache opcional de objetos ya parseados (compartible entre gestores)
+        self.indice = IndicePrimario(noma, "codigo", self.backend) if indexado else None # Índice persistente por codigo (.idx)
+        self.bloqueo = BloqueoArchivo.para(noma) if bloqueo else None # Bloqueo entre procesos (<archivo>.lock)
 
+    @bloqueo_lectura
     def _cargar_productos(self) -> List[Producto]:
         """Método interno para cargar la lista de Productos desde el archivo JSON."""
         if not os.path.exists(self.noma):
             self.crearArchivo()
 
+        if self.cache is not None:
+            return self.cache.obtener(self.noma, self._leer_productos)
+        return self._leer_productos()
+
+    def _leer_productos(self) -> List[Producto]:
+        """Lee y parsea el archivo completo (sin pasar por el cache)."""
         try:
-            with open(self.noma, 'r') as f:
-                data = json.load(f)
-                # Convertimos cada diccionario de JSON a un objeto Producto
-                return [Producto.from_dict(d) for d in data]
-        except (json.JSONDecodeError, FileNotFoundError, IOError) as e:
+            data = self.backend.cargar(self.noma)
+            # Convertimos cada diccionario de JSON a un objeto Producto
+            return [Producto.from_dict(d) for d in data]
+        except ErrorAlmacenamiento:
+            # Archivo ilegible: se aparta para que el próximo guardado no lo pise
+            respaldar_corrupto(self.noma)
+            return []
+        except (FileNotFoundError, IOError) as e:
             print(f" Error al cargar productos del archivo: {e}. Retornando lista vacía.")
             return []
 
-    def _guardar_lista(self, productos: List[Producto]) -> None:
+    def iterar(self) -> Iterator[Producto]:
+        """Recorre los productos de a uno sin armar la lista completa (memoria constante)."""
+        en_cache = self.cache.vigente(self.noma) if self.cache is not None else None
+        if en_cache is not None:
+            yield from en_cache
+            return
+        for d in iterar_data(self.noma, self.backend):
+            yield Producto.from_dict(d)
+
+    def _guardar_lista(self, productos: List[Producto]) -> bool:
         """Método interno para guardar la lista completa de Productos al archivo JSON."""
         data = [p.to_dict() for p in productos]
         try:
-            with open(self.noma, 'w') as f:
-                json.dump(data, f, indent=4)
+            self.backend.guardar(self.noma, data)
+            if self.cache is not None:
+                self.cache.recordar(self.noma, productos)
+            if self.indice is not None:
+                self.indice.registrar_claves(p.codigo for p in productos)
+            return True
         except Exception as e:
+            self._descartar_cache()
             print(f" Error al guardar la lista en el archivo: {e}")
+            return False
+
+    def _descartar_cache(self) -> None:
+        """Olvida los objetos en cache de este archivo (p. ej. si una modificación se cortó antes de guardar)."""
+        if self.cache is not None:
+            self.cache.invalidar(self.noma)
 
     # a) Implementar el diagrama de clases: Método constructor y crearArchivo
+    @bloqueo_escritura
     def crearArchivo(self) -> None:
         """Inicializa el archivo JSON con una lista vacía de productos."""
         try:
-            with open(self.noma, 'w') as f:
-                json.dump([], f, indent=4)
+            self.backend.guardar(self.noma, [])
             # Nota: No se imprime mensaje para mantenerlo silencioso al usarlo internamente
         except Exception as e:
             print(f" Error al crear el archivo '{self.noma}': {e}")
 
 
     # b) Implementa guardarProducto(Producto p) para almacenar productos.
+    @bloqueo_escritura
     def guardarProducto(self, p: Producto) -> None:
         """Almacena un producto en el archivo, evitando códigos duplicados."""
+        # Con índice el duplicado se detecta en O(1) y el producto se agrega al final, sin cargar el archivo
+        if self.indice is not None:
+            if self.indice.contiene(p.codigo):
+                print(f" Producto con código {p.codigo} ya existe ('{p.nombre}'). No se añadió.")
+                return
+            if not agregar_registros(self.noma, [p], self.backend, self.indice, self.cache):
+                return # agregar_registros ya informó el error
+            print(f" Producto '{p.nombre}' (Cód. {p.codigo}) guardado con éxito.")
+            return
+
         productos = self._cargar_productos()
         
         # Opcional: Evitar duplicados por código
@@ -83,12 +136,32 @@ class ArchivoProducto:
         self._guardar_lista(productos)
         print(f" Producto '{p.nombre}' (Cód. {p.codigo}) guardado con éxito.")
 
+    @bloqueo_escritura
+    def guardarMuchos(self, productos: Iterable[Producto]) -> Dict[str, Any]:
+        """Guarda un lote de productos con una sola carga y una sola escritura.
+
+        Los duplicados (codigo ya existente o repetido en el lote) no se imprimen:
+        vuelven en el reporte {"guardados": n, "duplicados": [codigos]}.
+        """
+        if self.indice is not None:
+            nuevos, reporte = separar_duplicados(productos, self.indice.claves(), lambda x: x.codigo)
+            if nuevos and not agregar_registros(self.noma, nuevos, self.backend, self.indice, self.cache):
+                reporte["guardados"] = 0
+            return reporte
+        actuales = self._cargar_productos()
+        nuevos, reporte = separar_duplicados(productos, {x.codigo for x in actuales}, lambda x: x.codigo)
+        if nuevos and not self._guardar_lista(actuales + nuevos):
+            reporte["guardados"] = 0
+        return reporte
+
     # c) Implementa buscaProducto(int c) buscando el código.
     def buscaProducto(self, c: int) -> Optional[Producto]:
         """Busca y retorna un producto por su código."""
-        productos = self._cargar_productos()
-        
-        for p in productos:
+        if self.indice is not None:
+            data = self.indice.buscar(c)
+            return Producto.from_dict(data) if data else None
+
+        for p in self.iterar():
             if p.codigo == c:
                 return p
         
@@ -97,23 +170,29 @@ class ArchivoProducto:
     # d) Calcular el promedio de precios de los productos.
     def calcularPromedioPrecios(self) -> float:
         """Calcula el precio promedio de todos los productos en el archivo."""
-        productos = self._cargar_productos()
-        
-        if not productos:
+        # Suma y cuenta en una sola pasada sobre el iterador (memoria constante)
+        total_precios, cantidad = 0.0, 0
+        for p in self.iterar():
+            total_precios += p.precio
+            cantidad += 1
+
+        if not cantidad:
             return 0.0
-        
-        total_precios = sum(p.precio for p in productos)
-        promedio = total_precios / len(productos)
+
+        promedio = total_precios / cantidad
         return promedio
 
     # e) Mostrar el producto mas caro.
     def mostrarProductoMasCaro(self) -> Optional[Producto]:
         """Busca y retorna el producto con el precio más alto."""
-        productos = self._cargar_productos()
-        
-        if not productos:
-            return None
-        
-        # Usamos la función max() con una clave (key) lambda
-        producto_mas_caro = max(productos, key=lambda p: p.precio)
-        return producto_mas_caro
\ No newline at end of file
+        # Usamos la función max() con una clave (key) lambda, directamente sobre el iterador
+        producto_mas_caro = max(self.iterar(), key=lambda p: p.precio, default=None)
+        return producto_mas_caro
+
+
+# --- Versión asíncrona (asyncio) ---
+class AsyncArchivoProducto(EnvoltorioAsincrono):
+    """ArchivoProducto con métodos awaitable (E/S y parseo fuera del event loop)."""
+    lecturas = ("buscaProducto", "calcularPromedioPrecios", "mostrarProductoMasCaro")
+    mutaciones = ("crearArchivo", "guardarProducto", "guardarMuchos")
+    carga = "_cargar_productos"
@@ -1,5 +1,9 @@
 from modelo import Estudiante, Nota
-import json, os
+import json, os, sys
+
+# --- Persistencia compartida (carpeta PERSISTENCIA/almacenamiento) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from almacenamiento import BackendJSON, escribir_atomico
 
 class ArchiNota:
     def __init__(self, nombreArchi="notas.json"):
@@ -11,8 +15,13 @@ class ArchiNota:
             data = json.load(f)
             return [Nota.from_dict(n) for n in data]
 
+    # Recorre las notas de a una sin cargar el arreglo completo
+    def iterar(self):
+        for n in BackendJSON().iterar(self.nombreArchi):
+            yield Nota.from_dict(n)
+
     def guardar(self, lista):
-        with open(self.nombreArchi, "w") as f:
+        with escribir_atomico(self.nombreArchi) as f:  # temporal + rename: nunca queda a medias
             json.dump([n.to_dict() for n in lista], f, indent=4)
 
     # b) Agregar varios estudiantes con notas
@@ -23,16 +32,23 @@ class ArchiNota:
 
     # c) Promedio general de notas
     def promedio_general(self):
-        datos = self.cargar()
-        if not datos: return 0
-        return sum(n.notaFinal for n in datos) / len(datos)
+        suma, cantidad = 0, 0
+        for n in self.iterar():
+            suma += n.notaFinal
+            cantidad += 1
+        if not cantidad: return 0
+        return suma / cantidad
 
     # d) Mejor(es) nota(s)
     def mejor_nota(self):
-        datos = self.cargar()
-        if not datos: return []
-        max_nota = max(n.notaFinal for n in datos)
-        return [n for n in datos if n.notaFinal == max_nota]
+        # Una sola pasada: solo se guardan los empatados con la mejor nota vista
+        max_nota, mejores = None, []
+        for n in self.iterar():
+            if max_nota is None or n.notaFinal > max_nota:
+                max_nota, mejores = n.notaFinal, [n]
+            elif n.notaFinal == max_nota:
+                mejores.append(n)
+        return mejores
 
     # e) Eliminar estudiantes por materia
     def eliminar_por_materia(self, materia):
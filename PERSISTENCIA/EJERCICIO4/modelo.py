@@ -2,6 +2,7 @@ import json
 import os
 
 class Estudiante:
+    __slots__ = ("ru", "nombre", "paterno", "materno", "edad")
     def __init__(self, ru, nombre, paterno, materno, edad):
         self.ru = ru
         self.nombre = nombre
@@ -10,7 +11,7 @@ class Estudiante:
         self.edad = edad
 
     def to_dict(self):
-        return self.__dict__
+        return {"ru": self.ru, "nombre": self.nombre, "paterno": self.paterno, "materno": self.materno, "edad": self.edad}
 
     @staticmethod
     def from_dict(data):
@@ -21,6 +22,7 @@ class Estudiante:
 
 
 class Nota:
+    __slots__ = ("materia", "notaFinal", "estudiante")
     def __init__(self, materia, notaFinal, estudiante: Estudiante):
         self.materia = materia
         self.notaFinal = notaFinal
@@ -0,0 +1,95 @@
+import asyncio
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from farmacia import ArchFarmacia, AsyncArchFarmacia, Farmacia, Medicamento
+from almacenamiento import CacheArchivos
+
+# Uso: python benchmark_asincrono.py [PETICIONES] [SUCURSALES] [MEDICAMENTOS_POR_SUCURSAL]
+# Llegan PETICIONES a la vez a un servicio asyncio: 95% consultas (Tos de una sucursal,
+# farmacias con un medicamento) y 5% altas de medicamentos. Se mide la latencia de cada
+# petición y cuánto se atrasa un latido de 10 ms del event loop.
+N_PETICIONES = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+N_SUCURSALES = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+N_MEDICAMENTOS = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+TIPOS = ["Tos", "Dolor", "Fiebre", "Alergia"]
+
+
+def peticiones():
+    random.seed(42)
+    lista = []
+    for i in range(N_PETICIONES):
+        r = random.random()
+        if r < 0.05:
+            m = Medicamento(f"Nuevo{i}", 10_000_000 + i, "Tos", 5.0)
+            lista.append(("adicionar_medicamento", (random.randint(1, N_SUCURSALES), m)))
+        elif r < 0.80:
+            lista.append(("mostrarMedicamentosTosSucursal", (random.randint(1, N_SUCURSALES),)))
+        else:
+            lista.append(("buscarFarmaciasPorMedicamento", (f"Med{random.randrange(N_MEDICAMENTOS)}",)))
+    return lista
+
+
+def preparar(ruta):
+    farmacias = []
+    for s in range(1, N_SUCURSALES + 1):
+        f = Farmacia(f"Farmacia {s}", s, f"Calle {s}")
+        f.medicamentos = [Medicamento(f"Med{i}", s * 100_000 + i, TIPOS[i % len(TIPOS)], 1.0 + i % 50)
+                          for i in range(N_MEDICAMENTOS)]
+        farmacias.append(f)
+    with redirect_stdout(io.StringIO()):
+        ArchFarmacia(ruta).adicionarLote(farmacias)
+
+
+async def latido(atrasos, fin):
+    """Tarea que debería despertar cada 10 ms; anota cuánto se atrasó."""
+    while not fin.is_set():
+        antes = time.perf_counter()
+        await asyncio.sleep(0.01)
+        atrasos.append(time.perf_counter() - antes - 0.01)
+
+
+async def servir(modo, ruta):
+    arch = ArchFarmacia(ruta, cache=CacheArchivos() if modo == "async + cache" else None)
+    envoltorio = AsyncArchFarmacia(arch, coalescer=modo != "async sin coalescencia") if modo != "síncrono" else None
+    latencias, atrasos, fin = [], [], asyncio.Event()
+
+    async def atender(nombre, args, llegada):
+        if envoltorio is None:
+            getattr(arch, nombre)(*args) # Bloquea el event loop mientras lee y parsea
+        else:
+            await getattr(envoltorio, nombre)(*args)
+        latencias.append(time.perf_counter() - llegada)
+
+    tarea_latido = asyncio.create_task(latido(atrasos, fin))
+    await asyncio.sleep(0.05)
+    inicio = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        await asyncio.gather(*(atender(nombre, args, inicio) for nombre, args in peticiones()))
+    total = time.perf_counter() - inicio
+    fin.set()
+    await tarea_latido
+    coalescidas = envoltorio.coalescidas if envoltorio is not None else 0
+    if envoltorio is not None:
+        envoltorio.cerrar()
+    latencias.sort()
+    return (modo, latencias[len(latencias) // 2], latencias[int(len(latencias) * 0.99) - 1], total,
+            max(atrasos, default=0.0), coalescidas)
+
+
+filas = []
+with tempfile.TemporaryDirectory() as carpeta:
+    for modo in ("síncrono", "async sin coalescencia", "async + coalescencia", "async + cache"):
+        ruta = os.path.join(carpeta, f"farmacias_{len(filas)}.json")
+        preparar(ruta)
+        filas.append(asyncio.run(servir(modo, ruta)))
+
+print(f"{N_PETICIONES:,} peticiones simultáneas, {N_SUCURSALES} sucursales x {N_MEDICAMENTOS} medicamentos")
+print(f"{'Modo':24} {'p50 (ms)':>9} {'p99 (ms)':>9} {'total (s)':>10} {'atraso máx. loop (ms)':>22} {'coalescidas':>12}")
+for modo, p50, p99, total, atraso, coalescidas in filas:
+    print(f"{modo:24} {p50 * 1000:9.0f} {p99 * 1000:9.0f} {total:10.2f} {atraso * 1000:22.0f} {coalescidas:12}")
@@ -0,0 +1,70 @@
+import io
+import os
+import random
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+from farmacia import Farmacia, Medicamento, ArchFarmacia, ArchFarmaciaFragmentada
+from almacenamiento import medir
+
+# Uso: python benchmark_fragmentos.py [SUCURSALES] [MEDICAMENTOS_POR_SUCURSAL]
+# El modo de archivo único necesita todo el inventario en memoria: se omite
+# por encima de LIMITE_ARCHIVO_UNICO medicamentos en total.
+N_SUCURSALES = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+N_MEDICAMENTOS = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+LIMITE_ARCHIVO_UNICO = 1_000_000
+TIPOS = ["Tos", "Dolor", "Fiebre", "Alergia", "Gripe"]
+MOVIMIENTOS_TX = 100
+
+
+def generar_farmacias():
+    """Genera las farmacias de a una (el modo fragmentado las escribe sin juntarlas)."""
+    for s in range(1, N_SUCURSALES + 1):
+        f = Farmacia(f"Farmacia {s}", s, f"Calle {random.randint(1, 9999)}")
+        f.medicamentos = [Medicamento(f"Med{s}_{i}", s * N_MEDICAMENTOS + i, TIPOS[i % len(TIPOS)], 10.0 + i % 90)
+                          for i in range(N_MEDICAMENTOS)]
+        yield f
+
+
+def movimientos_en_transaccion(arch):
+    arch.begin()
+    for _ in range(MOVIMIENTOS_TX):
+        origen, destino = random.sample(range(1, N_SUCURSALES + 1), 2)
+        arch.moverMedicamentosPorTipo(random.choice(TIPOS), origen, destino)
+    arch.commit()
+
+
+OPERACIONES = [
+    ("buscar_farmacia_por_sucursal", lambda a: a.buscar_farmacia_por_sucursal(random.randint(1, N_SUCURSALES)), 5),
+    ("mostrarMedicamentosTosSucursal", lambda a: a.mostrarMedicamentosTosSucursal(random.randint(1, N_SUCURSALES)), 5),
+    ("moverMedicamentosPorTipo (1)", lambda a: a.moverMedicamentosPorTipo(
+        random.choice(TIPOS), *random.sample(range(1, N_SUCURSALES + 1), 2)), 3),
+    (f"{MOVIMIENTOS_TX} movimientos en transacción", movimientos_en_transaccion, 1),
+]
+
+random.seed(7)
+total = N_SUCURSALES * N_MEDICAMENTOS
+archivo_unico = total <= LIMITE_ARCHIVO_UNICO
+with tempfile.TemporaryDirectory(dir=".") as carpeta:
+    fragmentada = ArchFarmaciaFragmentada(os.path.join(carpeta, "fragmentos"))
+    t_carga, _ = medir(lambda: fragmentada.adicionarLote(generar_farmacias()))
+    random.seed(11)
+    t_frag = [medir(lambda: op(fragmentada), rep, silencioso=True)[0] * 1000 for _, op, rep in OPERACIONES]
+
+    t_unico = [None] * len(OPERACIONES)
+    if archivo_unico:
+        unico = ArchFarmacia(os.path.join(carpeta, "datos_farmacias.json"))
+        with redirect_stdout(io.StringIO()):
+            unico.adicionarLote(list(fragmentada.iterar()))
+        random.seed(11)
+        t_unico = [medir(lambda: op(unico), rep, silencioso=True)[0] * 1000 for _, op, rep in OPERACIONES]
+
+print(f"{N_SUCURSALES:,} sucursales x {N_MEDICAMENTOS:,} medicamentos = {total:,} "
+      f"(alta fragmentada: {t_carga:.1f} s)")
+print(f"{'Operación':36} {'Archivo único (ms)':>19} {'Fragmentado (ms)':>17}")
+for (nombre, _, _), tu, tf in zip(OPERACIONES, t_unico, t_frag):
+    unico_txt = f"{tu:19.1f}" if tu is not None else f"{'omitido':>19}"
+    print(f"{nombre:36} {unico_txt} {tf:17.1f}")
+if not archivo_unico:
+    print(f"\n(archivo único omitido: más de {LIMITE_ARCHIVO_UNICO:,} medicamentos no entran en memoria de una vez)")
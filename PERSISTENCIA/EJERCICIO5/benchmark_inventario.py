@@ -0,0 +1,44 @@
+import os
+import sys
+import tempfile
+
+from farmacia import Farmacia, Medicamento, ArchFarmacia
+from almacenamiento import medir_inventario, imprimir_inventario
+
+# Uso: python benchmark_inventario.py [TAMAÑOS...]
+# Mide en memoria (sin disco) armar, cargar, mover y eliminar en inventarios grandes.
+TAMANOS = [int(x) for x in sys.argv[1:]] or [1_000, 10_000, 100_000]
+TIPOS = ["Tos", "Dolor", "Fiebre", "Alergia"]
+
+
+def medicamentos(n, desde=0):
+    return [Medicamento(f"Med{i}", i, TIPOS[i % len(TIPOS)], 1.0 + i % 50) for i in range(desde, desde + n)]
+
+
+def construir(n):
+    f = Farmacia("Bench", 1, "Calle 1")
+    for m in medicamentos(n):
+        f.adicionar_medicamento(m)
+    return f
+
+
+def mover(n):
+    # Destino con la mitad de los códigos de origen: la mitad de los 'Tos' se repite y no se mueve
+    origen = Farmacia("Origen", 1, "Calle 1")
+    origen.medicamentos = medicamentos(n)
+    destino = Farmacia("Destino", 2, "Calle 2")
+    destino.medicamentos = medicamentos(n, desde=n // 2)
+    return lambda: arch._mover_medicamentos([origen, destino], "Tos", 1, 2)
+
+
+def eliminar(n, paso):
+    f = Farmacia("Bench", 1, "Calle 1")
+    f.medicamentos = medicamentos(n)
+    return lambda: [f.eliminar_medicamento(c) for c in range(0, n, paso)]
+
+
+with tempfile.TemporaryDirectory() as carpeta:
+    arch = ArchFarmacia(os.path.join(carpeta, "bench.json")) # Solo para _mover_medicamentos; no se escribe
+    filas = medir_inventario(TAMANOS, construir, mover, eliminar)
+
+imprimir_inventario("Medicamentos", "mover Tos", filas)
@@ -1,10 +1,19 @@
-import json
 import os
-from typing import List, Optional, Dict, Any
+import sys
+from typing import List, Optional, Dict, Any, Callable, Iterable, Iterator, Set, Tuple
+
+# --- Persistencia compartida (carpeta PERSISTENCIA/almacenamiento) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from almacenamiento import (Backend, BackendJSON, BloqueoArchivo, CacheArchivos, EnvoltorioAsincrono, IndicePrimario,
+                            ErrorAlmacenamiento, RegistroTransacciones, agregar_registros, bloqueo_escritura, bloqueo_lectura, cargar_data,
+                            cargar_paralelo, firma_archivo, guardar_data, huella_archivo, iterar_data, respaldar_corrupto,
+                            separar_duplicados)
+from indice_medicamentos import IndiceMedicamentos
 
 # --- CLASE 1: MEDICAMENTO ---
 class Medicamento:
     """Representa un medicamento individual."""
+    __slots__ = ("nombre", "codMedicamento", "tipo", "precio")
     def __init__(self, nombre: str, codMedicamento: int, tipo: str, precio: float):
         self.nombre = nombre
         self.codMedicamento = codMedicamento
@@ -37,7 +46,12 @@ class Medicamento:
 
 # --- CLASE 2: FARMACIA ---
 class Farmacia:
-    """Representa una sucursal de farmacia con su inventario de medicamentos."""
+    """Representa una sucursal de farmacia con su inventario de medicamentos.
+
+    El inventario se cambia con los métodos o reasignando la lista completa
+    (no con append directo), así el índice por código queda al día.
+    """
+    __slots__ = ("nombreFarmacia", "sucursal", "direccion", "_medicamentos", "_por_codigo")
     def __init__(self, nombreFarmacia: str, sucursal: int, direccion: str):
         self.nombreFarmacia = nombreFarmacia
         self.sucursal = sucursal
@@ -47,12 +61,45 @@ class Farmacia:
     def __str__(self):
         return f"Farmacia(Nombre: {self.nombreFarmacia}, Sucursal: {self.sucursal}, Dirección: {self.direccion}, #Med: {len(self.medicamentos)})"
 
+    @property
+    def medicamentos(self) -> List[Medicamento]:
+        return self._medicamentos
+
+    @medicamentos.setter
+    def medicamentos(self, medicamentos: List[Medicamento]) -> None:
+        """Reemplaza el inventario y rearma el índice codMedicamento -> Medicamento."""
+        self._medicamentos = medicamentos
+        # reversed: con códigos repetidos en el archivo gana el primero, como en la búsqueda lineal
+        self._por_codigo: Dict[int, Medicamento] = {m.codMedicamento: m for m in reversed(medicamentos)}
+
     def adicionar_medicamento(self, m: Medicamento):
         """Añade un medicamento al inventario de la farmacia."""
-        if any(med.codMedicamento == m.codMedicamento for med in self.medicamentos):
+        if m.codMedicamento in self._por_codigo:
             print(f"  ⚠️ Código de medicamento {m.codMedicamento} ya existe en Sucursal {self.sucursal}.")
             return
-        self.medicamentos.append(m)
+        self._medicamentos.append(m)
+        self._por_codigo[m.codMedicamento] = m
+
+    def buscar_por_codigo(self, codMedicamento: int) -> Optional[Medicamento]:
+        return self._por_codigo.get(codMedicamento)
+
+    def recibir_medicamentos(self, medicamentos: List[Medicamento]) -> None:
+        """Agrega al final medicamentos ya filtrados por quien llama (p. ej. los de un movimiento)."""
+        self._medicamentos.extend(medicamentos)
+        for m in medicamentos:
+            self._por_codigo.setdefault(m.codMedicamento, m)
+
+    def eliminar_medicamento(self, codMedicamento: int) -> Optional[Medicamento]:
+        """Quita el medicamento con ese código y lo retorna (None si no estaba)."""
+        m = self._por_codigo.pop(codMedicamento, None)
+        if m is None:
+            return None
+        self._medicamentos.remove(m)
+        if len(self._medicamentos) > len(self._por_codigo): # Hay códigos repetidos (archivo editado a mano)
+            otro = next((x for x in self._medicamentos if x.codMedicamento == codMedicamento), None)
+            if otro is not None:
+                self._por_codigo[codMedicamento] = otro
+        return m
 
     # Métodos del diagrama (simplificados o adaptados)
     def getDireccion(self) -> str:
@@ -92,63 +139,187 @@ class Farmacia:
 # --- CLASE 3: ARCHFARMACIA ---
 class ArchFarmacia:
     """Gestiona el archivo JSON que contiene la lista de Farmacias."""
-    def __init__(self, na: str):
+    def __init__(self, na: str, backend: Optional[Backend] = None,
+                 cache: Optional[CacheArchivos] = None, indexado: bool = False,
+                 indexado_medicamentos: bool = False, bloqueo: bool = False, procesos_carga: int = 1):
         self.na = na # Nombre del archivo
+        self.backend = backend or BackendJSON() # Formato en disco (JSON con sangría por defecto)
+        self.cache = cache # Cache opcional de objetos ya parseados (compartible entre gestores)
+        self.indice = IndicePrimario(na, "sucursal", self.backend) if indexado else None # Índice persistente por sucursal (.idx)
+        self.bloqueo = BloqueoArchivo.para(na) if bloqueo else None # Bloqueo entre procesos (<archivo>.lock)
+        self.procesos_carga = procesos_carga # >1 con BackendJSONL: la carga completa se reparte entre procesos
+        self.wal = RegistroTransacciones(na) # Registro de transacciones (<archivo>.wal)
+        self._tx: Optional[List[Farmacia]] = None # Farmacias de la transacción abierta (begin)
+        # Índice invertido nombre/tipo -> sucursal (<archivo>.med.idx)
+        self.indice_medicamentos = (IndiceMedicamentos(na + ".med.idx", self._firma_datos, self.iterar)
+                                    if indexado_medicamentos else None)
+        self._tx_indice: List[Callable[[IndiceMedicamentos], None]] = [] # Cambios al índice pendientes del commit
+        self._firma_tx = None
+        self._recuperar()
 
+    @bloqueo_lectura
     def _cargar_farmacias(self) -> List[Farmacia]:
         """Carga la lista de Farmacias desde el archivo JSON."""
         if not os.path.exists(self.na):
             self.crearArchivo()
 
+        if self.cache is not None:
+            return self.cache.obtener(self.na, self._leer_farmacias)
+        return self._leer_farmacias()
+
+    def _leer_farmacias(self) -> List[Farmacia]:
+        """Lee y parsea el archivo completo (sin pasar por el cache)."""
         try:
-            with open(self.na, 'r') as f:
-                data = json.load(f)
-                return [Farmacia.from_dict(d) for d in data]
-        except (json.JSONDecodeError, FileNotFoundError, IOError) as e:
+            return cargar_paralelo(self.na, Farmacia.from_dict, self.procesos_carga, self.backend)
+        except ErrorAlmacenamiento:
+            # Archivo ilegible: se aparta para que el próximo guardado no lo pise
+            respaldar_corrupto(self.na)
+            return []
+        except (FileNotFoundError, IOError) as e:
             print(f" Error al cargar farmacias del archivo: {e}. Retornando lista vacía.")
             return []
 
-    def _guardar_lista(self, farmacias: List[Farmacia]) -> None:
+    def iterar(self) -> Iterator[Farmacia]:
+        """Recorre las farmacias de a una sin armar la lista completa (memoria constante)."""
+        en_cache = self.cache.vigente(self.na) if self.cache is not None else None
+        if en_cache is not None:
+            yield from en_cache
+            return
+        for d in iterar_data(self.na, self.backend):
+            yield Farmacia.from_dict(d)
+
+    def _guardar_lista(self, farmacias: List[Farmacia]) -> bool:
         """Guarda la lista completa de Farmacias al archivo JSON."""
         data = [f.to_dict() for f in farmacias]
         try:
-            with open(self.na, 'w') as f:
-                json.dump(data, f, indent=4)
+            self.backend.guardar(self.na, data)
+            if self.cache is not None:
+                self.cache.recordar(self.na, farmacias)
+            if self.indice is not None:
+                self.indice.registrar_claves(f.sucursal for f in farmacias)
+            return True
         except Exception as e:
+            self._descartar_cache()
             print(f" Error al guardar la lista en el archivo: {e}")
+            return False
+
+    def _descartar_cache(self) -> None:
+        """Olvida los objetos en cache de este archivo (p. ej. si una modificación se cortó antes de guardar)."""
+        if self.cache is not None:
+            self.cache.invalidar(self.na)
 
     # Métodos del diagrama
+    @bloqueo_escritura
     def crearArchivo(self) -> None:
         """Inicializa el archivo JSON con una lista vacía de farmacias."""
         try:
-            with open(self.na, 'w') as f:
-                json.dump([], f, indent=4)
+            self.backend.guardar(self.na, [])
         except Exception as e:
             print(f" Error al crear el archivo '{self.na}': {e}")
             
+    @bloqueo_escritura
     def adicionar(self, f: Farmacia) -> None:
         """Añade una nueva farmacia al archivo, verificando sucursal única."""
+        # Con índice el duplicado se detecta en O(1) y la farmacia se agrega al final, sin cargar el archivo
+        antes = self._firma_datos()
+        if self.indice is not None:
+            if self.indice.contiene(f.sucursal):
+                print(f" Sucursal {f.sucursal} ya existe. No se añadió.")
+                return
+            if agregar_registros(self.na, [f], self.backend, self.indice, self.cache):
+                self._indexar(antes, lambda idx: idx.agregar_farmacia(f))
+            print(f" Farmacia '{f.nombreFarmacia}' Sucursal {f.sucursal} añadida con éxito.")
+            return
+
         farmacias = self._cargar_farmacias()
         if any(fm.sucursal == f.sucursal for fm in farmacias):
             print(f" Sucursal {f.sucursal} ya existe. No se añadió.")
             return
         
         farmacias.append(f)
-        self._guardar_lista(farmacias)
+        if self._guardar_lista(farmacias):
+            self._indexar(antes, lambda idx: idx.agregar_farmacia(f))
         print(f" Farmacia '{f.nombreFarmacia}' Sucursal {f.sucursal} añadida con éxito.")
 
+    @bloqueo_escritura
+    def adicionarLote(self, farmacias: Iterable[Farmacia]) -> Dict[str, Any]:
+        """Guarda un lote de farmacias con una sola carga y una sola escritura.
+
+        Los duplicados (sucursal ya existente o repetido en el lote) no se imprimen:
+        vuelven en el reporte {"guardados": n, "duplicados": [sucursals]}.
+        """
+        antes = self._firma_datos()
+        if self.indice is not None:
+            nuevos, reporte = separar_duplicados(farmacias, self.indice.claves(), lambda x: x.sucursal)
+            if nuevos:
+                if agregar_registros(self.na, nuevos, self.backend, self.indice, self.cache):
+                    self._indexar(antes, lambda idx: idx.agregar_farmacias(nuevos))
+                else:
+                    reporte["guardados"] = 0
+            return reporte
+        actuales = self._cargar_farmacias()
+        nuevos, reporte = separar_duplicados(farmacias, {x.sucursal for x in actuales}, lambda x: x.sucursal)
+        if nuevos:
+            if self._guardar_lista(actuales + nuevos):
+                self._indexar(antes, lambda idx: idx.agregar_farmacias(nuevos))
+            else:
+                reporte["guardados"] = 0
+        return reporte
+
+    @bloqueo_escritura
+    def adicionar_medicamento(self, num_sucursal: int, m: Medicamento) -> bool:
+        """Añade un medicamento al inventario de una sucursal ya guardada."""
+        antes = self._firma_datos()
+        farmacias = self._cargar_farmacias()
+        farmacia = next((f for f in farmacias if f.sucursal == num_sucursal), None)
+        if farmacia is None:
+            print(f"⚠️ Sucursal {num_sucursal} no encontrada.")
+            return False
+        cantidad = len(farmacia.medicamentos)
+        farmacia.adicionar_medicamento(m) # Avisa si el código ya existe
+        if len(farmacia.medicamentos) == cantidad or not self._guardar_lista(farmacias):
+            return False
+        self._indexar(antes, lambda idx: idx.agregar_medicamento(num_sucursal, m))
+        return True
+
     def listar(self) -> List[Farmacia]:
         """Retorna la lista de todas las farmacias."""
         return self._cargar_farmacias()
 
     def buscar_farmacia_por_sucursal(self, num_sucursal: int) -> Optional[Farmacia]:
         """Retorna una farmacia por su número de sucursal."""
-        farmacias = self._cargar_farmacias()
-        for f in farmacias:
+        if self.indice is not None:
+            data = self.indice.buscar(num_sucursal)
+            return Farmacia.from_dict(data) if data else None
+
+        for f in self.iterar():
             if f.getSucursal() == num_sucursal:
                 return f
         return None
 
+    def _buscar_farmacias(self, sucursales: Set[int], total: Optional[int] = None) -> Dict[int, Farmacia]:
+        """Solo las farmacias pedidas: por índice primario si lo hay, si no en una pasada que corta al completarlas.
+
+        Si se piden más de la cuarta parte de las 'total' farmacias, una pasada secuencial
+        sale más barata que un seek por sucursal.
+        """
+        encontradas: Dict[int, Farmacia] = {}
+        if self.indice is not None and (total is None or len(sucursales) * 4 <= total):
+            for s in sucursales:
+                f = self.buscar_farmacia_por_sucursal(s)
+                if f is not None:
+                    encontradas[s] = f
+            return encontradas
+        pendientes = set(sucursales)
+        if pendientes:
+            for f in self.iterar():
+                if f.sucursal in pendientes:
+                    encontradas[f.sucursal] = f
+                    pendientes.discard(f.sucursal)
+                    if not pendientes:
+                        break
+        return encontradas
+
     # Implementación de los puntos del Ejercicio 5:
 
     # a) Mostrar los medicamentos para la tos, de la Sucursal número X
@@ -164,9 +335,10 @@ class ArchFarmacia:
     # b) Mostrar el número de sucursal y su dirección que tienen el medicamento "Tapsin".
     def buscarFarmaciasPorMedicamento(self, nombre_medicamento: str) -> List[Dict[str, Any]]:
         """Retorna una lista de sucursales y direcciones que tienen el medicamento."""
-        farmacias = self._cargar_farmacias()
+        if self.indice_medicamentos is not None:
+            return self.indice_medicamentos.sucursales_con_nombre(nombre_medicamento)
         resultados = []
-        for f in farmacias:
+        for f in self.iterar():
             if f.buscaMedicamento(nombre_medicamento):
                 resultados.append({
                     "sucursal": f.getSucursal(),
@@ -177,9 +349,18 @@ class ArchFarmacia:
     # c) Buscar medicamentos por tipo.
     def buscarMedicamentosPorTipo(self, tipo_med: str) -> List[Medicamento]:
         """Busca y retorna todos los medicamentos de un tipo dado, de todas las farmacias."""
-        farmacias = self._cargar_farmacias()
+        if self.indice_medicamentos is not None:
+            # El índice dice qué sucursales abrir y qué códigos tomar de cada una
+            por_sucursal = self.indice_medicamentos.codigos_por_tipo(tipo_med)
+            farmacias = self._buscar_farmacias({s for s, _ in por_sucursal}, len(self.indice_medicamentos.farmacias))
+            medicamentos_encontrados = []
+            for s, codigos in por_sucursal:
+                elegidos = set(codigos)
+                if s in farmacias:
+                    medicamentos_encontrados.extend(m for m in farmacias[s].medicamentos if m.codMedicamento in elegidos)
+            return medicamentos_encontrados
         medicamentos_encontrados = []
-        for f in farmacias:
+        for f in self.iterar():
             medicamentos_encontrados.extend(f.mostrarMedicamentos(tipo_med))
         return medicamentos_encontrados
 
@@ -192,13 +373,56 @@ class ArchFarmacia:
         return farmacias_ordenadas
 
     # e) Mover los medicamentos de tipo x de la farmacia y a la farmacia z.
+    @bloqueo_escritura
     def moverMedicamentosPorTipo(self, tipo_x: str, suc_origen: int, suc_destino: int) -> bool:
-        """Mueve medicamentos de tipo x de la sucursal de origen a la de destino."""
+        """Mueve medicamentos de tipo x de la sucursal de origen a la de destino.
+
+        Dentro de una transacción (begin) el cambio queda en memoria y en el .wal
+        hasta el commit; fuera de ella se guarda en el acto.
+        """
         if suc_origen == suc_destino:
             print("⚠️ Las sucursales de origen y destino no pueden ser iguales.")
             return False
 
-        farmacias = self._cargar_farmacias()
+        antes = self._firma_datos()
+        farmacias = self._farmacias_para_mover(suc_origen, suc_destino)
+        resultado = self._mover_medicamentos(farmacias, tipo_x, suc_origen, suc_destino)
+        
+        if resultado is None:
+            print("⚠️ Una o ambas sucursales no fueron encontradas.")
+            return False
+
+        movidos, repetidos = resultado
+        for m in repetidos:
+            print(f"  ⚠️ Medicamento {m.nombre} (Cod: {m.codMedicamento}) ya existe en destino, no se mueve.")
+        
+        if not movidos:
+            print(f" No se encontraron medicamentos de tipo '{tipo_x}' para mover, o todos ya existen en destino.")
+            return False
+        
+        # 5. Guardar la lista actualizada de farmacias (o anotar el movimiento en la transacción)
+        if self._persistir_movimiento(farmacias, {"op": "moverMedicamentosPorTipo", "tipo": tipo_x,
+                                                  "origen": suc_origen, "destino": suc_destino}):
+            self._indexar(antes, lambda idx: idx.mover(tipo_x, suc_origen, suc_destino, movidos))
+        print(f"✅ Se movieron {len(movidos)} medicamentos de tipo '{tipo_x}' de Sucursal {suc_origen} a Sucursal {suc_destino}.")
+        return True
+
+    def _farmacias_para_mover(self, suc_origen: int, suc_destino: int) -> List[Farmacia]:
+        """Farmacias sobre las que se aplica un movimiento (las de la transacción, si hay una)."""
+        return self._tx if self._tx is not None else self._cargar_farmacias()
+
+    def _persistir_movimiento(self, farmacias: List[Farmacia], operacion: Dict[str, Any]) -> bool:
+        if self._tx is not None:
+            self.wal.registrar(operacion)
+            return True
+        return self._guardar_lista(farmacias)
+
+    def _mover_medicamentos(self, farmacias: List[Farmacia], tipo_x: str, suc_origen: int,
+                            suc_destino: int) -> Optional[Tuple[List[Medicamento], List[Medicamento]]]:
+        """Aplica el movimiento sobre la lista en memoria.
+
+        Retorna (movidos, repetidos en destino), o None si falta alguna sucursal.
+        """
         f_origen: Optional[Farmacia] = None
         f_destino: Optional[Farmacia] = None
         
@@ -209,35 +433,356 @@ class ArchFarmacia:
                 f_destino = f
         
         if not f_origen or not f_destino:
-            print("⚠️ Una o ambas sucursales no fueron encontradas.")
-            return False
+            return None
             
         movidos = []
         quedan = []
+        repetidos = []
         
         # 1. Separar los medicamentos a mover y los que se quedan en origen
         for m in f_origen.medicamentos:
             if m.getTipo().lower() == tipo_x.lower():
-                # 2. Verificar que no haya duplicados en destino antes de mover (por código)
-                if not any(dm.codMedicamento == m.codMedicamento for dm in f_destino.medicamentos):
+                # 2. Verificar que no haya duplicados en destino antes de mover (por código, O(1))
+                if f_destino.buscar_por_codigo(m.codMedicamento) is None:
                     movidos.append(m)
                 else:
-                    print(f"  ⚠️ Medicamento {m.nombre} (Cod: {m.codMedicamento}) ya existe en destino, no se mueve.")
+                    repetidos.append(m)
                     quedan.append(m)
             else:
                 quedan.append(m)
         
-        if not movidos:
-            print(f" No se encontraron medicamentos de tipo '{tipo_x}' para mover, o todos ya existen en destino.")
+        if movidos:
+            # 3. Actualizar el inventario de origen
+            f_origen.medicamentos = quedan
+            
+            # 4. Actualizar el inventario de destino
+            f_destino.recibir_medicamentos(movidos)
+        return movidos, repetidos
+
+    # --- Transacciones: muchos movimientos, una sola escritura ---
+    @bloqueo_escritura
+    def begin(self) -> None:
+        """Abre una transacción. Los movimientos se hacen en memoria y se anotan en '<archivo>.wal'.
+
+        Antes reaplica un commit anterior que no llegó a guardarse; si tampoco
+        ahora se puede guardar, wal.iniciar() se niega en vez de pisarlo.
+        """
+        self._recuperar()
+        self.wal.iniciar()
+        self._tx = self._leer_farmacias() # Copia propia: no se tocan los objetos del cache
+        self._tx_indice, self._firma_tx = [], self._firma_datos()
+
+    @bloqueo_escritura
+    def commit(self) -> bool:
+        """Confirma todos los movimientos de la transacción con una sola escritura del archivo."""
+        if self._tx is None:
+            raise RuntimeError("No hay una transacción abierta.")
+        farmacias, self._tx = self._tx, None
+        if not self.wal.confirmar():
+            print("⚠️ El archivo cambió durante la transacción. No se aplicó ningún movimiento.")
+            self._tx_indice = []
             return False
-        
-        # 3. Actualizar el inventario de origen
-        f_origen.medicamentos = quedan
-        
-        # 4. Actualizar el inventario de destino
-        f_destino.medicamentos.extend(movidos)
-        
-        # 5. Guardar la lista actualizada de farmacias
-        self._guardar_lista(farmacias)
-        print(f"✅ Se movieron {len(movidos)} medicamentos de tipo '{tipo_x}' de Sucursal {suc_origen} a Sucursal {suc_destino}.")
-        return True
\ No newline at end of file
+        if not self._guardar_lista(farmacias):
+            self.wal.soltar()
+            return False # El .wal confirmado queda en disco y se aplica al reabrir el archivo
+        self.wal.descartar()
+        self._indexar_transaccion()
+        return True
+
+    @bloqueo_escritura
+    def rollback(self) -> None:
+        """Descarta todos los movimientos de la transacción abierta."""
+        self._tx = None
+        self._tx_indice = []
+        self.wal.descartar()
+
+    @bloqueo_escritura
+    def _recuperar(self) -> None:
+        """Reaplica una transacción confirmada que no llegó a guardarse (corte tras el commit)."""
+        operaciones = self.wal.pendientes()
+        if operaciones is None:
+            return
+        farmacias = self._leer_farmacias()
+        for op in operaciones:
+            if op["op"] == "moverMedicamentosPorTipo":
+                self._mover_medicamentos(farmacias, op["tipo"], op["origen"], op["destino"])
+        if self._guardar_lista(farmacias):
+            self.wal.descartar()
+            print(f" Se recuperaron {len(operaciones)} movimientos confirmados de '{self.wal.ruta_wal}'.")
+        else:
+            self.wal.soltar()
+
+    # --- Índice de medicamentos ---
+    def _firma_datos(self) -> Any:
+        """Firma de lo que refleja el índice de medicamentos (aquí, la del archivo)."""
+        return firma_archivo(self.na)
+
+    def _indexar(self, firma_antes: Any, cambio: Callable[[IndiceMedicamentos], None]) -> None:
+        """Refleja en el índice un cambio ya guardado (en una transacción, recién al hacer commit)."""
+        if self.indice_medicamentos is None:
+            return
+        if self._tx is not None:
+            self._tx_indice.append(cambio)
+        else:
+            self.indice_medicamentos.aplicar(firma_antes, cambio)
+
+    def _indexar_transaccion(self) -> None:
+        """Tras el commit: aplica los cambios anotados (aunque no haya ninguno, el índice toma la nueva firma)."""
+        cambios, self._tx_indice = self._tx_indice, []
+        if self.indice_medicamentos is not None:
+            self.indice_medicamentos.aplicar(self._firma_tx, *cambios)
+
+
+# ====================================================================
+# --- ALMACENAMIENTO FRAGMENTADO (un archivo por sucursal) ---
+# ====================================================================
+# carpeta/manifiesto.json    -> [{sucursal, nombreFarmacia, direccion}, ...] en orden de alta
+# carpeta/sucursal_<n>.json  -> la farmacia completa con su inventario
+# Las operaciones de una sucursal (buscar, mostrar, mover entre dos) leen y
+# escriben solo los fragmentos que tocan; el manifiesto hace de índice.
+
+class ArchFarmaciaFragmentada(ArchFarmacia):
+    """ArchFarmacia guardada en una carpeta: un fragmento por sucursal más un manifiesto chico."""
+    def __init__(self, carpeta: str, backend: Optional[Backend] = None, indexado_medicamentos: bool = False,
+                 bloqueo: bool = False):
+        self.carpeta = carpeta
+        self._manifiesto: Dict[int, Dict[str, Any]] = {}
+        self._firma_manifiesto = None
+        self._huellas_tx: Dict[int, str] = {} # sha256 de cada fragmento al leerlo en la transacción abierta
+        os.makedirs(carpeta, exist_ok=True) # Antes de super(): su _recuperar() ya escribe fragmentos
+        # Sin cache ni índice primario (el manifiesto ya resuelve sucursal -> fragmento); el bloqueo
+        # sobre el manifiesto cubre toda la carpeta y el .wal guarda el redo de los fragmentos
+        super().__init__(os.path.join(carpeta, "manifiesto.json"), backend,
+                         indexado_medicamentos=indexado_medicamentos, bloqueo=bloqueo)
+
+    def ruta_fragmento(self, sucursal: int) -> str:
+        return os.path.join(self.carpeta, f"sucursal_{sucursal}.json")
+
+    def manifiesto(self) -> Dict[int, Dict[str, Any]]:
+        """sucursal -> {sucursal, nombreFarmacia, direccion}, en orden de alta (se relee si cambió)."""
+        firma = firma_archivo(self.na)
+        if firma != self._firma_manifiesto:
+            self._manifiesto = {e["sucursal"]: e for e in cargar_data(self.na, self.backend)}
+            self._firma_manifiesto = firma
+        return self._manifiesto
+
+    @bloqueo_escritura
+    def crearArchivo(self) -> None:
+        """Deja la carpeta con un manifiesto vacío (borra los fragmentos existentes)."""
+        sucursales = list(self.manifiesto())
+        self._guardar_manifiesto({})
+        self._borrar_fragmentos(sucursales)
+
+    @bloqueo_lectura
+    def _cargar_farmacias(self) -> List[Farmacia]:
+        return self._leer_farmacias()
+
+    def _leer_farmacias(self) -> List[Farmacia]:
+        return list(self.iterar())
+
+    def iterar(self) -> Iterator[Farmacia]:
+        """Recorre las farmacias fragmento por fragmento (en memoria hay una sola a la vez)."""
+        for sucursal in list(self.manifiesto()):
+            f = self._leer_fragmento(sucursal)
+            if f is not None:
+                yield f
+
+    def _guardar_lista(self, farmacias: List[Farmacia]) -> bool:
+        """Reescribe todos los fragmentos y el manifiesto (y borra los fragmentos que sobran)."""
+        nuevo = {f.sucursal: self._entrada_manifiesto(f) for f in farmacias}
+        if not all(self._guardar_fragmento(f) for f in farmacias):
+            return False
+        sobrantes = [s for s in self.manifiesto() if s not in nuevo]
+        if not self._guardar_manifiesto(nuevo):
+            return False
+        self._borrar_fragmentos(sobrantes)
+        return True
+
+    @bloqueo_escritura
+    def adicionar(self, f: Farmacia) -> None:
+        """Añade una farmacia escribiendo solo su fragmento y el manifiesto."""
+        if f.sucursal in self.manifiesto():
+            print(f" Sucursal {f.sucursal} ya existe. No se añadió.")
+            return
+        if self.adicionarLote([f])["guardados"]:
+            print(f" Farmacia '{f.nombreFarmacia}' Sucursal {f.sucursal} añadida con éxito.")
+
+    @bloqueo_escritura
+    def adicionarLote(self, farmacias: Iterable[Farmacia]) -> Dict[str, Any]:
+        """Escribe un fragmento por farmacia nueva y el manifiesto una sola vez al final.
+
+        Acepta un iterador (p. ej. ArchFarmacia(...).iterar() para migrar un archivo único).
+        """
+        manifiesto = dict(self.manifiesto())
+        # El índice se actualiza sobre la marcha (sin juntar el lote) si estaba al día
+        indice = self.indice_medicamentos
+        indexar = indice is not None and indice.al_dia(self._firma_datos())
+        guardados, duplicados = 0, []
+        for f in farmacias:
+            if f.sucursal in manifiesto:
+                duplicados.append(f.sucursal)
+                continue
+            if not self._guardar_fragmento(f):
+                break
+            manifiesto[f.sucursal] = self._entrada_manifiesto(f)
+            guardados += 1
+            if indexar:
+                indice.agregar_farmacia(f)
+        # Un fragmento sin entrada en el manifiesto (corte antes de este punto) no es visible
+        if guardados and not self._guardar_manifiesto(manifiesto):
+            guardados = 0
+        if indexar:
+            if guardados:
+                indice.guardar()
+            else:
+                indice.invalidar()
+        return {"guardados": guardados, "duplicados": duplicados}
+
+    def buscar_farmacia_por_sucursal(self, num_sucursal: int) -> Optional[Farmacia]:
+        """Lee solo el fragmento de esa sucursal."""
+        if num_sucursal not in self.manifiesto():
+            return None
+        return self._leer_fragmento(num_sucursal)
+
+    def _buscar_farmacias(self, sucursales: Set[int], total: Optional[int] = None) -> Dict[int, Farmacia]:
+        encontradas = {s: self.buscar_farmacia_por_sucursal(s) for s in sucursales}
+        return {s: f for s, f in encontradas.items() if f is not None}
+
+    @bloqueo_escritura
+    def adicionar_medicamento(self, num_sucursal: int, m: Medicamento) -> bool:
+        """Añade un medicamento reescribiendo solo el fragmento de esa sucursal."""
+        antes = self._firma_datos()
+        farmacia = self.buscar_farmacia_por_sucursal(num_sucursal)
+        if farmacia is None:
+            print(f"⚠️ Sucursal {num_sucursal} no encontrada.")
+            return False
+        cantidad = len(farmacia.medicamentos)
+        farmacia.adicionar_medicamento(m) # Avisa si el código ya existe
+        if len(farmacia.medicamentos) == cantidad or not self._guardar_fragmento(farmacia):
+            return False
+        self._indexar(antes, lambda idx: idx.agregar_medicamento(num_sucursal, m))
+        return True
+
+    # --- Movimientos: solo se leen y reescriben los dos fragmentos involucrados ---
+    def _farmacias_para_mover(self, suc_origen: int, suc_destino: int) -> List[Farmacia]:
+        farmacias = []
+        for sucursal in (suc_origen, suc_destino):
+            f = self._tx.get(sucursal) if self._tx is not None else None
+            if f is None and sucursal in self.manifiesto():
+                huella = huella_archivo(self.ruta_fragmento(sucursal)) if self._tx is not None else None
+                f = self._leer_fragmento(sucursal)
+                if f is not None and self._tx is not None:
+                    self._tx[sucursal] = f
+                    self._huellas_tx[sucursal] = huella
+            if f is not None:
+                farmacias.append(f)
+        return farmacias
+
+    def _persistir_movimiento(self, farmacias: List[Farmacia], operacion: Dict[str, Any]) -> bool:
+        if self._tx is not None: # En una transacción los fragmentos ya quedaron en self._tx
+            return True
+        return self._escribir_fragmentos(farmacias)
+
+    @bloqueo_escritura
+    def begin(self) -> None:
+        """Abre una transacción: los fragmentos tocados quedan en memoria hasta el commit."""
+        if self._tx is not None:
+            raise RuntimeError("Ya hay una transacción abierta.")
+        self._recuperar() # Fragmentos de un commit anterior que no llegaron a guardarse
+        self._tx, self._huellas_tx = {}, {}
+        self._tx_indice, self._firma_tx = [], self._firma_datos()
+
+    @bloqueo_escritura
+    def commit(self) -> bool:
+        """Reescribe de una vez (y en forma atómica en conjunto) los fragmentos tocados.
+
+        Retorna False (sin escribir nada) si otro gestor cambió alguno de esos
+        fragmentos desde que la transacción lo leyó, igual que ArchFarmacia.commit.
+        """
+        if self._tx is None:
+            raise RuntimeError("No hay una transacción abierta.")
+        tocadas, self._tx = self._tx, None
+        huellas, self._huellas_tx = self._huellas_tx, {}
+        if any(huella_archivo(self.ruta_fragmento(s)) != h for s, h in huellas.items()):
+            print("⚠️ Un fragmento cambió durante la transacción. No se aplicó ningún movimiento.")
+            self._tx_indice = []
+            return False
+        if tocadas and not self._escribir_fragmentos(list(tocadas.values())):
+            self._tx_indice = []
+            return False
+        self._indexar_transaccion()
+        return True
+
+    @bloqueo_escritura
+    def rollback(self) -> None:
+        self._tx, self._huellas_tx = None, {}
+        self._tx_indice = []
+
+    def _firma_datos(self) -> Any:
+        """Firma de la carpeta: la del manifiesto y la de cada fragmento."""
+        return [firma_archivo(self.na)] + [firma_archivo(self.ruta_fragmento(s)) for s in self.manifiesto()]
+
+    def _escribir_fragmentos(self, farmacias: List[Farmacia]) -> bool:
+        """Varios fragmentos como una unidad: primero el contenido nuevo va al .wal y se confirma."""
+        try:
+            self.wal.iniciar()
+        except RuntimeError as e: # Un commit anterior sin aplicar no se pisa
+            print(f"⚠️ {e} No se aplicó el movimiento.")
+            return False
+        for f in farmacias:
+            self.wal.registrar({"op": "fragmento", "datos": f.to_dict()})
+        if not self.wal.confirmar():
+            print("⚠️ El manifiesto cambió durante la escritura. No se aplicó el movimiento.")
+            return False
+        if not all(self._guardar_fragmento(f) for f in farmacias):
+            self.wal.soltar()
+            return False # El .wal confirmado queda en disco y se aplica al reabrir la carpeta
+        self.wal.descartar()
+        return True
+
+    @bloqueo_escritura
+    def _recuperar(self) -> None:
+        """Reescribe los fragmentos de un movimiento confirmado que no llegó a guardarse."""
+        operaciones = self.wal.pendientes()
+        if operaciones is None:
+            return
+        if all(self._guardar_fragmento(Farmacia.from_dict(op["datos"])) for op in operaciones):
+            self.wal.descartar()
+            print(f" Se recuperaron {len(operaciones)} fragmentos confirmados de '{self.wal.ruta_wal}'.")
+        else:
+            self.wal.soltar()
+
+    @staticmethod
+    def _entrada_manifiesto(f: Farmacia) -> Dict[str, Any]:
+        return {"sucursal": f.sucursal, "nombreFarmacia": f.nombreFarmacia, "direccion": f.direccion}
+
+    def _leer_fragmento(self, sucursal: int) -> Optional[Farmacia]:
+        data = cargar_data(self.ruta_fragmento(sucursal), self.backend)
+        return Farmacia.from_dict(data[0]) if data else None
+
+    def _guardar_fragmento(self, f: Farmacia) -> bool:
+        return guardar_data(self.ruta_fragmento(f.sucursal), [f.to_dict()], self.backend)
+
+    def _guardar_manifiesto(self, manifiesto: Dict[int, Dict[str, Any]]) -> bool:
+        ok = guardar_data(self.na, list(manifiesto.values()), self.backend)
+        if ok:
+            self._manifiesto, self._firma_manifiesto = manifiesto, firma_archivo(self.na)
+        return ok
+
+    def _borrar_fragmentos(self, sucursales: Iterable[int]) -> None:
+        for sucursal in sucursales:
+            if os.path.exists(self.ruta_fragmento(sucursal)):
+                os.remove(self.ruta_fragmento(sucursal))
+
+
+# ====================================================================
+# --- VERSIÓN ASÍNCRONA (asyncio) ---
+# ====================================================================
+
+class AsyncArchFarmacia(EnvoltorioAsincrono):
+    """ArchFarmacia (o ArchFarmaciaFragmentada) con métodos awaitable (E/S y parseo fuera del event loop)."""
+    lecturas = ("listar", "buscar_farmacia_por_sucursal", "mostrarMedicamentosTosSucursal",
+                "buscarFarmaciasPorMedicamento", "buscarMedicamentosPorTipo", "ordenarFarmaciasPorDireccion")
+    mutaciones = ("crearArchivo", "adicionar", "adicionarLote", "adicionar_medicamento",
+                  "moverMedicamentosPorTipo")
+    carga = "_cargar_farmacias"
@@ -0,0 +1,101 @@
+import os
+import sys
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# --- Persistencia compartida (carpeta PERSISTENCIA/almacenamiento) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from almacenamiento import ArchivoDerivado
+
+if TYPE_CHECKING:
+    from farmacia import Farmacia, Medicamento
+
+
+class IndiceMedicamentos(ArchivoDerivado):
+    """Índice invertido de los inventarios de un ArchFarmacia.
+
+    nombre (minúsculas) -> {sucursal: cuántos medicamentos con ese nombre tiene}
+    tipo (minúsculas)   -> {sucursal: [codMedicamento, ...] en orden de inventario}
+    sucursal            -> [posición en el archivo, dirección]
+
+    Se guarda en "<archivo>.med.idx" junto con la firma de los datos que refleja.
+    Los gestores lo actualizan en forma incremental después de cada alta o
+    movimiento; si los datos cambiaron por otro camino, la firma no coincide y
+    se reconstruye con una pasada sobre las farmacias.
+    """
+
+    def __init__(self, ruta_indice: str, firma_datos: Callable[[], Any],
+                 recorrer: Callable[[], Iterable["Farmacia"]]):
+        self._recorrer = recorrer  # farmacias en orden de archivo, para reconstruir
+        super().__init__(ruta_indice, firma_datos)
+
+    # --- Consultas: cuestan lo que el resultado ---
+    def sucursales_con_nombre(self, nombre: str) -> List[Dict[str, Any]]:
+        """[{sucursal, direccion}] de las farmacias que tienen un medicamento con ese nombre."""
+        self._asegurar()
+        return [{"sucursal": s, "direccion": self.farmacias[s][1]}
+                for s in self._en_orden(self.nombres.get(nombre.lower(), {}))]
+
+    def codigos_por_tipo(self, tipo: str) -> List[Tuple[int, List[int]]]:
+        """[(sucursal, [codMedicamento, ...])] de ese tipo, en orden de archivo."""
+        self._asegurar()
+        por_sucursal = self.tipos.get(tipo.lower(), {})
+        return [(s, list(por_sucursal[s])) for s in self._en_orden(por_sucursal)]
+
+    # --- Mantenimiento incremental (en memoria; guardar() lo persiste) ---
+    def agregar_farmacias(self, farmacias: Iterable["Farmacia"]) -> None:
+        for f in farmacias:
+            self.agregar_farmacia(f)
+
+    def agregar_farmacia(self, f: "Farmacia") -> None:
+        self.farmacias[f.sucursal] = [len(self.farmacias), f.direccion]
+        for m in f.medicamentos:
+            self.agregar_medicamento(f.sucursal, m)
+
+    def agregar_medicamento(self, sucursal: int, m: "Medicamento") -> None:
+        por_sucursal = self.nombres.setdefault(m.nombre.lower(), {})
+        por_sucursal[sucursal] = por_sucursal.get(sucursal, 0) + 1
+        self.tipos.setdefault(m.tipo.lower(), {}).setdefault(sucursal, []).append(m.codMedicamento)
+
+    def mover(self, tipo: str, origen: int, destino: int, movidos: List["Medicamento"]) -> None:
+        """Refleja un moverMedicamentosPorTipo: los movidos pasan al final del inventario destino."""
+        por_sucursal = self.tipos.get(tipo.lower(), {})
+        codigos = {m.codMedicamento for m in movidos}
+        quedan = [c for c in por_sucursal.get(origen, []) if c not in codigos]
+        if quedan:
+            por_sucursal[origen] = quedan
+        else:
+            por_sucursal.pop(origen, None)
+        por_sucursal.setdefault(destino, []).extend(m.codMedicamento for m in movidos)
+        for m in movidos:
+            cuenta = self.nombres[m.nombre.lower()]
+            cuenta[origen] -= 1
+            if not cuenta[origen]:
+                del cuenta[origen]
+            cuenta[destino] = cuenta.get(destino, 0) + 1
+
+    def reconstruir(self, farmacias: Optional[Iterable["Farmacia"]] = None) -> None:
+        """Vuelve a armar el índice con una pasada sobre las farmacias (o las dadas, ya en memoria)."""
+        super().reconstruir(farmacias)
+
+    def _contar(self, farmacias: Optional[Iterable["Farmacia"]] = None) -> None:
+        self.agregar_farmacias(self._recorrer() if farmacias is None else farmacias)
+
+    def _en_orden(self, sucursales: Iterable[int]) -> List[int]:
+        return sorted((s for s in sucursales if s in self.farmacias), key=lambda s: self.farmacias[s][0])
+
+    def _vaciar(self) -> None:
+        self.farmacias: Dict[int, List[Any]] = {}
+        self.nombres: Dict[str, Dict[int, int]] = {}
+        self.tipos: Dict[str, Dict[int, List[int]]] = {}
+
+    def _de_dict(self, data: Dict[str, Any]) -> None:
+        self.farmacias = {s: [pos, direccion] for s, pos, direccion in data["farmacias"]}
+        self.nombres = {n: dict(cuentas) for n, cuentas in data["nombres"].items()}
+        self.tipos = {t: {s: codigos for s, codigos in postings} for t, postings in data["tipos"].items()}
+
+    def _a_dict(self) -> Dict[str, Any]:
+        return {
+            "farmacias": [[s, pos, direccion] for s, (pos, direccion) in self.farmacias.items()],
+            "nombres": {n: [[s, c] for s, c in cuentas.items()] for n, cuentas in self.nombres.items()},
+            "tipos": {t: [[s, codigos] for s, codigos in postings.items()] for t, postings in self.tipos.items()},
+        }
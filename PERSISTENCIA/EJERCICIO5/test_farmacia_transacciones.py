@@ -0,0 +1,120 @@
+import os
+
+import pytest
+
+from farmacia import ArchFarmacia, ArchFarmaciaFragmentada, Farmacia, Medicamento
+
+# Uso: python -m pytest test_farmacia_transacciones.py (desde EJERCICIO5)
+# Transacciones de movimientos (begin/commit/rollback) y su registro .wal.
+
+
+def farmacias():
+    origen = Farmacia("Origen", 1, "Calle 1")
+    origen.medicamentos = [Medicamento("Jarabe", 10, "Tos", 5.0), Medicamento("Aspirina", 11, "Dolor", 2.0)]
+    destino = Farmacia("Destino", 2, "Calle 2")
+    destino.medicamentos = [Medicamento("Ibuprofeno", 20, "Dolor", 3.0)]
+    return [origen, destino]
+
+
+def codigos(arch, sucursal):
+    return sorted(m.codMedicamento for m in arch.buscar_farmacia_por_sucursal(sucursal).medicamentos)
+
+
+@pytest.fixture
+def arch(tmp_path):
+    arch = ArchFarmacia(str(tmp_path / "farmacias.json"))
+    arch.adicionarLote(farmacias())
+    return arch
+
+
+def commit_sin_guardar(arch, monkeypatch):
+    """Transacción confirmada en el .wal cuyo guardado falla (como un corte tras el commit)."""
+    arch.begin()
+    assert arch.moverMedicamentosPorTipo("Tos", 1, 2)
+    with monkeypatch.context() as m:
+        m.setattr(arch, "_guardar_lista", lambda farmacias: False)
+        assert arch.commit() is False
+    assert os.path.exists(arch.wal.ruta_wal)
+
+
+def test_commit_sin_guardar_se_reaplica_al_reabrir(arch, monkeypatch):
+    commit_sin_guardar(arch, monkeypatch)
+    otro = ArchFarmacia(arch.na)
+    assert codigos(otro, 1) == [11]
+    assert codigos(otro, 2) == [10, 20]
+    assert not os.path.exists(arch.wal.ruta_wal)
+
+
+def test_begin_no_pisa_un_commit_sin_guardar(arch, monkeypatch):
+    commit_sin_guardar(arch, monkeypatch)
+    arch.begin() # Reaplica el commit anterior antes de abrir la nueva transacción
+    arch.rollback()
+    assert codigos(arch, 2) == [10, 20]
+    assert not os.path.exists(arch.wal.ruta_wal)
+
+
+def test_begin_se_niega_si_no_puede_reaplicar(arch, monkeypatch):
+    commit_sin_guardar(arch, monkeypatch)
+    monkeypatch.setattr(arch, "_guardar_lista", lambda farmacias: False)
+    with pytest.raises(RuntimeError):
+        arch.begin()
+    assert os.path.exists(arch.wal.ruta_wal)
+    monkeypatch.undo()
+    assert codigos(ArchFarmacia(arch.na), 2) == [10, 20]
+
+
+def test_wal_sin_commit_se_descarta(arch):
+    arch.begin()
+    assert arch.moverMedicamentosPorTipo("Tos", 1, 2)
+    arch.wal.soltar() # Corte antes del commit: el .wal queda sin dueño y sin confirmar
+    otro = ArchFarmacia(arch.na)
+    assert not os.path.exists(arch.wal.ruta_wal)
+    assert codigos(otro, 1) == [10, 11]
+
+
+def test_wal_con_dueno_vivo_no_se_borra(arch):
+    arch.begin()
+    assert arch.moverMedicamentosPorTipo("Tos", 1, 2)
+    ArchFarmacia(arch.na) # Busca transacciones pendientes al abrir
+    assert os.path.exists(arch.wal.ruta_wal)
+    assert arch.commit() is True
+    assert codigos(arch, 2) == [10, 20]
+
+
+def test_commit_falla_si_el_archivo_cambio(arch):
+    arch.begin()
+    assert arch.moverMedicamentosPorTipo("Tos", 1, 2)
+    otro = ArchFarmacia(arch.na)
+    assert otro.adicionar_medicamento(1, Medicamento("Gasa", 12, "Curación", 1.0))
+
+    assert arch.commit() is False
+    assert codigos(arch, 1) == [10, 11, 12]
+    assert codigos(arch, 2) == [20]
+    assert not os.path.exists(arch.wal.ruta_wal)
+
+
+@pytest.fixture
+def fragmentada(tmp_path):
+    arch = ArchFarmaciaFragmentada(str(tmp_path / "sucursales"))
+    arch.adicionarLote(farmacias())
+    return arch
+
+
+def test_fragmentada_commit_falla_si_otro_gestor_cambio_un_fragmento(fragmentada):
+    fragmentada.begin()
+    assert fragmentada.moverMedicamentosPorTipo("Tos", 1, 2)
+    otro = ArchFarmaciaFragmentada(fragmentada.carpeta)
+    assert otro.adicionar_medicamento(1, Medicamento("Gasa", 12, "Curación", 1.0))
+
+    assert fragmentada.commit() is False
+    # No se pisó el cambio externo ni se aplicó el movimiento
+    assert codigos(fragmentada, 1) == [10, 11, 12]
+    assert codigos(fragmentada, 2) == [20]
+
+
+def test_fragmentada_commit_sin_cambios_externos(fragmentada):
+    fragmentada.begin()
+    assert fragmentada.moverMedicamentosPorTipo("Tos", 1, 2)
+    assert fragmentada.commit() is True
+    assert codigos(fragmentada, 1) == [11]
+    assert codigos(fragmentada, 2) == [10, 20]
@@ -0,0 +1,133 @@
+import os
+import sys
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set
+
+# --- Persistencia compartida (carpeta PERSISTENCIA/almacenamiento) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from almacenamiento import ArchivoDerivado
+
+if TYPE_CHECKING:
+    from biblioteca import Prestamo
+
+
+class AgregadosPrestamos(ArchivoDerivado):
+    """Contadores materializados del archivo de préstamos de un ArchPrestamo.
+
+    codLibro   -> [cantidad total prestada, ingreso (precio * cantidad acumulado)]
+    codCliente -> cantidad de registros de préstamo
+    Ambos en orden de primera aparición en el archivo, y con el líder de cada uno
+    (en empate gana el que apareció primero, igual que max() sobre el recorrido).
+
+    Se guarda en "<archivo>.agg" junto con la firma del archivo de préstamos y la
+    del de libros (el ingreso sale del precio de cada libro). ArchPrestamo lo
+    actualiza después de cada alta; si alguno de los dos archivos cambió por otro
+    camino, la firma no coincide y se reconstruye con una pasada sobre el log y
+    los precios actuales.
+    """
+
+    def __init__(self, ruta: str, firma_datos: Callable[[], Any],
+                 recorrer: Callable[[], Iterable["Prestamo"]],
+                 precios: Callable[[Optional[Set[int]]], Dict[int, float]]):
+        self._recorrer = recorrer  # préstamos en orden de archivo, para reconstruir
+        self._precios = precios    # codLibros (None: todos) -> {codLibro: precio} de los existentes
+        super().__init__(ruta, firma_datos)
+
+    # --- Consultas: O(1) una vez al día ---
+    def ingreso(self, cod_libro: int) -> float:
+        self._asegurar()
+        return self.libros[cod_libro][1] if cod_libro in self.libros else 0.0
+
+    def codigos_libros(self) -> Set[int]:
+        """Libros con al menos un préstamo."""
+        self._asegurar()
+        return set(self.libros)
+
+    def libro_lider(self) -> Optional[int]:
+        self._asegurar()
+        return self.lider_libro
+
+    def cliente_lider(self) -> Optional[int]:
+        self._asegurar()
+        return self.lider_cliente
+
+    # --- Mantenimiento incremental ---
+    def agregar(self, prestamos: Iterable["Prestamo"], precios: Dict[int, float]) -> None:
+        """Suma los préstamos (en orden de archivo) con el precio de cada libro; sin precio no suma ingreso."""
+        for p in prestamos:
+            fila = self.libros.get(p.codLibro)
+            if fila is None:
+                fila = self.libros[p.codLibro] = [0, 0.0]
+                self._orden_libros[p.codLibro] = len(self._orden_libros)
+            fila[0] += p.cantidad
+            if p.codLibro in precios:
+                fila[1] += precios[p.codLibro] * p.cantidad
+            if p.codCliente not in self.clientes:
+                self.clientes[p.codCliente] = 0
+                self._orden_clientes[p.codCliente] = len(self._orden_clientes)
+            self.clientes[p.codCliente] += 1
+            # Los contadores solo crecen: el líder solo puede cambiar por la clave recién sumada
+            self.lider_libro = _nuevo_lider(self.lider_libro, p.codLibro, lambda c: self.libros[c][0],
+                                            self._orden_libros)
+            self.lider_cliente = _nuevo_lider(self.lider_cliente, p.codCliente, self.clientes.__getitem__,
+                                              self._orden_clientes)
+
+    def aplicar(self, firma_antes: Any, prestamos: List["Prestamo"],
+                precios: Optional[Dict[int, float]] = None) -> None:
+        """Suma préstamos ya guardados si los contadores estaban al día con la versión anterior.
+
+        Si no lo estaban, no se tocan: la próxima consulta los reconstruye.
+        """
+        super().aplicar(firma_antes, lambda a: a.agregar(
+            prestamos, precios if precios is not None else a._precios({p.codLibro for p in prestamos})))
+
+    def verificar(self) -> Dict[str, Any]:
+        """Compara los contadores guardados con un recuento desde el log, sin modificarlos.
+
+        Retorna {"ok": bool, "libros": [codLibros distintos], "clientes": [codClientes distintos],
+        "lideres": bool}.
+        """
+        if not self.al_dia(self._firma_datos()):
+            self._leer()  # lo guardado en disco, aunque esté desfasado: es lo que se verifica
+        recuento = AgregadosPrestamos(self.ruta, self._firma_datos, self._recorrer, self._precios)
+        recuento._contar()
+        libros = sorted(c for c in set(self.libros) | set(recuento.libros)
+                        if self.libros.get(c) != recuento.libros.get(c))
+        clientes = sorted(c for c in set(self.clientes) | set(recuento.clientes)
+                          if self.clientes.get(c) != recuento.clientes.get(c))
+        lideres = (self.lider_libro, self.lider_cliente) == (recuento.lider_libro, recuento.lider_cliente)
+        return {"ok": not libros and not clientes and lideres, "libros": libros, "clientes": clientes,
+                "lideres": lideres}
+
+    def _contar(self) -> None:
+        """Cuenta todo con una pasada sobre el archivo de préstamos (y una sobre los precios)."""
+        self.agregar(self._recorrer(), self._precios(None))
+
+    def _vaciar(self) -> None:
+        self.libros: Dict[int, List[Any]] = {}
+        self.clientes: Dict[int, int] = {}
+        self._orden_libros: Dict[int, int] = {}
+        self._orden_clientes: Dict[int, int] = {}
+        self.lider_libro: Optional[int] = None
+        self.lider_cliente: Optional[int] = None
+
+    def _de_dict(self, data: Dict[str, Any]) -> None:
+        for i, (cod, cantidad, ingreso) in enumerate(data["libros"]):
+            self.libros[cod], self._orden_libros[cod] = [cantidad, ingreso], i
+        for i, (cod, registros) in enumerate(data["clientes"]):
+            self.clientes[cod], self._orden_clientes[cod] = registros, i
+        self.lider_libro, self.lider_cliente = data["lider_libro"], data["lider_cliente"]
+
+    def _a_dict(self) -> Dict[str, Any]:
+        return {
+            "libros": [[c, cantidad, ingreso] for c, (cantidad, ingreso) in self.libros.items()],
+            "clientes": [[c, registros] for c, registros in self.clientes.items()],
+            "lider_libro": self.lider_libro,
+            "lider_cliente": self.lider_cliente,
+        }
+
+
+def _nuevo_lider(lider: Optional[int], cod: int, total: Callable[[int], int], orden: Dict[int, int]) -> Optional[int]:
+    if lider is None or total(cod) > total(lider) or (total(cod) == total(lider) and orden[cod] < orden[lider]):
+        return cod
+    return lider
+
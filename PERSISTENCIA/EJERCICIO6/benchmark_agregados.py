@@ -0,0 +1,56 @@
+import json
+import os
+import random
+import sys
+import tempfile
+
+from biblioteca import ArchLibro, ArchCliente, ArchPrestamo, Prestamo
+from almacenamiento import medir
+
+# Uso: python benchmark_agregados.py [PRESTAMOS] [LIBROS] [CLIENTES]
+# Compara los reportes b), c), e) y f) recorriendo el archivo de préstamos contra los agregados (.agg).
+N_PRESTAMOS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+N_LIBROS = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+N_CLIENTES = int(sys.argv[3]) if len(sys.argv) > 3 else 2_000
+
+random.seed(42)
+libros = [{"codLibro": i, "titulo": f"Libro {i}", "precio": round(random.uniform(5, 50), 2)}
+          for i in range(1, N_LIBROS + 1)]
+clientes = [{"codCliente": i, "ci": str(i), "nombre": f"Nombre{i}", "apellido": "Apellido"}
+            for i in range(1, N_CLIENTES + 1)]
+prestamos = [{"codCliente": random.randint(1, N_CLIENTES), "codLibro": random.randint(1, N_LIBROS),
+              "fechaPrestamo": "2024-01-01", "cantidad": random.randint(1, 5)} for _ in range(N_PRESTAMOS)]
+
+
+with tempfile.TemporaryDirectory() as carpeta:
+    rutas = [os.path.join(carpeta, n) for n in ("libros.json", "clientes.json", "prestamos.json")]
+    for ruta, data in zip(rutas, (libros, clientes, prestamos)):
+        with open(ruta, "w") as f:
+            json.dump(data, f, indent=4)
+    arch_libro, arch_cliente = ArchLibro(rutas[0], indexado=True), ArchCliente(rutas[1], indexado=True)
+    sin_agregados = ArchPrestamo(rutas[2], arch_libro, arch_cliente)
+    con_agregados = ArchPrestamo(rutas[2], arch_libro, arch_cliente, agregados=True)
+
+    t_armado, _ = medir(con_agregados.reconstruirAgregados)
+    reportes = [
+        ("b) ingreso de un libro", lambda a: a.calcularIngresoTotalPorLibro(N_LIBROS // 2)),
+        ("c) libros no vendidos", lambda a: a.mostrarLibrosNoVendidos()),
+        ("e) libro más prestado", lambda a: a.definirLibroMasPrestado()),
+        ("f) cliente con más préstamos", lambda a: a.mostrarClienteConMasPrestamos()),
+    ]
+    filas = [(nombre, medir(lambda: r(sin_agregados))[0], medir(lambda: r(con_agregados))[0]) for nombre, r in reportes]
+
+    lote = [Prestamo(random.randint(1, N_CLIENTES), random.randint(1, N_LIBROS), "2024-02-01", 1) for _ in range(100)]
+    t_guardar_sin, _ = medir(lambda: sin_agregados.guardar(lote[0]), silencioso=True)
+    t_guardar_con, _ = medir(lambda: con_agregados.guardar(lote[1]), silencioso=True)
+    t_lote_sin, _ = medir(lambda: sin_agregados.guardarMuchos(lote[2:51]), silencioso=True)
+    t_lote_con, _ = medir(lambda: con_agregados.guardarMuchos(lote[51:]), silencioso=True)
+    t_verificar, _ = medir(con_agregados.verificarAgregados)
+
+print(f"{N_PRESTAMOS:,} préstamos, {N_LIBROS:,} libros, {N_CLIENTES:,} clientes "
+      f"(armado de los agregados: {t_armado:.2f} s, verificación: {t_verificar:.2f} s)")
+print(f"{'Reporte':30} {'recorriendo (ms)':>17} {'agregados (ms)':>15}")
+for nombre, t_sin, t_con in filas:
+    print(f"{nombre:30} {t_sin * 1000:17.2f} {t_con * 1000:15.2f}")
+print(f"\nguardar un préstamo: {t_guardar_sin * 1000:.0f} ms sin agregados, {t_guardar_con * 1000:.0f} ms manteniéndolos")
+print(f"guardarMuchos (49 préstamos): {t_lote_sin * 1000:.0f} ms sin agregados, {t_lote_con * 1000:.0f} ms manteniéndolos")
@@ -0,0 +1,58 @@
+import json
+import os
+import random
+import sys
+import tempfile
+
+from biblioteca import ArchLibro, ArchCliente, ArchPrestamo, Libro
+from almacenamiento import medir
+
+# Uso: python benchmark_precios.py [LIBROS] [CONSULTAS]
+# Compara listarLibrosEntrePrecios recorriendo el archivo contra el índice ordenado por precio.
+N_LIBROS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+N_CONSULTAS = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+random.seed(42)
+libros = [{"codLibro": i, "titulo": f"Libro {i}", "precio": round(random.uniform(5, 50), 2)}
+          for i in range(1, N_LIBROS + 1)]
+
+RANGOS = [
+    ("angosto (~20 libros)", 45 * 20 / N_LIBROS),
+    ("1% del catálogo", 0.45),
+    ("10% del catálogo", 4.5),
+]
+
+
+def consulta_ms(arch_prestamo, ancho):
+    """ms promedio de listarLibrosEntrePrecios en N_CONSULTAS rangos al azar de ese ancho."""
+    def consulta():
+        x = random.uniform(5, 50 - ancho)
+        return arch_prestamo.listarLibrosEntrePrecios(x, x + ancho)
+    return medir(consulta, N_CONSULTAS)[0] * 1000
+
+
+with tempfile.TemporaryDirectory() as carpeta:
+    rutas = [os.path.join(carpeta, n) for n in ("libros.json", "clientes.json", "prestamos.json")]
+    for ruta, data in zip(rutas, (libros, [], [])):
+        with open(ruta, "w") as f:
+            json.dump(data, f, indent=4)
+    sin_indice = ArchPrestamo(rutas[2], ArchLibro(rutas[0]), ArchCliente(rutas[1]))
+    con_indice = ArchPrestamo(rutas[2], ArchLibro(rutas[0], indexado_precio=True), ArchCliente(rutas[1]))
+
+    t_armado, _ = medir(lambda: con_indice.listarLibrosEntrePrecios(0, 0)) # Primera consulta: arma el .precio.ord
+
+    filas = []
+    for nombre, ancho in RANGOS:
+        random.seed(7)
+        t_sin = consulta_ms(sin_indice, ancho)
+        random.seed(7)
+        filas.append((nombre, t_sin, consulta_ms(con_indice, ancho)))
+
+    t_guardar, _ = medir(lambda: con_indice.arch_libro.guardar(Libro(N_LIBROS + 1, "Nuevo", 25.0)), silencioso=True)
+    t_guardar_sin, _ = medir(lambda: sin_indice.arch_libro.guardar(Libro(N_LIBROS + 2, "Nuevo", 25.0)), silencioso=True)
+
+print(f"{N_LIBROS:,} libros (armado del índice: {t_armado:.2f} s)")
+print(f"{'Rango de precios':24} {'sin índice (ms)':>16} {'con índice (ms)':>16}")
+for nombre, t_sin, t_con in filas:
+    print(f"{nombre:24} {t_sin:16.2f} {t_con:16.2f}")
+print(f"\nguardar un libro: {t_guardar_sin * 1000:.0f} ms sin índice, {t_guardar * 1000:.0f} ms manteniendo el índice")
@@ -0,0 +1,74 @@
+import json
+import os
+import random
+import sys
+import tempfile
+
+from biblioteca import (
+    ArchLibro, ArchCliente, ArchPrestamo,
+    ArchLibroSQLite, ArchClienteSQLite, ArchPrestamoSQLite,
+)
+from almacenamiento import medir
+
+# Uso: python benchmark_sqlite.py [PRESTAMOS] [LIBROS] [CLIENTES]
+N_PRESTAMOS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+N_LIBROS = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+N_CLIENTES = int(sys.argv[3]) if len(sys.argv) > 3 else 10_000
+
+random.seed(42)
+libros = [{"codLibro": i, "titulo": f"Libro {i}", "precio": round(random.uniform(5, 50), 2)}
+          for i in range(1, N_LIBROS + 1)]
+clientes = [{"codCliente": i, "ci": str(1_000_000 + i), "nombre": f"Nombre{i}", "apellido": f"Apellido{i}"}
+            for i in range(1, N_CLIENTES + 1)]
+# El último 10% de libros queda sin préstamos para el reporte c)
+prestamos = [{"codCliente": random.randint(1, N_CLIENTES),
+              "codLibro": random.randint(1, int(N_LIBROS * 0.9)),
+              "fechaPrestamo": "2024-01-01",
+              "cantidad": random.randint(1, 3)} for _ in range(N_PRESTAMOS)]
+
+REPORTES = [
+    ("a) libros entre precios", lambda ap: ap.listarLibrosEntrePrecios(10, 20)),
+    ("b) ingreso por libro", lambda ap: ap.calcularIngresoTotalPorLibro(1)),
+    ("c) libros no vendidos", lambda ap: ap.mostrarLibrosNoVendidos()),
+    ("d) clientes por libro", lambda ap: ap.mostrarClientesPorLibro(1)),
+    ("e) libro más prestado", lambda ap: ap.definirLibroMasPrestado()),
+    ("f) cliente con más préstamos", lambda ap: ap.mostrarClienteConMasPrestamos()),
+]
+
+
+def medir_reportes(arch_prestamo):
+    return [medir(lambda: reporte(arch_prestamo))[0] for _, reporte in REPORTES]
+
+
+with tempfile.TemporaryDirectory() as carpeta:
+    # --- Modo JSON (archivos escritos directamente, como quedarían tras muchas altas) ---
+    rutas = [os.path.join(carpeta, n) for n in ("libros.json", "clientes.json", "prestamos.json")]
+    for ruta, data in zip(rutas, (libros, clientes, prestamos)):
+        with open(ruta, "w") as f:
+            json.dump(data, f, indent=4)
+    ap_json = ArchPrestamo(rutas[2], ArchLibro(rutas[0]), ArchCliente(rutas[1]))
+    t_json = medir_reportes(ap_json)
+
+    # --- Modo SQLite ---
+    db = os.path.join(carpeta, "biblioteca.db")
+    al, ac = ArchLibroSQLite(db), ArchClienteSQLite(db)
+    ap_sql = ArchPrestamoSQLite(db, al, ac)
+
+    def cargar_sqlite():
+        with ap_sql.con:
+            ap_sql.con.executemany("INSERT INTO libros (codLibro, titulo, precio) VALUES (:codLibro, :titulo, :precio)", libros)
+            ap_sql.con.executemany("INSERT INTO clientes (codCliente, ci, nombre, apellido) "
+                                   "VALUES (:codCliente, :ci, :nombre, :apellido)", clientes)
+            ap_sql.con.executemany("INSERT INTO prestamos (codCliente, codLibro, fechaPrestamo, cantidad) "
+                                   "VALUES (:codCliente, :codLibro, :fechaPrestamo, :cantidad)", prestamos)
+
+    t_carga, _ = medir(cargar_sqlite)
+    t_sql = medir_reportes(ap_sql)
+    for con in (al.con, ac.con, ap_sql.con):
+        con.close()
+
+print(f"{N_PRESTAMOS:,} préstamos, {N_LIBROS:,} libros, {N_CLIENTES:,} clientes "
+      f"(carga inicial SQLite: {t_carga:.1f} s)")
+print(f"{'Reporte':32} {'JSON (s)':>10} {'SQLite (s)':>11}")
+for (nombre, _), tj, ts in zip(REPORTES, t_json, t_sql):
+    print(f"{nombre:32} {tj:10.3f} {ts:11.4f}")
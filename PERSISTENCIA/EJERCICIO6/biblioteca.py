@@ -1,33 +1,21 @@
-import json
 import os
-from typing import List, Optional, Dict, Any, Union
-
-# --- Helpers de Persistencia JSON ---
-# Simplificamos la carga y guardado para las 3 clases de archivo
-
-def _cargar_data(nombre_archivo: str) -> List[Dict[str, Any]]:
-    """Carga datos crudos (lista de diccionarios) desde un archivo JSON."""
-    if not os.path.exists(nombre_archivo):
-        return []
-    try:
-        with open(nombre_archivo, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError, IOError):
-        return []
-
-def _guardar_data(nombre_archivo: str, data: List[Dict[str, Any]]) -> None:
-    """Guarda una lista de diccionarios a un archivo JSON."""
-    try:
-        with open(nombre_archivo, 'w') as f:
-            json.dump(data, f, indent=4)
-    except Exception as e:
-        print(f" Error al guardar en {nombre_archivo}: {e}")
+import sqlite3
+import sys
+from typing import List, Optional, Dict, Any, Union, Iterable, Iterator, Set
+
+# --- Persistencia compartida (carpeta PERSISTENCIA/almacenamiento) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from almacenamiento import (Backend, BackendJSON, BloqueoArchivo, EnvoltorioAsincrono, IndiceOrdenado, IndicePrimario,
+                            agregar_registros, bloqueo_escritura, bloqueo_lectura, cargar_data, firma_archivo, iterar_data,
+                            guardar_data, separar_duplicados)
+from agregados_prestamos import AgregadosPrestamos
 
 # ====================================================================
 # --- CLASES DE ENTIDAD ---
 # ====================================================================
 
 class Libro:
+    __slots__ = ("codLibro", "titulo", "precio")
     def __init__(self, codLibro: int, titulo: str, precio: float):
         self.codLibro = codLibro
         self.titulo = titulo
@@ -44,6 +32,7 @@ class Libro:
         return f"Libro(Cód: {self.codLibro}, Título: {self.titulo}, Precio: ${self.precio:.2f})"
 
 class Cliente:
+    __slots__ = ("codCliente", "ci", "nombre", "apellido")
     def __init__(self, codCliente: int, ci: str, nombre: str, apellido: str):
         self.codCliente = codCliente
         self.ci = ci
@@ -61,6 +50,7 @@ class Cliente:
         return f"Cliente(Cód: {self.codCliente}, CI: {self.ci}, Nombre: {self.nombre} {self.apellido})"
 
 class Prestamo:
+    __slots__ = ("codCliente", "codLibro", "fechaPrestamo", "cantidad")
     def __init__(self, codCliente: int, codLibro: int, fechaPrestamo: str, cantidad: int):
         self.codCliente = codCliente
         self.codLibro = codLibro
@@ -82,102 +72,265 @@ class Prestamo:
 # ====================================================================
 
 class ArchLibro:
-    def __init__(self, nomArch: str):
+    def __init__(self, nomArch: str, backend: Optional[Backend] = None, indexado: bool = False,
+                 indexado_precio: bool = False, bloqueo: bool = False):
         self.nomArch = nomArch
+        self.backend = backend or BackendJSON()
+        self.indice = IndicePrimario(nomArch, "codLibro", self.backend) if indexado else None # Índice persistente por codLibro (.idx)
+        # Índice ordenado por precio para consultas por rango (.precio.ord)
+        self.indice_precio = IndiceOrdenado(nomArch, "precio", self.backend) if indexado_precio else None
+        self.bloqueo = BloqueoArchivo.para(nomArch) if bloqueo else None # Bloqueo entre procesos (<archivo>.lock)
 
+    @bloqueo_escritura
     def crearArchivo(self):
-        _guardar_data(self.nomArch, [])
+        guardar_data(self.nomArch, [], self.backend)
 
+    @bloqueo_lectura
     def listar(self) -> List[Libro]:
-        data = _cargar_data(self.nomArch)
+        data = cargar_data(self.nomArch, self.backend)
         return [Libro.from_dict(d) for d in data]
 
+    def iterar(self) -> Iterator[Libro]:
+        """Recorre los libros de a uno sin armar la lista completa."""
+        for d in iterar_data(self.nomArch, self.backend):
+            yield Libro.from_dict(d)
+
+    @bloqueo_escritura
     def guardar(self, libro: Libro):
-        libros = self.listar()
-        if any(l.codLibro == libro.codLibro for l in libros):
+        # Con índice el duplicado se detecta en O(1), sin cargar el archivo
+        if self.indice is not None and self.indice.contiene(libro.codLibro) or \
+           self.indice is None and any(l.codLibro == libro.codLibro for l in self.iterar()):
             print(f"⚠️ Libro con código {libro.codLibro} ya existe. No se añadió.")
             return
-        libros.append(libro)
-        _guardar_data(self.nomArch, [l.to_dict() for l in libros])
+        antes = firma_archivo(self.nomArch)
+        # Se agrega al final: los índices solo leen la cola nueva
+        if agregar_registros(self.nomArch, [libro], self.backend, self.indice) and self.indice_precio is not None:
+            self.indice_precio.registrar_agregados(antes)
         print(f"➕ Libro '{libro.titulo}' guardado.")
 
+    def codigos(self) -> Set[int]:
+        """Códigos de libro guardados (desde el índice si está activo, sin armar objetos)."""
+        if self.indice is not None:
+            return self.indice.claves()
+        return {l.codLibro for l in self.iterar()}
+
+    @bloqueo_escritura
+    def guardarMuchos(self, libros: Iterable[Libro]) -> Dict[str, Any]:
+        """Guarda un lote de libros con una sola escritura.
+
+        Retorna {"guardados": n, "duplicados": [codLibros]} en lugar de imprimir cada repetido.
+        """
+        antes = firma_archivo(self.nomArch)
+        nuevos, reporte = separar_duplicados(libros, self.codigos(), lambda l: l.codLibro)
+        if nuevos:
+            if not self._escribir_lote(nuevos):
+                reporte["guardados"] = 0
+            elif self.indice_precio is not None:
+                self.indice_precio.registrar_agregados(antes)
+        return reporte
+
+    def _escribir_lote(self, libros: List[Libro]) -> bool:
+        return agregar_registros(self.nomArch, libros, self.backend, self.indice)
+
     def buscar_por_codigo(self, cod: int) -> Optional[Libro]:
-        libros = self.listar()
-        return next((l for l in libros if l.codLibro == cod), None)
+        if self.indice is not None:
+            data = self.indice.buscar(cod)
+            return Libro.from_dict(data) if data else None
+        return next((l for l in self.iterar() if l.codLibro == cod), None)
+
+    def buscarEntrePrecios(self, x: float, y: float) -> List[Libro]:
+        """Libros con x <= precio <= y, en el orden del archivo (por índice ordenado si está activo)."""
+        if self.indice_precio is not None:
+            return [Libro.from_dict(d) for d in self.indice_precio.rango(x, y)]
+        return [l for l in self.iterar() if x <= l.precio <= y]
 
 
 class ArchCliente:
-    def __init__(self, nomArch: str):
+    def __init__(self, nomArch: str, backend: Optional[Backend] = None, indexado: bool = False,
+                 bloqueo: bool = False):
         self.nomArch = nomArch
+        self.backend = backend or BackendJSON()
+        self.indice = IndicePrimario(nomArch, "codCliente", self.backend) if indexado else None # Índice persistente por codCliente (.idx)
+        self.bloqueo = BloqueoArchivo.para(nomArch) if bloqueo else None # Bloqueo entre procesos (<archivo>.lock)
 
+    @bloqueo_escritura
     def crearArchivo(self):
-        _guardar_data(self.nomArch, [])
+        guardar_data(self.nomArch, [], self.backend)
 
+    @bloqueo_lectura
     def listar(self) -> List[Cliente]:
-        data = _cargar_data(self.nomArch)
+        data = cargar_data(self.nomArch, self.backend)
         return [Cliente.from_dict(d) for d in data]
 
+    def iterar(self) -> Iterator[Cliente]:
+        """Recorre los clientes de a uno sin armar la lista completa."""
+        for d in iterar_data(self.nomArch, self.backend):
+            yield Cliente.from_dict(d)
+
+    @bloqueo_escritura
     def guardar(self, cliente: Cliente):
-        clientes = self.listar()
-        if any(c.codCliente == cliente.codCliente for c in clientes):
+        # Con índice el duplicado se detecta en O(1), sin cargar el archivo
+        if self.indice is not None and self.indice.contiene(cliente.codCliente) or \
+           self.indice is None and any(c.codCliente == cliente.codCliente for c in self.iterar()):
             print(f"⚠️ Cliente con código {cliente.codCliente} ya existe. No se añadió.")
             return
-        clientes.append(cliente)
-        _guardar_data(self.nomArch, [c.to_dict() for c in clientes])
+        # Se agrega al final: el índice solo lee la cola nueva
+        agregar_registros(self.nomArch, [cliente], self.backend, self.indice)
         print(f"➕ Cliente '{cliente.nombre}' guardado.")
 
+    def codigos(self) -> Set[int]:
+        """Códigos de cliente guardados (desde el índice si está activo, sin armar objetos)."""
+        if self.indice is not None:
+            return self.indice.claves()
+        return {c.codCliente for c in self.iterar()}
+
+    @bloqueo_escritura
+    def guardarMuchos(self, clientes: Iterable[Cliente]) -> Dict[str, Any]:
+        """Guarda un lote de clientes con una sola escritura.
+
+        Retorna {"guardados": n, "duplicados": [codClientes]} en lugar de imprimir cada repetido.
+        """
+        nuevos, reporte = separar_duplicados(clientes, self.codigos(), lambda c: c.codCliente)
+        if nuevos and not self._escribir_lote(nuevos):
+            reporte["guardados"] = 0
+        return reporte
+
+    def _escribir_lote(self, clientes: List[Cliente]) -> bool:
+        return agregar_registros(self.nomArch, clientes, self.backend, self.indice)
+
     def buscar_por_codigo(self, cod: int) -> Optional[Cliente]:
-        clientes = self.listar()
-        return next((c for c in clientes if c.codCliente == cod), None)
+        if self.indice is not None:
+            data = self.indice.buscar(cod)
+            return Cliente.from_dict(data) if data else None
+        return next((c for c in self.iterar() if c.codCliente == cod), None)
 
 
 class ArchPrestamo:
-    def __init__(self, nomArch: str, arch_libro: ArchLibro, arch_cliente: ArchCliente):
+    def __init__(self, nomArch: str, arch_libro: ArchLibro, arch_cliente: ArchCliente,
+                 backend: Optional[Backend] = None, agregados: bool = False, bloqueo: bool = False):
         self.nomArch = nomArch
+        self.backend = backend or BackendJSON()
         self.arch_libro = arch_libro      # Para buscar datos de Libro
         self.arch_cliente = arch_cliente  # Para buscar datos de Cliente
+        # Contadores por libro/cliente mantenidos en cada alta (.agg) para los reportes b), c), e) y f)
+        self.agregados = (AgregadosPrestamos(nomArch + ".agg", self._firma_agregados,
+                                             self.iterar, self._precios) if agregados else None)
+        self.bloqueo = BloqueoArchivo.para(nomArch) if bloqueo else None # Bloqueo entre procesos (<archivo>.lock)
 
+    @bloqueo_escritura
     def crearArchivo(self):
-        _guardar_data(self.nomArch, [])
+        guardar_data(self.nomArch, [], self.backend)
 
+    @bloqueo_lectura
     def listar(self) -> List[Prestamo]:
-        data = _cargar_data(self.nomArch)
+        data = cargar_data(self.nomArch, self.backend)
         return [Prestamo.from_dict(d) for d in data]
 
+    def iterar(self) -> Iterator[Prestamo]:
+        """Recorre los préstamos de a uno sin armar la lista completa."""
+        for d in iterar_data(self.nomArch, self.backend):
+            yield Prestamo.from_dict(d)
+
+    @bloqueo_escritura
     def guardar(self, prestamo: Prestamo):
         # Validar que los códigos existan antes de guardar el préstamo
         if not self.arch_cliente.buscar_por_codigo(prestamo.codCliente):
             print(f" Error: Cliente con código {prestamo.codCliente} no encontrado. Préstamo no registrado.")
             return
-        if not self.arch_libro.buscar_por_codigo(prestamo.codLibro):
+        libro = self.arch_libro.buscar_por_codigo(prestamo.codLibro)
+        if not libro:
             print(f" Error: Libro con código {prestamo.codLibro} no encontrado. Préstamo no registrado.")
             return
 
+        antes = self._firma_agregados()
         prestamos = self.listar()
         prestamos.append(prestamo)
-        _guardar_data(self.nomArch, [p.to_dict() for p in prestamos])
+        if guardar_data(self.nomArch, [p.to_dict() for p in prestamos], self.backend) and self.agregados is not None:
+            self.agregados.aplicar(antes, [prestamo], {libro.codLibro: libro.precio})
         print(f" Préstamo (Clt: {prestamo.codCliente}, Lib: {prestamo.codLibro}) registrado.")
 
+    @bloqueo_escritura
+    def guardarMuchos(self, prestamos: Iterable[Prestamo]) -> Dict[str, Any]:
+        """Registra un lote de préstamos con una sola escritura.
+
+        Los códigos se validan contra conjuntos en memoria (una lectura de libros y
+        otra de clientes). Retorna {"guardados": n, "rechazados": [{codCliente,
+        codLibro, motivo}]} en lugar de imprimir cada error.
+        """
+        antes = self._firma_agregados()
+        clientes = self.arch_cliente.codigos()
+        libros = self.arch_libro.codigos()
+        validos, rechazados = [], []
+        for p in prestamos:
+            if p.codCliente not in clientes:
+                motivo = "cliente inexistente"
+            elif p.codLibro not in libros:
+                motivo = "libro inexistente"
+            else:
+                validos.append(p)
+                continue
+            rechazados.append({"codCliente": p.codCliente, "codLibro": p.codLibro, "motivo": motivo})
+        guardados = len(validos) if validos and self._escribir_lote(validos) else 0
+        if guardados and self.agregados is not None:
+            self.agregados.aplicar(antes, validos)
+        return {"guardados": guardados, "rechazados": rechazados}
+
+    def _escribir_lote(self, prestamos: List[Prestamo]) -> bool:
+        return agregar_registros(self.nomArch, prestamos, self.backend)
+
+    def _firma_agregados(self) -> Any:
+        """Firma de lo que reflejan los agregados: préstamos y libros (None si no hay préstamos)."""
+        prestamos = firma_archivo(self.nomArch)
+        return None if prestamos is None else [prestamos, firma_archivo(self.arch_libro.nomArch)]
+
+    def _precios(self, codigos: Optional[Set[int]] = None) -> Dict[int, float]:
+        """{codLibro: precio} de los libros dados (None: todos), por índice si está activo."""
+        if codigos is not None and self.arch_libro.indice is not None:
+            libros = (self.arch_libro.buscar_por_codigo(c) for c in codigos)
+            return {l.codLibro: l.precio for l in libros if l}
+        return {l.codLibro: l.precio for l in self.arch_libro.iterar() if codigos is None or l.codLibro in codigos}
+
+    # --- Agregados materializados ---
+    @bloqueo_lectura
+    def verificarAgregados(self) -> Optional[Dict[str, Any]]:
+        """Compara los contadores guardados con un recuento desde el archivo de préstamos.
+
+        Retorna {"ok", "libros", "clientes", "lideres"} (ver AgregadosPrestamos.verificar)
+        o None si el gestor no mantiene agregados.
+        """
+        if self.agregados is None:
+            print(" Este gestor no mantiene agregados (agregados=False).")
+            return None
+        return self.agregados.verificar()
+
+    @bloqueo_escritura
+    def reconstruirAgregados(self) -> None:
+        """Vuelve a armar los contadores desde el archivo de préstamos."""
+        if self.agregados is None:
+            print(" Este gestor no mantiene agregados (agregados=False).")
+            return
+        self.agregados.reconstruir()
+
     # --- IMPLEMENTACIÓN DE LOS PUNTOS DEL EJERCICIO 6 ---
 
     # a) Listar los libros cuyo precio estén entre 2 valores (x e y).
     def listarLibrosEntrePrecios(self, x: float, y: float) -> List[Libro]:
         """Retorna libros cuyo precio está entre x (mínimo) y y (máximo)."""
-        libros = self.arch_libro.listar()
-        return [l for l in libros if x <= l.precio <= y]
+        return self.arch_libro.buscarEntrePrecios(x, y)
 
     # b) Calcular el ingreso total generado por un libro especifico.
     # Nota: Interpretamos "prestamo" como "venta" dado el atributo 'precio' en Libro y el punto b).
     def calcularIngresoTotalPorLibro(self, cod_libro: int) -> float:
         """Calcula el ingreso total (Precio * Cantidad) generado por un libro."""
+        if self.agregados is not None:
+            return self.agregados.ingreso(cod_libro)
         libro = self.arch_libro.buscar_por_codigo(cod_libro)
         if not libro:
             return 0.0
 
-        prestamos = self.listar()
         ingreso_total = 0.0
         
-        for p in prestamos:
+        for p in self.iterar():
             if p.codLibro == cod_libro:
                 # Ingreso = Precio del Libro * Cantidad Prestada/Vendida
                 ingreso_total += libro.precio * p.cantidad
@@ -187,22 +340,20 @@ class ArchPrestamo:
     # c) Mostrar la lista de libros que nunca fueron vendidos (prestados).
     def mostrarLibrosNoVendidos(self) -> List[Libro]:
         """Retorna la lista de libros que no tienen ningún registro de préstamo/venta."""
-        libros = self.arch_libro.listar()
-        prestamos = self.listar()
-        
-        codigos_prestados = {p.codLibro for p in prestamos}
+        if self.agregados is not None:
+            codigos_prestados = self.agregados.codigos_libros()
+        else:
+            codigos_prestados = {p.codLibro for p in self.iterar()}
         
         # Filtra los libros cuyo código NO está en el conjunto de códigos prestados
-        libros_no_vendidos = [l for l in libros if l.codLibro not in codigos_prestados]
+        libros_no_vendidos = [l for l in self.arch_libro.iterar() if l.codLibro not in codigos_prestados]
         return libros_no_vendidos
 
     # d) Mostrar a todos los clientes que compraron un libro especifico (dado su código).
     def mostrarClientesPorLibro(self, cod_libro: int) -> List[Cliente]:
         """Retorna la lista de clientes que compraron/prestaron un libro específico."""
-        prestamos = self.listar()
-        
         # 1. Obtener los códigos de clientes únicos que prestaron ese libro
-        codigos_clientes = {p.codCliente for p in prestamos if p.codLibro == cod_libro}
+        codigos_clientes = {p.codCliente for p in self.iterar() if p.codLibro == cod_libro}
         
         # 2. Buscar los objetos Cliente correspondientes
         clientes_encontrados = []
@@ -216,16 +367,17 @@ class ArchPrestamo:
     # e) Definir el libro más prestado.
     def definirLibroMasPrestado(self) -> Optional[Libro]:
         """Encuentra y retorna el libro con la mayor cantidad total de copias prestadas."""
-        prestamos = self.listar()
-        
-        if not prestamos:
-            return None
-            
-        # Contar la cantidad total prestada por código de libro
+        if self.agregados is not None:
+            cod = self.agregados.libro_lider()
+            return self.arch_libro.buscar_por_codigo(cod) if cod is not None else None
+        # Contar la cantidad total prestada por código de libro (en memoria solo queda el conteo)
         conteo_prestamos: Dict[int, int] = {}
-        for p in prestamos:
+        for p in self.iterar():
             conteo_prestamos[p.codLibro] = conteo_prestamos.get(p.codLibro, 0) + p.cantidad
 
+        if not conteo_prestamos:
+            return None
+
         # Encontrar el código del libro con el valor máximo
         cod_mas_prestado = max(conteo_prestamos, key=conteo_prestamos.get)
         
@@ -235,18 +387,287 @@ class ArchPrestamo:
     # f) Mostrar el cliente que tuvo más préstamos.
     def mostrarClienteConMasPrestamos(self) -> Optional[Cliente]:
         """Encuentra y retorna el cliente que tiene la mayor cantidad de préstamos (registros)."""
-        prestamos = self.listar()
-        
-        if not prestamos:
-            return None
-            
+        if self.agregados is not None:
+            cod = self.agregados.cliente_lider()
+            return self.arch_cliente.buscar_por_codigo(cod) if cod is not None else None
         # Contar el número de registros de préstamo por cliente
         conteo_clientes: Dict[int, int] = {}
-        for p in prestamos:
+        for p in self.iterar():
             conteo_clientes[p.codCliente] = conteo_clientes.get(p.codCliente, 0) + 1 # Contamos un registro por préstamo
 
+        if not conteo_clientes:
+            return None
+
         # Encontrar el código del cliente con el valor máximo
         cod_mas_prestamos = max(conteo_clientes, key=conteo_clientes.get)
         
         # Retornar el objeto Cliente
-        return self.arch_cliente.buscar_por_codigo(cod_mas_prestamos)
\ No newline at end of file
+        return self.arch_cliente.buscar_por_codigo(cod_mas_prestamos)
+
+# ====================================================================
+# --- MODO SQLITE (un solo archivo .db con índices) ---
+# ====================================================================
+# Libros, clientes y préstamos viven en la misma base para que los reportes
+# a) - f) se resuelvan con una sola consulta indexada, sin recargar archivos.
+
+_ESQUEMA_BIBLIOTECA = """
+CREATE TABLE IF NOT EXISTS libros (
+    pos INTEGER PRIMARY KEY,
+    codLibro INTEGER NOT NULL UNIQUE,
+    titulo TEXT NOT NULL,
+    precio REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS clientes (
+    pos INTEGER PRIMARY KEY,
+    codCliente INTEGER NOT NULL UNIQUE,
+    ci TEXT NOT NULL,
+    nombre TEXT NOT NULL,
+    apellido TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS prestamos (
+    id INTEGER PRIMARY KEY,
+    codCliente INTEGER NOT NULL,
+    codLibro INTEGER NOT NULL,
+    fechaPrestamo TEXT NOT NULL,
+    cantidad INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_prestamos_libro ON prestamos (codLibro, cantidad, codCliente);
+CREATE INDEX IF NOT EXISTS idx_prestamos_cliente ON prestamos (codCliente);
+CREATE INDEX IF NOT EXISTS idx_libros_precio ON libros (precio);
+"""
+
+def _conectar_biblioteca(nomArch: str) -> sqlite3.Connection:
+    """Abre (o crea) la base de la biblioteca con sus tablas e índices.
+
+    check_same_thread=False: un AsyncArch* usa la conexión desde su propio hilo
+    (uno solo por envoltorio, así que las llamadas ya llegan de a una).
+    """
+    con = sqlite3.connect(nomArch, check_same_thread=False)
+    con.executescript(_ESQUEMA_BIBLIOTECA)
+    return con
+
+
+class ArchLibroSQLite(ArchLibro):
+    """ArchLibro guardado en la tabla 'libros' de una base SQLite."""
+    def __init__(self, nomArch: str):
+        self.nomArch = nomArch
+        self.indice = None # La tabla ya tiene su índice UNIQUE por codLibro
+        self.indice_precio = None # y idx_libros_precio para los rangos
+        self.bloqueo = None # SQLite ya serializa las escrituras con sus propios bloqueos
+        self.con = _conectar_biblioteca(nomArch)
+
+    def crearArchivo(self):
+        with self.con:
+            self.con.execute("DELETE FROM libros")
+
+    def listar(self) -> List[Libro]:
+        filas = self.con.execute("SELECT codLibro, titulo, precio FROM libros ORDER BY pos")
+        return [Libro(*f) for f in filas]
+
+    def iterar(self) -> Iterator[Libro]:
+        for f in self.con.execute("SELECT codLibro, titulo, precio FROM libros ORDER BY pos"):
+            yield Libro(*f)
+
+    def guardar(self, libro: Libro):
+        try:
+            with self.con:
+                self.con.execute("INSERT INTO libros (codLibro, titulo, precio) VALUES (?, ?, ?)",
+                                 (libro.codLibro, libro.titulo, libro.precio))
+        except sqlite3.IntegrityError:
+            print(f"⚠️ Libro con código {libro.codLibro} ya existe. No se añadió.")
+            return
+        print(f"➕ Libro '{libro.titulo}' guardado.")
+
+    def codigos(self) -> Set[int]:
+        return {f[0] for f in self.con.execute("SELECT codLibro FROM libros")}
+
+    def _escribir_lote(self, libros: List[Libro]) -> bool:
+        try:
+            with self.con:
+                self.con.executemany("INSERT INTO libros (codLibro, titulo, precio) VALUES (?, ?, ?)",
+                                     ((l.codLibro, l.titulo, l.precio) for l in libros))
+            return True
+        except sqlite3.Error as e:
+            print(f" Error al guardar en {self.nomArch}: {e}")
+            return False
+
+    def buscar_por_codigo(self, cod: int) -> Optional[Libro]:
+        fila = self.con.execute("SELECT codLibro, titulo, precio FROM libros WHERE codLibro = ?", (cod,)).fetchone()
+        return Libro(*fila) if fila else None
+
+    # Libros con precio entre x e y (usa idx_libros_precio)
+    def buscarEntrePrecios(self, x: float, y: float) -> List[Libro]:
+        filas = self.con.execute("SELECT codLibro, titulo, precio FROM libros WHERE precio BETWEEN ? AND ? ORDER BY pos",
+                                 (x, y))
+        return [Libro(*f) for f in filas]
+
+
+class ArchClienteSQLite(ArchCliente):
+    """ArchCliente guardado en la tabla 'clientes' de una base SQLite."""
+    def __init__(self, nomArch: str):
+        self.nomArch = nomArch
+        self.indice = None # La tabla ya tiene su índice UNIQUE por codCliente
+        self.bloqueo = None # SQLite ya serializa las escrituras con sus propios bloqueos
+        self.con = _conectar_biblioteca(nomArch)
+
+    def crearArchivo(self):
+        with self.con:
+            self.con.execute("DELETE FROM clientes")
+
+    def listar(self) -> List[Cliente]:
+        filas = self.con.execute("SELECT codCliente, ci, nombre, apellido FROM clientes ORDER BY pos")
+        return [Cliente(*f) for f in filas]
+
+    def iterar(self) -> Iterator[Cliente]:
+        for f in self.con.execute("SELECT codCliente, ci, nombre, apellido FROM clientes ORDER BY pos"):
+            yield Cliente(*f)
+
+    def guardar(self, cliente: Cliente):
+        try:
+            with self.con:
+                self.con.execute("INSERT INTO clientes (codCliente, ci, nombre, apellido) VALUES (?, ?, ?, ?)",
+                                 (cliente.codCliente, cliente.ci, cliente.nombre, cliente.apellido))
+        except sqlite3.IntegrityError:
+            print(f"⚠️ Cliente con código {cliente.codCliente} ya existe. No se añadió.")
+            return
+        print(f"➕ Cliente '{cliente.nombre}' guardado.")
+
+    def codigos(self) -> Set[int]:
+        return {f[0] for f in self.con.execute("SELECT codCliente FROM clientes")}
+
+    def _escribir_lote(self, clientes: List[Cliente]) -> bool:
+        try:
+            with self.con:
+                self.con.executemany("INSERT INTO clientes (codCliente, ci, nombre, apellido) VALUES (?, ?, ?, ?)",
+                                     ((c.codCliente, c.ci, c.nombre, c.apellido) for c in clientes))
+            return True
+        except sqlite3.Error as e:
+            print(f" Error al guardar en {self.nomArch}: {e}")
+            return False
+
+    def buscar_por_codigo(self, cod: int) -> Optional[Cliente]:
+        fila = self.con.execute("SELECT codCliente, ci, nombre, apellido FROM clientes WHERE codCliente = ?",
+                                (cod,)).fetchone()
+        return Cliente(*fila) if fila else None
+
+
+class ArchPrestamoSQLite(ArchPrestamo):
+    """ArchPrestamo sobre SQLite: los reportes a) - f) son consultas únicas con índices."""
+    def __init__(self, nomArch: str, arch_libro: ArchLibroSQLite, arch_cliente: ArchClienteSQLite):
+        if not (isinstance(arch_libro, ArchLibroSQLite) and isinstance(arch_cliente, ArchClienteSQLite)
+                and arch_libro.nomArch == nomArch and arch_cliente.nomArch == nomArch):
+            raise ValueError("ArchPrestamoSQLite necesita ArchLibroSQLite y ArchClienteSQLite sobre la misma base.")
+        self.nomArch = nomArch
+        self.arch_libro = arch_libro
+        self.arch_cliente = arch_cliente
+        self.agregados = None # Los reportes ya son consultas agregadas en SQL
+        self.bloqueo = None # SQLite ya serializa las escrituras con sus propios bloqueos
+        self.con = _conectar_biblioteca(nomArch)
+
+    def crearArchivo(self):
+        with self.con:
+            self.con.execute("DELETE FROM prestamos")
+
+    def listar(self) -> List[Prestamo]:
+        filas = self.con.execute("SELECT codCliente, codLibro, fechaPrestamo, cantidad FROM prestamos ORDER BY id")
+        return [Prestamo(*f) for f in filas]
+
+    def iterar(self) -> Iterator[Prestamo]:
+        for f in self.con.execute("SELECT codCliente, codLibro, fechaPrestamo, cantidad FROM prestamos ORDER BY id"):
+            yield Prestamo(*f)
+
+    def guardar(self, prestamo: Prestamo):
+        # Validar que los códigos existan antes de guardar el préstamo (búsquedas por índice)
+        if not self.con.execute("SELECT 1 FROM clientes WHERE codCliente = ?", (prestamo.codCliente,)).fetchone():
+            print(f" Error: Cliente con código {prestamo.codCliente} no encontrado. Préstamo no registrado.")
+            return
+        if not self.con.execute("SELECT 1 FROM libros WHERE codLibro = ?", (prestamo.codLibro,)).fetchone():
+            print(f" Error: Libro con código {prestamo.codLibro} no encontrado. Préstamo no registrado.")
+            return
+
+        with self.con:
+            self.con.execute("INSERT INTO prestamos (codCliente, codLibro, fechaPrestamo, cantidad) VALUES (?, ?, ?, ?)",
+                             (prestamo.codCliente, prestamo.codLibro, prestamo.fechaPrestamo, prestamo.cantidad))
+        print(f" Préstamo (Clt: {prestamo.codCliente}, Lib: {prestamo.codLibro}) registrado.")
+
+    def _escribir_lote(self, prestamos: List[Prestamo]) -> bool:
+        try:
+            with self.con:
+                self.con.executemany("INSERT INTO prestamos (codCliente, codLibro, fechaPrestamo, cantidad) VALUES (?, ?, ?, ?)",
+                                     ((p.codCliente, p.codLibro, p.fechaPrestamo, p.cantidad) for p in prestamos))
+            return True
+        except sqlite3.Error as e:
+            print(f" Error al guardar en {self.nomArch}: {e}")
+            return False
+
+    # b) Ingreso total de un libro (usa idx_prestamos_libro)
+    def calcularIngresoTotalPorLibro(self, cod_libro: int) -> float:
+        fila = self.con.execute("""
+            SELECT SUM(l.precio * p.cantidad)
+            FROM libros l JOIN prestamos p ON p.codLibro = l.codLibro
+            WHERE l.codLibro = ?""", (cod_libro,)).fetchone()
+        return fila[0] or 0.0
+
+    # c) Libros sin préstamos
+    def mostrarLibrosNoVendidos(self) -> List[Libro]:
+        filas = self.con.execute("""
+            SELECT codLibro, titulo, precio FROM libros l
+            WHERE NOT EXISTS (SELECT 1 FROM prestamos p WHERE p.codLibro = l.codLibro)
+            ORDER BY pos""")
+        return [Libro(*f) for f in filas]
+
+    # d) Clientes que prestaron un libro (una sola consulta en vez de una búsqueda por cliente)
+    def mostrarClientesPorLibro(self, cod_libro: int) -> List[Cliente]:
+        filas = self.con.execute("""
+            SELECT codCliente, ci, nombre, apellido FROM clientes
+            WHERE codCliente IN (SELECT codCliente FROM prestamos WHERE codLibro = ?)
+            ORDER BY pos""", (cod_libro,))
+        return [Cliente(*f) for f in filas]
+
+    # e) Libro más prestado (en empate gana el que se prestó primero, igual que la versión JSON)
+    def definirLibroMasPrestado(self) -> Optional[Libro]:
+        fila = self.con.execute("""
+            SELECT l.codLibro, l.titulo, l.precio
+            FROM (SELECT codLibro, SUM(cantidad) AS total, MIN(id) AS primero
+                  FROM prestamos GROUP BY codLibro) t
+            JOIN libros l ON l.codLibro = t.codLibro
+            ORDER BY t.total DESC, t.primero LIMIT 1""").fetchone()
+        return Libro(*fila) if fila else None
+
+    # f) Cliente con más préstamos (registros)
+    def mostrarClienteConMasPrestamos(self) -> Optional[Cliente]:
+        fila = self.con.execute("""
+            SELECT c.codCliente, c.ci, c.nombre, c.apellido
+            FROM (SELECT codCliente, COUNT(*) AS total, MIN(id) AS primero
+                  FROM prestamos GROUP BY codCliente) t
+            JOIN clientes c ON c.codCliente = t.codCliente
+            ORDER BY t.total DESC, t.primero LIMIT 1""").fetchone()
+        return Cliente(*fila) if fila else None
+
+
+# ====================================================================
+# --- VERSIÓN ASÍNCRONA (asyncio) ---
+# ====================================================================
+
+class AsyncArchLibro(EnvoltorioAsincrono):
+    """ArchLibro con métodos awaitable (E/S y parseo fuera del event loop)."""
+    lecturas = ("listar", "codigos", "buscar_por_codigo", "buscarEntrePrecios")
+    mutaciones = ("crearArchivo", "guardar", "guardarMuchos")
+
+
+class AsyncArchCliente(EnvoltorioAsincrono):
+    """ArchCliente con métodos awaitable (E/S y parseo fuera del event loop)."""
+    lecturas = ("listar", "codigos", "buscar_por_codigo")
+    mutaciones = ("crearArchivo", "guardar", "guardarMuchos")
+
+
+class AsyncArchPrestamo(EnvoltorioAsincrono):
+    """ArchPrestamo con métodos awaitable (E/S y parseo fuera del event loop).
+
+    Consulta sus arch_libro y arch_cliente desde su propio hilo: no los envuelvan a la vez
+    en un AsyncArchLibro/AsyncArchCliente (cada envoltorio supone que su gestor es solo suyo).
+    """
+    lecturas = ("listar", "listarLibrosEntrePrecios", "calcularIngresoTotalPorLibro", "mostrarLibrosNoVendidos",
+                "mostrarClientesPorLibro", "definirLibroMasPrestado", "mostrarClienteConMasPrestamos",
+                "verificarAgregados")
+    mutaciones = ("crearArchivo", "guardar", "guardarMuchos", "reconstruirAgregados")
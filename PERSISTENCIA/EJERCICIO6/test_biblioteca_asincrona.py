@@ -0,0 +1,43 @@
+import asyncio
+import io
+from contextlib import redirect_stdout
+
+from biblioteca import (
+    Libro, Cliente, Prestamo, ArchLibroSQLite, ArchClienteSQLite, ArchPrestamoSQLite,
+    AsyncArchLibro, AsyncArchPrestamo,
+)
+
+# Uso: python -m pytest test_biblioteca_asincrona.py (desde EJERCICIO6)
+# Los envoltorios asíncronos corren el gestor en un hilo propio: con SQLite la
+# conexión creada en el hilo principal tiene que poder usarse desde ese hilo.
+
+
+def test_lectura_y_escritura_asincronas_sobre_sqlite(tmp_path):
+    arch_libro = ArchLibroSQLite(str(tmp_path / "biblioteca.db"))
+
+    async def usar():
+        async with AsyncArchLibro(arch_libro) as libros:
+            await libros.guardar(Libro(1, "Rayuela", 30.0))
+            return await libros.listar()
+
+    with redirect_stdout(io.StringIO()):
+        listados = asyncio.run(usar())
+    assert [(l.codLibro, l.titulo, l.precio) for l in listados] == [(1, "Rayuela", 30.0)]
+
+
+def test_prestamos_asincronos_sobre_sqlite(tmp_path):
+    db = str(tmp_path / "biblioteca.db")
+    arch_libro, arch_cliente = ArchLibroSQLite(db), ArchClienteSQLite(db)
+    with redirect_stdout(io.StringIO()):
+        arch_libro.guardar(Libro(1, "Rayuela", 30.0))
+        arch_cliente.guardar(Cliente(7, "123", "Ana", "Paz"))
+    arch_prestamo = ArchPrestamoSQLite(db, arch_libro, arch_cliente)
+
+    async def usar():
+        async with AsyncArchPrestamo(arch_prestamo) as prestamos:
+            reporte = await prestamos.guardarMuchos([Prestamo(7, 1, "2024-01-01", 2)])
+            return reporte, await prestamos.listar()
+
+    reporte, listados = asyncio.run(usar())
+    assert reporte["guardados"] == 1
+    assert [(p.codCliente, p.codLibro, p.cantidad) for p in listados] == [(7, 1, 2)]
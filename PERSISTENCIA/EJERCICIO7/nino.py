@@ -1,25 +1,12 @@
-import json
 import os
-from typing import List, Optional, Dict, Any
-
-# --- Helpers de Persistencia JSON ---
-def _cargar_data(nombre_archivo: str) -> List[Dict[str, Any]]:
-    """Carga datos crudos (lista de diccionarios) desde un archivo JSON."""
-    if not os.path.exists(nombre_archivo):
-        return []
-    try:
-        with open(nombre_archivo, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError, IOError):
-        return []
-
-def _guardar_data(nombre_archivo: str, data: List[Dict[str, Any]]) -> None:
-    """Guarda una lista de diccionarios a un archivo JSON."""
-    try:
-        with open(nombre_archivo, 'w') as f:
-            json.dump(data, f, indent=4)
-    except Exception as e:
-        print(f" Error al guardar en {nombre_archivo}: {e}")
+import sys
+from typing import List, Optional, Dict, Any, Iterable, Iterator
+
+# --- Persistencia compartida (carpeta PERSISTENCIA/almacenamiento) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from almacenamiento import (Backend, BackendJSON, BloqueoArchivo, CacheArchivos, EnvoltorioAsincrono, IndicePrimario,
+                            agregar_registros, bloqueo_escritura, bloqueo_lectura, cargar_data, iterar_data, guardar_data,
+                            separar_duplicados)
 
 # --- TABLA DE REFERENCIA FICTICIA (Simplificada para el ejercicio) ---
 # Peso Mínimo Aceptable (PMA) y Talla Mínima Aceptable (TMA) según la edad.
@@ -39,6 +26,7 @@ RANGOS_ADECUADOS = {
 
 class Persona:
     """Clase base que representa una persona."""
+    __slots__ = ("nombre", "apellidoPaterno", "apellidoMaterno", "ci")
     def __init__(self, nombre: str, apellidoPaterno: str, apellidoMaterno: str, ci: int):
         self.nombre = nombre
         self.apellidoPaterno = apellidoPaterno
@@ -62,6 +50,7 @@ class Persona:
 
 class Nino(Persona):
     """Clase que hereda de Persona y añade atributos específicos."""
+    __slots__ = ("edad", "peso", "talla") # Los de Persona ya están en su __slots__
     def __init__(self, nombre: str, apellidoPaterno: str, apellidoMaterno: str, ci: int,
                  edad: int, peso: str, talla: str):
         super().__init__(nombre, apellidoPaterno, apellidoMaterno, ci)
@@ -109,28 +98,94 @@ class Nino(Persona):
 # ====================================================================
 
 class ArchNino:
-    def __init__(self, na: str):
+    def __init__(self, na: str, backend: Optional[Backend] = None,
+                 cache: Optional[CacheArchivos] = None, indexado: bool = False, bloqueo: bool = False):
         self.na = na # Nombre del archivo
+        self.backend = backend or BackendJSON() # Formato en disco (JSON con sangría por defecto)
+        self.cache = cache # Cache opcional de objetos ya parseados (compartible entre gestores)
+        self.indice = IndicePrimario(na, "ci", self.backend) if indexado else None # Índice persistente por ci (.idx)
+        self.bloqueo = BloqueoArchivo.para(na) if bloqueo else None # Bloqueo entre procesos (<archivo>.lock)
 
+    @bloqueo_escritura
     def crearArchivo(self):
-        _guardar_data(self.na, [])
+        self._guardar_lista([])
 
+    @bloqueo_lectura
     def listar(self) -> List[Nino]:
-        data = _cargar_data(self.na)
+        if self.cache is not None:
+            return self.cache.obtener(self.na, self._leer_ninos)
+        return self._leer_ninos()
+
+    def _leer_ninos(self) -> List[Nino]:
+        """Lee y parsea el archivo completo (sin pasar por el cache)."""
+        data = cargar_data(self.na, self.backend)
         return [Nino.from_dict(d) for d in data]
 
+    def iterar(self) -> Iterator[Nino]:
+        """Recorre los niños de a uno sin armar la lista completa (memoria constante)."""
+        en_cache = self.cache.vigente(self.na) if self.cache is not None else None
+        if en_cache is not None:
+            yield from en_cache
+            return
+        for d in iterar_data(self.na, self.backend):
+            yield Nino.from_dict(d)
+
+    def _guardar_lista(self, ninos: List[Nino]) -> bool:
+        """Guarda la lista completa de niños al archivo JSON."""
+        ok = guardar_data(self.na, [n.to_dict() for n in ninos], self.backend)
+        if not ok:
+            self._descartar_cache()
+        elif self.cache is not None:
+            self.cache.recordar(self.na, ninos)
+        if ok and self.indice is not None:
+            self.indice.registrar_claves(n.ci for n in ninos)
+        return ok
+
+    def _descartar_cache(self) -> None:
+        """Olvida los objetos en cache de este archivo (p. ej. si una modificación se cortó antes de guardar)."""
+        if self.cache is not None:
+            self.cache.invalidar(self.na)
+
     # Implementación para el punto a) - Crear, leer, listar y mostrar
+    @bloqueo_escritura
     def guardar(self, nino: Nino):
         """Guarda un nuevo registro de niño en el archivo."""
+        # Con índice el duplicado se detecta en O(1) y el niño se agrega al final, sin cargar el archivo
+        if self.indice is not None:
+            if self.indice.contiene(nino.ci):
+                print(f" Niño con carnet {nino.ci} ya existe. No se añadió.")
+                return
+            if not agregar_registros(self.na, [nino], self.backend, self.indice, self.cache):
+                return # agregar_registros ya informó el error
+            print(f" Niño '{nino.nombre}' (CI: {nino.ci}) guardado.")
+            return
         ninos = self.listar()
         if any(n.ci == nino.ci for n in ninos):
             print(f" Niño con carnet {nino.ci} ya existe. No se añadió.")
             return
 
         ninos.append(nino)
-        _guardar_data(self.na, [n.to_dict() for n in ninos])
+        self._guardar_lista(ninos)
         print(f" Niño '{nino.nombre}' (CI: {nino.ci}) guardado.")
 
+    @bloqueo_escritura
+    def guardarMuchos(self, ninos: Iterable[Nino]) -> Dict[str, Any]:
+        """Guarda un lote de niños con una sola carga y una sola escritura.
+
+        Los duplicados (ci ya existente o repetido en el lote) no se imprimen:
+        vuelven en el reporte {"guardados": n, "duplicados": [cis]}.
+        """
+        if self.indice is not None:
+            nuevos, reporte = separar_duplicados(ninos, self.indice.claves(), lambda x: x.ci)
+            if nuevos and not agregar_registros(self.na, nuevos, self.backend, self.indice, self.cache):
+                reporte["guardados"] = 0
+            return reporte
+        actuales = self.listar()
+        nuevos, reporte = separar_duplicados(ninos, {x.ci for x in actuales}, lambda x: x.ci)
+        if nuevos and not self._guardar_lista(actuales + nuevos):
+            reporte["guardados"] = 0
+        return reporte
+
     def leer(self, nino: Nino):
         """Simula la acción de 'leer' (cargar) un niño existente basado en CI."""
         return self.buscar_por_ci(nino.ci)
@@ -163,9 +218,8 @@ class ArchNino:
     # b) Cuántos niños tienen el peso adecuado de acuerdo a su talla y edad
     def contarNinosAdecuados(self) -> int:
         """Cuenta cuántos niños cumplen con el peso y talla adecuados para su edad."""
-        ninos = self.listar()
         contador = 0
-        for n in ninos:
+        for n in self.iterar():
             if self.es_adecuado(n):
                 contador += 1
         return contador
@@ -173,34 +227,51 @@ class ArchNino:
     # c) Mostrar a los niños que de acuerdo a la edad no tienen el peso o la talla adecuada.
     def mostrarNinosNoAdecuados(self) -> List[Nino]:
         """Retorna la lista de niños que no cumplen con los rangos adecuados."""
-        ninos = self.listar()
-        return [n for n in ninos if not self.es_adecuado(n)]
+        return [n for n in self.iterar() if not self.es_adecuado(n)]
 
     # d) Determinar el promedio de edad en los niños.
     def determinarPromedioEdad(self) -> float:
         """Calcula el promedio de edad de todos los niños registrados."""
-        ninos = self.listar()
-        if not ninos:
+        # Suma y cuenta en una sola pasada sobre el iterador (memoria constante)
+        suma_edades, cantidad = 0, 0
+        for n in self.iterar():
+            suma_edades += n.edad
+            cantidad += 1
+        if not cantidad:
             return 0.0
             
-        suma_edades = sum(n.edad for n in ninos)
-        return suma_edades / len(ninos)
+        return suma_edades / cantidad
 
     # e) Buscar al niño con el carnet x.
     def buscar_por_ci(self, ci_x: int) -> Optional[Nino]:
         """Busca y retorna un niño por su número de carnet (CI)."""
-        ninos = self.listar()
-        return next((n for n in ninos if n.ci == ci_x), None)
+        if self.indice is not None:
+            data = self.indice.buscar(ci_x)
+            return Nino.from_dict(data) if data else None
+        return next((n for n in self.iterar() if n.ci == ci_x), None)
 
     # f) Mostrar a los niños con la talla más alta.
     def mostrarNinosTallaMasAlta(self) -> List[Nino]:
         """Retorna una lista de niños que tienen la talla más alta."""
-        ninos = self.listar()
-        if not ninos:
-            return []
-            
-        # 1. Encontrar la talla máxima
-        talla_maxima = max(n._get_talla_cm() for n in ninos)
-        
-        # 2. Filtrar todos los niños que tienen esa talla
-        return [n for n in ninos if n._get_talla_cm() == talla_maxima]
\ No newline at end of file
+        # Una sola pasada: se guardan solo los empatados con la talla máxima vista hasta ahora
+        talla_maxima: Optional[float] = None
+        mas_altos: List[Nino] = []
+        for n in self.iterar():
+            talla = n._get_talla_cm()
+            if talla_maxima is None or talla > talla_maxima:
+                talla_maxima, mas_altos = talla, [n]
+            elif talla == talla_maxima:
+                mas_altos.append(n)
+        return mas_altos
+
+
+# ====================================================================
+# --- VERSIÓN ASÍNCRONA (asyncio) ---
+# ====================================================================
+
+class AsyncArchNino(EnvoltorioAsincrono):
+    """ArchNino con métodos awaitable (E/S y parseo fuera del event loop)."""
+    lecturas = ("listar", "leer", "buscar_por_ci", "contarNinosAdecuados", "mostrarNinosNoAdecuados",
+                "determinarPromedioEdad", "mostrarNinosTallaMasAlta")
+    mutaciones = ("crearArchivo", "guardar", "guardarMuchos")
+    carga = "listar"
@@ -1,26 +1,29 @@
-import json
 import os
-from typing import List, Optional, Dict, Any
-from datetime import datetime
-
-# --- Helpers de Persistencia JSON ---
-def _cargar_data(nombre_archivo: str) -> List[Dict[str, Any]]:
-    """Carga datos crudos (lista de diccionarios) desde un archivo JSON."""
-    if not os.path.exists(nombre_archivo):
-        return []
-    try:
-        with open(nombre_archivo, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError, IOError):
-        return []
-
-def _guardar_data(nombre_archivo: str, data: List[Dict[str, Any]]) -> None:
-    """Guarda una lista de diccionarios a un archivo JSON."""
-    try:
-        with open(nombre_archivo, 'w') as f:
-            json.dump(data, f, indent=4)
-    except Exception as e:
-        print(f" Error al guardar en {nombre_archivo}: {e}")
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Tuple
+from datetime import date, datetime
+
+# --- Persistencia compartida (carpeta PERSISTENCIA/almacenamiento) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from almacenamiento import (Backend, BackendJSON, BloqueoArchivo, CacheArchivos, EnvoltorioAsincrono, bloqueo_escritura,
+                            bloqueo_lectura, cargar_data, firma_archivo, iterar_data, guardar_data)
+
+
+@lru_cache(maxsize=4096)
+def ordinal_fecha(fecha: str) -> int:
+    """Fecha 'YYYY-MM-DD' como número de día (date.toordinal); ValueError si no es válida.
+
+    Un inventario repite pocas fechas distintas: con el cache cada una se
+    convierte una sola vez. fromisoformat es mucho más rápido que strptime y
+    da lo mismo para el formato exacto; el resto (p. ej. '2024-1-5', que
+    strptime también acepta) pasa por strptime.
+    """
+    if len(fecha) == 10 and fecha[4] == '-' and fecha[7] == '-':
+        return date.fromisoformat(fecha).toordinal()
+    return datetime.strptime(fecha, '%Y-%m-%d').toordinal()
 
 # ====================================================================
 # --- CLASE DE ENTIDAD ---
@@ -28,6 +31,7 @@ def _guardar_data(nombre_archivo: str, data: List[Dict[str, Any]]) -> None:
 
 class Alimento:
     """Representa un alimento con su nombre, fecha de vencimiento y cantidad."""
+    __slots__ = ("nombre", "fechaVencimiento", "cantidad")
     def __init__(self, nombre: str, fechaVencimiento: str, cantidad: int):
         self.nombre = nombre
         self.fechaVencimiento = fechaVencimiento # Formato 'YYYY-MM-DD'
@@ -44,40 +48,121 @@ class Alimento:
         return Alimento(data['nombre'], data['fechaVencimiento'], data['cantidad'])
     
     def esta_vencido(self) -> bool:
-        """Verifica si el alimento ya caducó (fechaVencimiento < fecha actual)."""
+        """Verifica si el alimento ya caducó (fechaVencimiento < fecha actual, o sea hoy o antes)."""
         try:
-            fecha_venc = datetime.strptime(self.fechaVencimiento, '%Y-%m-%d')
-            return fecha_venc < datetime.now()
+            return ordinal_fecha(self.fechaVencimiento) <= date.today().toordinal()
         except ValueError:
             print(f" Error de formato de fecha en {self.nombre}. Asumiendo no vencido.")
             return False
 
+# ====================================================================
+# --- COLUMNA DE VENCIMIENTOS ---
+# ====================================================================
+
+class ColumnaVencimientos:
+    """Fechas de vencimiento de una versión del archivo, ya convertidas a número de día.
+
+    Se arma una vez por versión del archivo (firma) y valida todas las fechas de
+    una vez: las que no se pueden leer quedan en 'invalidos'. Las válidas quedan
+    en dos arreglos paralelos ordenados por fecha (día y posición del alimento),
+    así "vencidos antes de X" es un bisect y no una conversión por alimento.
+    """
+
+    def __init__(self, alimentos: List[Alimento], firma: Optional[Tuple[int, int]]):
+        self.alimentos = alimentos
+        self.firma = firma
+        self.invalidos: List[Alimento] = []
+        filas = []
+        for i, a in enumerate(alimentos):
+            try:
+                filas.append((ordinal_fecha(a.fechaVencimiento), i))
+            except (ValueError, TypeError):
+                self.invalidos.append(a)
+        filas.sort()
+        self.dias = array('l', [d for d, _ in filas])
+        self.posiciones = array('l', [i for _, i in filas])
+
+    def antes_de(self, dia: int) -> List[Alimento]:
+        """Alimentos que vencen antes del día dado (sin incluirlo), en el orden del archivo."""
+        return self._primeros(bisect_left(self.dias, dia))
+
+    def hasta(self, dia: int) -> List[Alimento]:
+        """Alimentos que vencen el día dado o antes, en el orden del archivo."""
+        return self._primeros(bisect_right(self.dias, dia))
+
+    def _primeros(self, n: int) -> List[Alimento]:
+        return [self.alimentos[i] for i in sorted(self.posiciones[:n])]
+
+
 # ====================================================================
 # --- CLASE DE ARCHIVO (GESTORA) ---
 # ====================================================================
 
 class ArchRefri:
     """Gestiona la lista de Alimentos en el refrigerador mediante un archivo JSON."""
-    def __init__(self, nombre: str):
+    def __init__(self, nombre: str, backend: Optional[Backend] = None,
+                 cache: Optional[CacheArchivos] = None, bloqueo: bool = False):
         self.nombre = nombre # Nombre del archivo
+        self.backend = backend or BackendJSON() # Formato en disco (JSON con sangría por defecto)
+        self.cache = cache # Cache opcional de objetos ya parseados (compartible entre gestores)
+        self.bloqueo = BloqueoArchivo.para(nombre) if bloqueo else None # Bloqueo entre procesos (<archivo>.lock)
+        self._columna: Optional[ColumnaVencimientos] = None # Vencimientos de la última versión leída
 
+    @bloqueo_escritura
     def crearArchivo(self):
-        _guardar_data(self.nombre, [])
+        self._guardar_lista([])
         print(f" Archivo '{self.nombre}' creado.")
 
+    @bloqueo_lectura
     def listar(self) -> List[Alimento]:
-        data = _cargar_data(self.nombre)
+        if self.cache is not None:
+            return self.cache.obtener(self.nombre, self._leer_alimentos)
+        return self._leer_alimentos()
+
+    def _leer_alimentos(self) -> List[Alimento]:
+        """Lee y parsea el archivo completo (sin pasar por el cache)."""
+        data = cargar_data(self.nombre, self.backend)
         return [Alimento.from_dict(d) for d in data]
 
-    def _guardar_lista(self, alimentos: List[Alimento]) -> None:
+    @bloqueo_lectura
+    def vencimientos(self) -> ColumnaVencimientos:
+        """Columna de vencimientos al día con el archivo (se rearma solo si el archivo cambió)."""
+        firma = firma_archivo(self.nombre)
+        if self._columna is None or firma is None or self._columna.firma != firma:
+            self._columna = ColumnaVencimientos(self.listar(), firma)
+        return self._columna
+
+    def iterar(self) -> Iterator[Alimento]:
+        """Recorre los alimentos de a uno sin armar la lista completa (memoria constante)."""
+        en_cache = self.cache.vigente(self.nombre) if self.cache is not None else None
+        if en_cache is not None:
+            yield from en_cache
+            return
+        for d in iterar_data(self.nombre, self.backend):
+            yield Alimento.from_dict(d)
+
+    def _guardar_lista(self, alimentos: List[Alimento]) -> bool:
         """Guarda la lista completa de alimentos al archivo JSON."""
-        _guardar_data(self.nombre, [a.to_dict() for a in alimentos])
+        ok = guardar_data(self.nombre, [a.to_dict() for a in alimentos], self.backend)
+        self._columna = None
+        if not ok:
+            self._descartar_cache()
+        elif self.cache is not None:
+            self.cache.recordar(self.nombre, alimentos)
+        return ok
+
+    def _descartar_cache(self) -> None:
+        """Olvida los objetos en cache de este archivo (p. ej. si una modificación se cortó antes de guardar)."""
+        self._columna = None
+        if self.cache is not None:
+            self.cache.invalidar(self.nombre)
 
     # --- IMPLEMENTACIÓN DE LOS PUNTOS DEL EJERCICIO 8 ---
 
     # a) Implementar los métodos para Crear, Modificar por nombre y Eliminar por nombre
     
     # a.1) Crear/Guardar (función análoga a 'guardarProducto' o 'adicionar')
+    @bloqueo_escritura
     def guardarAlimento(self, alimento: Alimento):
         """Añade un alimento. Si el nombre ya existe, lo modifica sumando la cantidad."""
         alimentos = self.listar()
@@ -85,10 +170,11 @@ class ArchRefri:
         
         for a in alimentos:
             if a.nombre.lower() == alimento.nombre.lower():
-                # Si existe, actualiza cantidad y fecha (si la nueva es más lejana)
-                a.cantidad += alimento.cantidad
-                if datetime.strptime(alimento.fechaVencimiento, '%Y-%m-%d') > datetime.strptime(a.fechaVencimiento, '%Y-%m-%d'):
+                # Si existe, actualiza cantidad y fecha (si la nueva es más lejana);
+                # las fechas se comparan antes de tocar nada: si una es inválida no queda a medias
+                if ordinal_fecha(alimento.fechaVencimiento) > ordinal_fecha(a.fechaVencimiento):
                     a.fechaVencimiento = alimento.fechaVencimiento
+                a.cantidad += alimento.cantidad
                 encontrado = True
                 print(f" Alimento '{alimento.nombre}' actualizado. Nueva cantidad: {a.cantidad}")
                 break
@@ -99,7 +185,36 @@ class ArchRefri:
 
         self._guardar_lista(alimentos)
 
+    @bloqueo_escritura
+    def guardarMuchos(self, nuevos: Iterable[Alimento]) -> Dict[str, Any]:
+        """Añade un lote de alimentos con una sola carga y una sola escritura.
+
+        Igual que guardarAlimento, un nombre repetido (en el archivo o en el lote)
+        suma su cantidad y conserva la fecha más lejana. Retorna
+        {"añadidos": n, "actualizados": [nombres]} en lugar de imprimir cada caso.
+        """
+        alimentos = self.listar()
+        por_nombre: Dict[str, Alimento] = {}
+        for a in alimentos:
+            por_nombre.setdefault(a.nombre.lower(), a)  # como guardarAlimento: manda la primera coincidencia
+        añadidos, actualizados = 0, []
+        for alimento in nuevos:
+            a = por_nombre.get(alimento.nombre.lower())
+            if a is None:
+                alimentos.append(alimento)
+                por_nombre[alimento.nombre.lower()] = alimento
+                añadidos += 1
+                continue
+            if ordinal_fecha(alimento.fechaVencimiento) > ordinal_fecha(a.fechaVencimiento):
+                a.fechaVencimiento = alimento.fechaVencimiento
+            a.cantidad += alimento.cantidad
+            actualizados.append(alimento.nombre)
+        if (añadidos or actualizados) and not self._guardar_lista(alimentos):
+            añadidos, actualizados = 0, []
+        return {"añadidos": añadidos, "actualizados": actualizados}
+
     # a.2) Modificar por nombre
+    @bloqueo_escritura
     def modificarAlimento(self, nombre_antiguo: str, nuevo_nombre: Optional[str] = None, nueva_cantidad: Optional[int] = None, nueva_fecha: Optional[str] = None) -> bool:
         """Modifica los atributos de un alimento buscando por su nombre."""
         alimentos = self.listar()
@@ -114,7 +229,7 @@ class ArchRefri:
                 if nueva_fecha is not None:
                     # Validar formato de fecha simple 'YYYY-MM-DD'
                     try:
-                        datetime.strptime(nueva_fecha, '%Y-%m-%d')
+                        ordinal_fecha(nueva_fecha)
                         a.fechaVencimiento = nueva_fecha
                     except ValueError:
                         print(f" Formato de fecha '{nueva_fecha}' inválido. No se modificó la fecha.")
@@ -128,6 +243,7 @@ class ArchRefri:
         return False
 
     # a.3) Eliminar por nombre
+    @bloqueo_escritura
     def eliminarAlimento(self, nombre_x: str) -> bool:
         """Elimina un alimento del archivo buscando por su nombre."""
         alimentos = self.listar()
@@ -146,27 +262,17 @@ class ArchRefri:
     # b) Mostrar los alimentos que caducaron antes de una fecha dada X
     def mostrarAlimentosCaducadosAntesDe(self, fecha_limite_str: str) -> List[Alimento]:
         """Retorna alimentos cuya fecha de vencimiento es ANTERIOR a la fecha límite X."""
-        alimentos = self.listar()
-        
         try:
-            fecha_limite = datetime.strptime(fecha_limite_str, '%Y-%m-%d')
+            fecha_limite = ordinal_fecha(fecha_limite_str)
         except ValueError:
             print(" Formato de fecha límite debe ser 'YYYY-MM-DD'.")
             return []
-
-        alimentos_caducados = []
-        for a in alimentos:
-            try:
-                fecha_venc = datetime.strptime(a.fechaVencimiento, '%Y-%m-%d')
-                # Un alimento caducó ANTES de la fecha límite si su fecha de vencimiento es anterior (menor)
-                if fecha_venc < fecha_limite:
-                    alimentos_caducados.append(a)
-            except ValueError:
-                continue # Ignora alimentos con formato de fecha incorrecto
-                
-        return alimentos_caducados
+        # Un alimento caducó ANTES de la fecha límite si su fecha de vencimiento es anterior (menor);
+        # los de fecha con formato incorrecto no están en la columna
+        return self.vencimientos().antes_de(fecha_limite)
 
     # c) Eliminar los alimentos que tengan cantidad 0
+    @bloqueo_escritura
     def eliminarAlimentosCantidadCero(self) -> int:
         """Elimina todos los alimentos cuya cantidad sea igual a 0."""
         alimentos = self.listar()
@@ -188,18 +294,32 @@ class ArchRefri:
 
     # d) Buscar los alimentos ya vencidos.
     def buscarAlimentosVencidos(self) -> List[Alimento]:
-        """Busca y retorna todos los alimentos cuya fecha de vencimiento ya pasó."""
-        alimentos = self.listar()
-        return [a for a in alimentos if a.esta_vencido()]
+        """Busca y retorna todos los alimentos cuya fecha de vencimiento ya pasó (hoy o antes)."""
+        columna = self.vencimientos()
+        for a in columna.invalidos:
+            print(f" Error de formato de fecha en {a.nombre}. Asumiendo no vencido.")
+        return columna.hasta(date.today().toordinal())
+
+    def alimentosConFechaInvalida(self) -> List[Alimento]:
+        """Alimentos cuya fecha de vencimiento no tiene el formato 'YYYY-MM-DD' (validados al leer el archivo)."""
+        return list(self.vencimientos().invalidos)
 
     # e) Mostrar el alimento que tenga más cantidad en el refri.
     def mostrarAlimentoMasCantidad(self) -> Optional[Alimento]:
         """Busca y retorna el alimento con la cantidad más alta."""
-        alimentos = self.listar()
-        
-        if not alimentos:
-            return None
-        
-        # Usamos la función max() con la cantidad como clave
-        alimento_mas_cantidad = max(alimentos, key=lambda a: a.cantidad)
-        return alimento_mas_cantidad
\ No newline at end of file
+        # Usamos la función max() con la cantidad como clave, directamente sobre el iterador
+        alimento_mas_cantidad = max(self.iterar(), key=lambda a: a.cantidad, default=None)
+        return alimento_mas_cantidad
+
+
+# ====================================================================
+# --- VERSIÓN ASÍNCRONA (asyncio) ---
+# ====================================================================
+
+class AsyncArchRefri(EnvoltorioAsincrono):
+    """ArchRefri con métodos awaitable (E/S y parseo fuera del event loop)."""
+    lecturas = ("listar", "mostrarAlimentosCaducadosAntesDe", "buscarAlimentosVencidos",
+                "alimentosConFechaInvalida", "mostrarAlimentoMasCantidad")
+    mutaciones = ("crearArchivo", "guardarAlimento", "guardarMuchos", "modificarAlimento", "eliminarAlimento",
+                  "eliminarAlimentosCantidadCero")
+    carga = "listar"
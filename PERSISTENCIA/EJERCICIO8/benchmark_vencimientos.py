@@ -0,0 +1,67 @@
+import os
+import random
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+
+from alimento import Alimento, ArchRefri, CacheArchivos
+from almacenamiento import medir
+
+# Uso: python benchmark_vencimientos.py [ALIMENTOS] [CONSULTAS]
+# "Vencidos antes de X" y "ya vencidos" con strptime por alimento en cada
+# consulta (como antes) contra la columna de vencimientos (número de día y
+# bisect), sobre el mismo ArchRefri con cache.
+N_ALIMENTOS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+N_CONSULTAS = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+
+def antes_de_strptime(arch, fecha_limite_str):
+    fecha_limite = datetime.strptime(fecha_limite_str, '%Y-%m-%d')
+    caducados = []
+    for a in arch.iterar():
+        try:
+            if datetime.strptime(a.fechaVencimiento, '%Y-%m-%d') < fecha_limite:
+                caducados.append(a)
+        except ValueError:
+            continue
+    return caducados
+
+
+def vencidos_strptime(arch):
+    ahora, vencidos = datetime.now(), []
+    for a in arch.iterar():
+        try:
+            if datetime.strptime(a.fechaVencimiento, '%Y-%m-%d') < ahora:
+                vencidos.append(a)
+        except ValueError:
+            continue
+    return vencidos
+
+
+if __name__ == "__main__":
+    random.seed(1)
+    hoy = date.today()
+    limites = [(hoy + timedelta(days=random.randrange(-365, 365))).isoformat() for _ in range(N_CONSULTAS)]
+    with tempfile.TemporaryDirectory() as carpeta:
+        arch = ArchRefri(os.path.join(carpeta, "arch_refri.json"), cache=CacheArchivos())
+        arch._guardar_lista([Alimento(f"Alimento{i}", (hoy + timedelta(days=random.randrange(-730, 730))).isoformat(), i)
+                             for i in range(N_ALIMENTOS)])
+        arch.listar()  # el cache ya tiene los objetos: se mide solo el trabajo con las fechas
+
+        t_columna, _ = medir(arch.vencimientos)
+        consultas = iter(limites * 2)
+        filas = [
+            ("antes de X, strptime", medir(lambda: antes_de_strptime(arch, next(consultas)), N_CONSULTAS)),
+            ("antes de X, columna", medir(lambda: arch.mostrarAlimentosCaducadosAntesDe(next(consultas)), N_CONSULTAS)),
+            ("ya vencidos, strptime", medir(lambda: vencidos_strptime(arch), 5)),
+            ("ya vencidos, columna", medir(arch.buscarAlimentosVencidos, 5)),
+        ]
+        assert [a.nombre for a in antes_de_strptime(arch, limites[0])] == \
+               [a.nombre for a in arch.mostrarAlimentosCaducadosAntesDe(limites[0])]
+        assert vencidos_strptime(arch) == arch.buscarAlimentosVencidos()
+
+    print(f"{N_ALIMENTOS:,} alimentos (en cache); armar la columna de vencimientos: {t_columna * 1000:.0f} ms "
+          f"(una vez por versión del archivo)")
+    print(f"{'Consulta':24} {'ms por consulta':>16} {'resultados':>11}")
+    for nombre, (t, resultado) in filas:
+        print(f"{nombre:24} {t * 1000:16.1f} {len(resultado):11,}")
@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+
+from zoo import Animal, Zoologico, ArchZoo
+from almacenamiento import BackendJSONL, medir, mejor_de
+
+# Uso: python benchmark_carga_paralela.py [ZOOLOGICOS] [ANIMALES_POR_ZOO] [PROCESOS...]
+# Carga completa (_cargar_zoologicos) de un archivo JSON Lines grande, en serie y
+# repartida en rangos de bytes entre PROCESOS procesos.
+N_ZOOLOGICOS = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+N_ANIMALES = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+PROCESOS = [int(x) for x in sys.argv[3:]] or [1, 2, 4]
+ESPECIES = ["Mamífero", "Ave", "Reptil", "Pez"]
+REPETICIONES = 3
+
+
+def preparar(ruta):
+    zoologicos = []
+    for i in range(1, N_ZOOLOGICOS + 1):
+        z = Zoologico(i, f"Zoo {i}")
+        z.animales = [Animal(ESPECIES[j % len(ESPECIES)], f"Animal{j}", 1 + j % 7) for j in range(N_ANIMALES)]
+        z.nroAnimales = len(z.animales)
+        zoologicos.append(z)
+    medir(lambda: ArchZoo(ruta, backend=BackendJSONL()).adicionarLote(zoologicos), silencioso=True)
+
+
+if __name__ == "__main__":  # Necesario para ProcessPoolExecutor con 'spawn' (Windows, macOS)
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "zoos.jsonl")
+        preparar(ruta)
+        tamano = os.path.getsize(ruta) / 2**20
+        print(f"{N_ZOOLOGICOS:,} zoológicos x {N_ANIMALES} animales, {tamano:.1f} MB, "
+              f"{os.cpu_count()} núcleos disponibles (mejor de {REPETICIONES})")
+        print(f"{'Procesos':>8} {'carga (ms)':>11} {'aceleración':>12}")
+        base, referencia = None, None
+        for procesos in PROCESOS:
+            arch = ArchZoo(ruta, backend=BackendJSONL(), procesos_carga=procesos)
+            segundos, zoologicos = mejor_de(arch._cargar_zoologicos, REPETICIONES)
+            ms = segundos * 1000
+            ids = [z.id for z in zoologicos]
+            if referencia is None:
+                referencia = ids
+            assert ids == referencia, "la carga en paralelo cambió el contenido u orden"
+            base = base or ms
+            print(f"{procesos:8} {ms:11.0f} {base / ms:11.2f}x")
@@ -0,0 +1,45 @@
+import os
+import sys
+import tempfile
+
+from zoo import Animal, Zoologico, ArchZoo
+from almacenamiento import medir_inventario, imprimir_inventario
+
+# Uso: python benchmark_inventario.py [TAMAÑOS...]
+# Mide en memoria (sin disco) armar, cargar, mover y eliminar en zoológicos grandes.
+TAMANOS = [int(x) for x in sys.argv[1:]] or [1_000, 10_000, 100_000]
+ESPECIES = ["Mamífero", "Ave", "Reptil", "Pez"]
+
+
+def animales(n, desde=0):
+    return [Animal(ESPECIES[i % len(ESPECIES)], f"Animal{i}", 1 + i % 7) for i in range(desde, desde + n)]
+
+
+def construir(n):
+    z = Zoologico(1, "Bench")
+    for a in animales(n):
+        z.adicionar_animal(a)
+    return z
+
+
+def mover(n):
+    # Destino con la mitad de los nombres de origen: esas variedades suman cantidad en vez de agregarse
+    origen = Zoologico(1, "Origen")
+    origen.animales = animales(n)
+    destino = Zoologico(2, "Destino")
+    destino.animales = animales(n, desde=n // 2)
+    return lambda: arch._mover_animales([origen, destino], 1, 2)
+
+
+def eliminar(n, paso):
+    z = Zoologico(1, "Bench")
+    z.animales = animales(n)
+    nombres = [f"Animal{i}" for i in range(0, n, paso)]
+    return lambda: [z.eliminar_animal(nombre) for nombre in nombres]
+
+
+with tempfile.TemporaryDirectory() as carpeta:
+    arch = ArchZoo(os.path.join(carpeta, "bench.json")) # Solo para _mover_animales; no se escribe
+    filas = medir_inventario(TAMANOS, construir, mover, eliminar)
+
+imprimir_inventario("Variedades", "mover", filas)
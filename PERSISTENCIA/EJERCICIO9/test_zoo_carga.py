@@ -0,0 +1,26 @@
+import json
+import os
+
+import pytest
+
+from zoo import ArchZoo
+
+# Uso: python -m pytest test_zoo_carga.py (desde EJERCICIO9)
+# Carga completa: un archivo ilegible se aparta, un registro mal formado no se oculta.
+
+
+def test_archivo_ilegible_se_respalda(tmp_path):
+    ruta = str(tmp_path / "zoos.json")
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write("[{no es json")
+    assert ArchZoo(ruta)._leer_zoologicos() == []
+    assert os.path.exists(ruta + ".corrupto")
+
+
+def test_registro_mal_formado_propaga_el_error(tmp_path):
+    ruta = str(tmp_path / "zoos.json")
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump([{"nombre": "Sin id", "animales": []}], f)
+    with pytest.raises(KeyError):
+        ArchZoo(ruta)._leer_zoologicos()
+    assert os.path.exists(ruta)
@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from zoo import Animal, ArchZoo, Zoologico
+
+# Uso: python -m pytest test_zoo_transacciones.py (desde EJERCICIO9)
+# Un commit confirmado en el .wal que no llegó al archivo no se pierde.
+
+
+@pytest.fixture
+def arch(tmp_path):
+    origen, destino = Zoologico(1, "Origen"), Zoologico(2, "Destino")
+    origen.adicionar_animal(Animal("Ave", "Cóndor", 2))
+    arch = ArchZoo(str(tmp_path / "zoos.json"))
+    arch.adicionarLote([origen, destino])
+    return arch
+
+
+def nombres(arch, zoo_id):
+    return [a.nombre for a in arch.buscar_por_id(zoo_id).animales]
+
+
+def commit_sin_guardar(arch, monkeypatch):
+    arch.begin()
+    assert arch.moverAnimales(1, 2)
+    with monkeypatch.context() as m:
+        m.setattr(arch, "_guardar_lista", lambda zoologicos: False)
+        assert arch.commit() is False
+    assert os.path.exists(arch.wal.ruta_wal)
+
+
+def test_commit_sin_guardar_se_reaplica_al_reabrir(arch, monkeypatch):
+    commit_sin_guardar(arch, monkeypatch)
+    otro = ArchZoo(arch.nombre)
+    assert nombres(otro, 1) == []
+    assert nombres(otro, 2) == ["Cóndor"]
+    assert not os.path.exists(arch.wal.ruta_wal)
+
+
+def test_begin_no_pisa_un_commit_sin_guardar(arch, monkeypatch):
+    commit_sin_guardar(arch, monkeypatch)
+    arch.begin()
+    arch.rollback()
+    assert nombres(arch, 2) == ["Cóndor"]
+    assert not os.path.exists(arch.wal.ruta_wal)
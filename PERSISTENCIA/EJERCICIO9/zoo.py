@@ -1,25 +1,13 @@
-import json
 import os
-from typing import List, Optional, Dict, Any
-
-# --- Helpers de Persistencia JSON ---
-def _cargar_data(nombre_archivo: str) -> List[Dict[str, Any]]:
-    """Carga datos crudos (lista de diccionarios) desde un archivo JSON."""
-    if not os.path.exists(nombre_archivo):
-        return []
-    try:
-        with open(nombre_archivo, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError, IOError):
-        return []
-
-def _guardar_data(nombre_archivo: str, data: List[Dict[str, Any]]) -> None:
-    """Guarda una lista de diccionarios a un archivo JSON."""
-    try:
-        with open(nombre_archivo, 'w') as f:
-            json.dump(data, f, indent=4)
-    except Exception as e:
-        print(f" Error al guardar en {nombre_archivo}: {e}")
+import sys
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Tuple
+
+# --- Persistencia compartida (carpeta PERSISTENCIA/almacenamiento) ---
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from almacenamiento import (Backend, BackendJSON, BloqueoArchivo, CacheArchivos, EnvoltorioAsincrono, ErrorAlmacenamiento,
+                            IndicePrimario, RegistroTransacciones, bloqueo_escritura, bloqueo_lectura,
+                            agregar_registros, cargar_paralelo, iterar_data, guardar_data, respaldar_corrupto,
+                            separar_duplicados)
 
 # ====================================================================
 # --- CLASE 1: ANIMAL ---
@@ -27,6 +15,7 @@ def _guardar_data(nombre_archivo: str, data: List[Dict[str, Any]]) -> None:
 
 class Animal:
     """Representa un grupo de animales de una especie en un zoológico."""
+    __slots__ = ("especie", "nombre", "cantidad")
     def __init__(self, especie: str, nombre: str, cantidad: int):
         self.especie = especie # Ej: Mamífero, Ave, Reptil
         self.nombre = nombre   # Ej: León, Águila, Serpiente
@@ -47,7 +36,12 @@ class Animal:
 # ====================================================================
 
 class Zoologico:
-    """Representa un zoológico con su inventario de animales."""
+    """Representa un zoológico con su inventario de animales.
+
+    El inventario se cambia con los métodos o reasignando la lista completa
+    (no con append directo), así el índice por nombre queda al día.
+    """
+    __slots__ = ("id", "nombre", "nroAnimales", "_animales", "_por_nombre")
     def __init__(self, id: int, nombre: str):
         self.id = id
         self.nombre = nombre
@@ -58,26 +52,45 @@ class Zoologico:
         total_individuos = sum(a.cantidad for a in self.animales)
         return f"Zoologico(ID: {self.id}, Nombre: {self.nombre}, Variedades: {self.nroAnimales}, Total Indiv: {total_individuos})"
 
+    @property
+    def animales(self) -> List[Animal]:
+        return self._animales
+
+    @animales.setter
+    def animales(self, animales: List[Animal]) -> None:
+        """Reemplaza el inventario y rearma el índice nombre (minúsculas) -> Animal."""
+        self._animales = animales
+        # reversed: con nombres repetidos en el archivo gana el primero, como en la búsqueda lineal
+        self._por_nombre: Dict[str, Animal] = {a.nombre.lower(): a for a in reversed(animales)}
+
     def adicionar_animal(self, a: Animal):
         """Añade una variedad de animal o actualiza la cantidad si ya existe por nombre."""
-        encontrado = False
-        for animal in self.animales:
-            if animal.nombre.lower() == a.nombre.lower():
-                animal.cantidad += a.cantidad
-                encontrado = True
-                break
-        
-        if not encontrado:
-            self.animales.append(a)
-            self.nroAnimales = len(self.animales)
+        animal = self._por_nombre.get(a.nombre.lower())
+        if animal is not None:
+            animal.cantidad += a.cantidad
+        else:
+            self._animales.append(a)
+            self._por_nombre[a.nombre.lower()] = a
+            self.nroAnimales = len(self._animales)
+
+    def eliminar_animal(self, nombre_animal: str) -> Optional[Animal]:
+        """Quita la variedad con ese nombre y la retorna (None si no estaba)."""
+        clave = nombre_animal.lower()
+        a = self._por_nombre.pop(clave, None)
+        if a is None:
+            return None
+        self._animales.remove(a)
+        if len(self._animales) > len(self._por_nombre): # Hay nombres repetidos (archivo editado a mano)
+            otro = next((x for x in self._animales if x.nombre.lower() == clave), None)
+            if otro is not None:
+                self._por_nombre[clave] = otro
+        self.nroAnimales = len(self._animales)
+        return a
 
     # Métodos auxiliares
     def obtener_variedad_por_nombre(self, nombre_animal: str) -> Optional[Animal]:
         """Busca una variedad de animal por su nombre."""
-        for a in self.animales:
-            if a.nombre.lower() == nombre_animal.lower():
-                return a
-        return None
+        return self._por_nombre.get(nombre_animal.lower())
     
     def obtener_animales_por_especie(self, especie_x: str) -> List[Animal]:
         """Retorna todos los animales que pertenecen a una especie dada."""
@@ -105,42 +118,102 @@ class Zoologico:
 
 class ArchZoo:
     """Gestiona el archivo JSON que contiene la lista de Zoologicos."""
-    def __init__(self, nombre: str):
+    def __init__(self, nombre: str, backend: Optional[Backend] = None,
+                 cache: Optional[CacheArchivos] = None, indexado: bool = False, bloqueo: bool = False,
+                 procesos_carga: int = 1):
         self.nombre = nombre # Nombre del archivo
+        self.backend = backend or BackendJSON() # Formato en disco (JSON con sangría por defecto)
+        self.cache = cache # Cache opcional de objetos ya parseados (compartible entre gestores)
+        self.indice = IndicePrimario(nombre, "id", self.backend) if indexado else None # Índice persistente por id (.idx)
+        self.bloqueo = BloqueoArchivo.para(nombre) if bloqueo else None # Bloqueo entre procesos (<archivo>.lock)
+        self.procesos_carga = procesos_carga # >1 con BackendJSONL: la carga completa se reparte entre procesos
+        self.wal = RegistroTransacciones(nombre) # Registro de transacciones (<archivo>.wal)
+        self._tx: Optional[List[Zoologico]] = None # Zoológicos de la transacción abierta (begin)
+        self._recuperar()
 
+    @bloqueo_lectura
     def _cargar_zoologicos(self) -> List[Zoologico]:
         """Carga la lista de Zoologicos desde el archivo JSON."""
         if not os.path.exists(self.nombre):
             self.crearArchivo()
 
+        if self.cache is not None:
+            return self.cache.obtener(self.nombre, self._leer_zoologicos)
+        return self._leer_zoologicos()
+
+    def _leer_zoologicos(self) -> List[Zoologico]:
+        """Lee y parsea el archivo completo (sin pasar por el cache).
+
+        Un registro mal formado (p. ej. sin "id") no se oculta: la excepción sigue.
+        """
         try:
-            data = _cargar_data(self.nombre)
-            return [Zoologico.from_dict(d) for d in data]
-        except Exception:
+            # Con procesos_carga=1 (o sin BackendJSONL) cargar_paralelo carga en este proceso
+            return cargar_paralelo(self.nombre, Zoologico.from_dict, self.procesos_carga, self.backend)
+        except ErrorAlmacenamiento:
+            # Archivo ilegible: se aparta para que el próximo guardado no lo pise
+            respaldar_corrupto(self.nombre)
             return []
+        except OSError as e:
+            print(f" Error al cargar zoológicos del archivo: {e}. Retornando lista vacía.")
+            return []
+
+    def iterar(self) -> Iterator[Zoologico]:
+        """Recorre los zoológicos de a uno sin armar la lista completa (memoria constante)."""
+        en_cache = self.cache.vigente(self.nombre) if self.cache is not None else None
+        if en_cache is not None:
+            yield from en_cache
+            return
+        for d in iterar_data(self.nombre, self.backend):
+            yield Zoologico.from_dict(d)
 
-    def _guardar_lista(self, zoologicos: List[Zoologico]) -> None:
+    def _guardar_lista(self, zoologicos: List[Zoologico]) -> bool:
         """Guarda la lista completa de Zoologicos al archivo JSON."""
-        _guardar_data(self.nombre, [z.to_dict() for z in zoologicos])
+        ok = guardar_data(self.nombre, [z.to_dict() for z in zoologicos], self.backend)
+        if not ok:
+            self._descartar_cache()
+        elif self.cache is not None:
+            self.cache.recordar(self.nombre, zoologicos)
+        if ok and self.indice is not None:
+            self.indice.registrar_claves(z.id for z in zoologicos)
+        return ok
+
+    def _descartar_cache(self) -> None:
+        """Olvida los objetos en cache de este archivo (p. ej. si una modificación se cortó antes de guardar)."""
+        if self.cache is not None:
+            self.cache.invalidar(self.nombre)
 
     # Métodos auxiliares y del diagrama
+    @bloqueo_escritura
     def crearArchivo(self) -> None:
         """Inicializa el archivo JSON con una lista vacía de zoológicos."""
-        _guardar_data(self.nombre, [])
+        self._guardar_lista([])
         print(f"✅ Archivo '{self.nombre}' creado.")
 
     def buscar_por_id(self, zoo_id: int) -> Optional[Zoologico]:
         """Busca un zoológico por su ID."""
-        zoologicos = self._cargar_zoologicos()
-        return next((z for z in zoologicos if z.id == zoo_id), None)
+        if self.indice is not None:
+            data = self.indice.buscar(zoo_id)
+            return Zoologico.from_dict(data) if data else None
+        return next((z for z in self.iterar() if z.id == zoo_id), None)
 
     # --- IMPLEMENTACIÓN DE LOS PUNTOS DEL EJERCICIO 9 ---
 
     # a) Implementar los métodos crear, modificar y eliminar de ArchZoo
     
     # a.1) Crear (adicionar)
+    @bloqueo_escritura
     def adicionar(self, z: Zoologico) -> None:
         """Añade un nuevo zoológico al archivo, verificando ID único."""
+        # Con índice el duplicado se detecta en O(1) y el zoológico se agrega al final, sin cargar el archivo
+        if self.indice is not None:
+            if self.indice.contiene(z.id):
+                print(f"⚠️ Zoológico con ID {z.id} ya existe. No se añadió.")
+                return
+            if not agregar_registros(self.nombre, [z], self.backend, self.indice, self.cache):
+                return # agregar_registros ya informó el error
+            print(f"➕ Zoológico '{z.nombre}' (ID: {z.id}) añadido con éxito.")
+            return
+
         zoologicos = self._cargar_zoologicos()
         if any(zoo.id == z.id for zoo in zoologicos):
             print(f"⚠️ Zoológico con ID {z.id} ya existe. No se añadió.")
@@ -150,7 +223,26 @@ class ArchZoo:
         self._guardar_lista(zoologicos)
         print(f"➕ Zoológico '{z.nombre}' (ID: {z.id}) añadido con éxito.")
 
+    @bloqueo_escritura
+    def adicionarLote(self, zoologicos: Iterable[Zoologico]) -> Dict[str, Any]:
+        """Guarda un lote de zoológicos con una sola carga y una sola escritura.
+
+        Los duplicados (id ya existente o repetido en el lote) no se imprimen:
+        vuelven en el reporte {"guardados": n, "duplicados": [ids]}.
+        """
+        if self.indice is not None:
+            nuevos, reporte = separar_duplicados(zoologicos, self.indice.claves(), lambda x: x.id)
+            if nuevos and not agregar_registros(self.nombre, nuevos, self.backend, self.indice, self.cache):
+                reporte["guardados"] = 0
+            return reporte
+        actuales = self._cargar_zoologicos()
+        nuevos, reporte = separar_duplicados(zoologicos, {x.id for x in actuales}, lambda x: x.id)
+        if nuevos and not self._guardar_lista(actuales + nuevos):
+            reporte["guardados"] = 0
+        return reporte
+
     # a.2) Modificar (modifica el nombre del zoológico por su ID)
+    @bloqueo_escritura
     def modificar(self, zoo_id: int, nuevo_nombre: str) -> bool:
         """Modifica el nombre del zoológico identificado por su ID."""
         zoologicos = self._cargar_zoologicos()
@@ -171,6 +263,7 @@ class ArchZoo:
             return False
 
     # a.3) Eliminar
+    @bloqueo_escritura
     def eliminar(self, zoo_id: int) -> bool:
         """Elimina un zoológico del archivo buscando por su ID."""
         zoologicos = self._cargar_zoologicos()
@@ -189,18 +282,18 @@ class ArchZoo:
     # b) Listar los zoológicos que contengan mayor cantidad variedad de animales
     def listarZoologicosMayorVariedad(self) -> List[Zoologico]:
         """Retorna los zoológicos con la máxima cantidad de variedades de animales (nroAnimales)."""
-        zoologicos = self._cargar_zoologicos()
-        
-        if not zoologicos:
-            return []
-            
-        # 1. Encontrar la cantidad máxima de variedades
-        max_variedades = max(z.nroAnimales for z in zoologicos)
-        
-        # 2. Filtrar todos los zoológicos que igualan esa cantidad máxima
-        return [z for z in zoologicos if z.nroAnimales == max_variedades]
+        # Una sola pasada: se guardan solo los empatados con el máximo visto hasta ahora
+        max_variedades: Optional[int] = None
+        mayores: List[Zoologico] = []
+        for z in self.iterar():
+            if max_variedades is None or z.nroAnimales > max_variedades:
+                max_variedades, mayores = z.nroAnimales, [z]
+            elif z.nroAnimales == max_variedades:
+                mayores.append(z)
+        return mayores
 
     # c) Listar los zoológicos vacíos y eliminarlos
+    @bloqueo_escritura
     def listarZoologicosVaciosYEliminar(self) -> List[Zoologico]:
         """Identifica los zoológicos que tienen 0 variedades de animales y los elimina."""
         zoologicos_actuales = self._cargar_zoologicos()
@@ -221,10 +314,9 @@ class ArchZoo:
     # d) Mostrar a los animales de la especie x.
     def mostrarAnimalesPorEspecie(self, especie_x: str) -> Dict[int, List[Animal]]:
         """Retorna un diccionario de {ID_Zoo: Lista de Animales} de la especie x."""
-        zoologicos = self._cargar_zoologicos()
         resultados = {}
         
-        for z in zoologicos:
+        for z in self.iterar():
             animales_especie = z.obtener_animales_por_especie(especie_x)
             if animales_especie:
                 resultados[z.id] = animales_especie
@@ -233,13 +325,43 @@ class ArchZoo:
 
     # e) Mover los animales de un zoológico x a un zoológico y.
     # Interpretación: Mover *TODAS* las variedades de animales del zoo x al zoo y.
+    @bloqueo_escritura
     def moverAnimales(self, id_origen: int, id_destino: int) -> bool:
-        """Mueve todas las variedades de animales del zoológico de origen al de destino."""
+        """Mueve todas las variedades de animales del zoológico de origen al de destino.
+
+        Dentro de una transacción (begin) el cambio queda en memoria y en el .wal
+        hasta el commit; fuera de ella se guarda en el acto.
+        """
         if id_origen == id_destino:
             print(" Los IDs de origen y destino no pueden ser iguales.")
             return False
 
-        zoologicos = self._cargar_zoologicos()
+        zoologicos = self._tx if self._tx is not None else self._cargar_zoologicos()
+        resultado = self._mover_animales(zoologicos, id_origen, id_destino)
+        
+        if resultado is None:
+            print(" Uno o ambos zoológicos no fueron encontrados.")
+            return False
+
+        z_origen, z_destino, movidos = resultado
+        if not movidos:
+            print(f" Zoológico '{z_origen.nombre}' está vacío. Nada que mover.")
+            return False
+        
+        # 3. Guardar la lista actualizada (o anotar el movimiento en la transacción)
+        if self._tx is not None:
+            self.wal.registrar({"op": "moverAnimales", "origen": id_origen, "destino": id_destino})
+        else:
+            self._guardar_lista(zoologicos)
+        print(f" Se movieron {movidos} variedades de animales de '{z_origen.nombre}' (ID: {id_origen}) a '{z_destino.nombre}' (ID: {id_destino}).")
+        return True
+
+    def _mover_animales(self, zoologicos: List[Zoologico], id_origen: int,
+                        id_destino: int) -> Optional[Tuple[Zoologico, Zoologico, int]]:
+        """Aplica el movimiento sobre la lista en memoria.
+
+        Retorna (origen, destino, variedades movidas), o None si falta algún zoológico.
+        """
         z_origen: Optional[Zoologico] = None
         z_destino: Optional[Zoologico] = None
         
@@ -250,14 +372,9 @@ class ArchZoo:
                 z_destino = z
         
         if not z_origen or not z_destino:
-            print(" Uno o ambos zoológicos no fueron encontrados.")
-            return False
+            return None
 
         animales_a_mover = z_origen.animales.copy()
-        
-        if not animales_a_mover:
-            print(f" Zoológico '{z_origen.nombre}' está vacío. Nada que mover.")
-            return False
             
         # 1. Mover: Adicionar al destino
         for a in animales_a_mover:
@@ -266,8 +383,65 @@ class ArchZoo:
         # 2. Vaciar el zoológico de origen
         z_origen.animales = []
         z_origen.nroAnimales = 0
-        
-        # 3. Guardar la lista actualizada
-        self._guardar_lista(zoologicos)
-        print(f" Se movieron {len(animales_a_mover)} variedades de animales de '{z_origen.nombre}' (ID: {id_origen}) a '{z_destino.nombre}' (ID: {id_destino}).")
-        return True
\ No newline at end of file
+        return z_origen, z_destino, len(animales_a_mover)
+
+    # --- Transacciones: muchos movimientos, una sola escritura ---
+    @bloqueo_escritura
+    def begin(self) -> None:
+        """Abre una transacción. Los movimientos se hacen en memoria y se anotan en '<archivo>.wal'.
+
+        Antes reaplica un commit anterior que no llegó a guardarse; si tampoco
+        ahora se puede guardar, wal.iniciar() se niega en vez de pisarlo.
+        """
+        self._recuperar()
+        self.wal.iniciar()
+        self._tx = self._leer_zoologicos() # Copia propia: no se tocan los objetos del cache
+
+    @bloqueo_escritura
+    def commit(self) -> bool:
+        """Confirma todos los movimientos de la transacción con una sola escritura del archivo."""
+        if self._tx is None:
+            raise RuntimeError("No hay una transacción abierta.")
+        zoologicos, self._tx = self._tx, None
+        if not self.wal.confirmar():
+            print("⚠️ El archivo cambió durante la transacción. No se aplicó ningún movimiento.")
+            return False
+        if not self._guardar_lista(zoologicos):
+            self.wal.soltar()
+            return False # El .wal confirmado queda en disco y se aplica al reabrir el archivo
+        self.wal.descartar()
+        return True
+
+    @bloqueo_escritura
+    def rollback(self) -> None:
+        """Descarta todos los movimientos de la transacción abierta."""
+        self._tx = None
+        self.wal.descartar()
+
+    @bloqueo_escritura
+    def _recuperar(self) -> None:
+        """Reaplica una transacción confirmada que no llegó a guardarse (corte tras el commit)."""
+        operaciones = self.wal.pendientes()
+        if operaciones is None:
+            return
+        zoologicos = self._leer_zoologicos()
+        for op in operaciones:
+            if op["op"] == "moverAnimales":
+                self._mover_animales(zoologicos, op["origen"], op["destino"])
+        if self._guardar_lista(zoologicos):
+            self.wal.descartar()
+            print(f" Se recuperaron {len(operaciones)} movimientos confirmados de '{self.wal.ruta_wal}'.")
+        else:
+            self.wal.soltar()
+
+
+# ====================================================================
+# --- VERSIÓN ASÍNCRONA (asyncio) ---
+# ====================================================================
+
+class AsyncArchZoo(EnvoltorioAsincrono):
+    """ArchZoo con métodos awaitable (E/S y parseo fuera del event loop)."""
+    lecturas = ("buscar_por_id", "listarZoologicosMayorVariedad", "mostrarAnimalesPorEspecie")
+    mutaciones = ("crearArchivo", "adicionar", "adicionarLote", "modificar", "eliminar",
+                  "listarZoologicosVaciosYEliminar", "moverAnimales")
+    carga = "_cargar_zoologicos"
@@ -0,0 +1,34 @@
+"""Motor de almacenamiento compartido por los gestores Arch* de PERSISTENCIA.
+
+Cada ejercicio se ejecuta desde su propia carpeta, por eso los módulos que lo
+usan agregan la carpeta PERSISTENCIA al sys.path antes de importarlo.
+"""
+from .backends import (
+    Backend, BackendJSON, BackendJSONCompacto, BackendJSONL, BackendSQLite, BackendBinario,
+    ErrorAlmacenamiento, cargar_data, iterar_data, guardar_data,
+)
+from .asincrono import EnvoltorioAsincrono
+from .atomico import DURABILIDADES, escribir_atomico, respaldar_corrupto
+from .bloqueo import BloqueoArchivo, ConflictoVersion, bloqueo_escritura, bloqueo_lectura
+from .cache import CacheArchivos, firma_archivo
+from .derivado import ArchivoDerivado
+from .indice import IndiceOrdenado, IndicePrimario, posiciones_registros, recorrer_registros
+from .lotes import agregar_registros, separar_duplicados
+from .medicion import imprimir_inventario, medir, medir_inventario, mejor_de
+from .paralelo import cargar_paralelo, rangos_lineas
+from .wal import RegistroTransacciones, huella_archivo
+
+__all__ = [
+    "Backend", "BackendJSON", "BackendJSONCompacto", "BackendJSONL", "BackendSQLite", "BackendBinario",
+    "ErrorAlmacenamiento", "cargar_data", "iterar_data", "guardar_data",
+    "EnvoltorioAsincrono",
+    "DURABILIDADES", "escribir_atomico", "respaldar_corrupto",
+    "BloqueoArchivo", "ConflictoVersion", "bloqueo_escritura", "bloqueo_lectura",
+    "CacheArchivos", "firma_archivo",
+    "ArchivoDerivado",
+    "IndiceOrdenado", "IndicePrimario", "posiciones_registros", "recorrer_registros",
+    "agregar_registros", "separar_duplicados",
+    "imprimir_inventario", "medir", "medir_inventario", "mejor_de",
+    "cargar_paralelo", "rangos_lineas",
+    "RegistroTransacciones", "huella_archivo",
+]
@@ -0,0 +1,106 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# ====================================================================
+# --- ENVOLTORIOS ASÍNCRONOS ---
+# ====================================================================
+# Los gestores Arch* leen el archivo y parsean JSON en el hilo que los llama:
+# desde asyncio eso frena el event loop entero. Un envoltorio expone los
+# mismos métodos como corutinas y los ejecuta en un hilo propio del gestor.
+#
+# - Un solo hilo por envoltorio: los gestores no son seguros entre hilos
+#   (índices y caches en memoria), y así las llamadas se aplican en el orden
+#   en que se pidieron. Envoltorios distintos trabajan en paralelo. El gestor
+#   se crea en otro hilo: si guarda una conexión SQLite, tiene que abrirla
+#   con check_same_thread=False.
+# - Lecturas coalescidas: si llega una lectura igual (mismo método y mismos
+#   argumentos) a otra que todavía no terminó, y no se pidió ninguna mutación
+#   en el medio, espera el mismo resultado en lugar de cargar otra vez. Los
+#   que esperan comparten el objeto retornado: no lo modifiquen.
+# - Si el gestor tiene un CacheArchivos, antes de cada lectura se llama a su
+#   método de carga (`carga`): la primera lectura tras un cambio parsea el
+#   archivo y las siguientes, aunque sean consultas distintas, lo reutilizan.
+
+
+class EnvoltorioAsincrono:
+    """Versión awaitable de un gestor: los métodos de `lecturas` y `mutaciones` pasan a ser corutinas.
+
+    Las subclases solo declaran qué métodos del gestor son de cada tipo.
+    """
+
+    lecturas: Tuple[str, ...] = ()
+    mutaciones: Tuple[str, ...] = ()
+    carga: Optional[str] = None  # método del gestor que carga la lista completa a través de su cache
+
+    def __init__(self, gestor: Any, coalescer: bool = True):
+        self.gestor = gestor
+        self.coalescer = coalescer # False: cada lectura hace su propia carga
+        self._hilo = ThreadPoolExecutor(max_workers=1, thread_name_prefix=type(gestor).__name__)
+        self._en_curso: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._generacion = 0  # cuántas mutaciones se pidieron (una lectura solo se comparte dentro de la misma)
+        self.coalescidas = 0
+
+    def __getattr__(self, nombre: str) -> Callable[..., Any]:
+        if nombre in type(self).lecturas:
+            metodo = functools.partial(self._leer, nombre)
+        elif nombre in type(self).mutaciones:
+            metodo = functools.partial(self._mutar, nombre)
+        else:
+            raise AttributeError(f"{type(self).__name__} no expone '{nombre}'.")
+        setattr(self, nombre, metodo)  # la próxima vez no pasa por __getattr__
+        return metodo
+
+    async def _leer(self, nombre: str, *args: Any, **kwargs: Any) -> Any:
+        clave = _clave(nombre, self._generacion, args, kwargs) if self.coalescer else None
+        if clave is None:
+            return await self._ejecutar(self._con_carga(nombre), args, kwargs)
+        futuro = self._en_curso.get(clave)
+        if futuro is not None:
+            self.coalescidas += 1
+            return await asyncio.shield(futuro)
+        futuro = asyncio.ensure_future(self._ejecutar(self._con_carga(nombre), args, kwargs))
+        self._en_curso[clave] = futuro
+        futuro.add_done_callback(lambda _: self._en_curso.pop(clave, None))
+        # shield: si se cancela quien la pidió, los demás que la esperan siguen recibiendo el resultado
+        return await asyncio.shield(futuro)
+
+    async def _mutar(self, nombre: str, *args: Any, **kwargs: Any) -> Any:
+        self._generacion += 1
+        return await self._ejecutar(getattr(self.gestor, nombre), args, kwargs)
+
+    def _con_carga(self, nombre: str) -> Callable[..., Any]:
+        metodo = getattr(self.gestor, nombre)
+        if self.carga is None or getattr(self.gestor, "cache", None) is None:
+            return metodo
+        cargar = getattr(self.gestor, self.carga)
+
+        def leer(*args: Any, **kwargs: Any) -> Any:
+            cargar()  # con el cache al día es solo un stat; si no, esta es la única carga hasta el próximo cambio
+            return metodo(*args, **kwargs)
+        return leer
+
+    def _ejecutar(self, metodo: Callable[..., Any], args: Tuple[Any, ...],
+                  kwargs: Dict[str, Any]) -> "asyncio.Future[Any]":
+        return asyncio.get_running_loop().run_in_executor(self._hilo, functools.partial(metodo, *args, **kwargs))
+
+    def cerrar(self) -> None:
+        """Espera a que terminen las llamadas pendientes y libera el hilo."""
+        self._hilo.shutdown(wait=True)
+
+    async def __aenter__(self) -> "EnvoltorioAsincrono":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.cerrar)
+
+
+def _clave(nombre: str, generacion: int, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Optional[Hashable]:
+    """Clave de coalescencia, o None si algún argumento no es hasheable (esa lectura no se comparte)."""
+    clave = (nombre, generacion, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(clave)
+    except TypeError:
+        return None
+    return clave
@@ -0,0 +1,92 @@
+import os
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional, Tuple
+
+# ====================================================================
+# --- ESCRITURA ATÓMICA ---
+# ====================================================================
+# Abrir el archivo destino con 'w' lo trunca en el acto: un corte (o disco
+# lleno) a mitad del json.dump deja un archivo a medias. Aquí se escribe en
+# un temporal de la misma carpeta y se reemplaza el original con os.replace,
+# que es atómico: quien lea ve el archivo viejo completo o el nuevo completo.
+#
+# Niveles de durabilidad:
+#   "ninguna" -> escribe sobre el archivo (comportamiento original, sin protección)
+#   "flush"   -> temporal + rename: protege ante caídas del programa
+#   "fsync"   -> además fuerza a disco el temporal y la carpeta: protege ante cortes de luz
+
+DURABILIDADES = ("ninguna", "flush", "fsync")
+
+
+def validar_durabilidad(durabilidad: str) -> str:
+    if durabilidad not in DURABILIDADES:
+        raise ValueError(f"Durabilidad '{durabilidad}' inválida. Opciones: {', '.join(DURABILIDADES)}.")
+    return durabilidad
+
+
+@contextmanager
+def escribir_atomico(ruta: str, modo: str = 'w', durabilidad: str = "flush") -> Iterator[IO]:
+    """Abre un archivo para reescribirlo completo; el reemplazo ocurre solo si el bloque termina bien."""
+    validar_durabilidad(durabilidad)
+    if durabilidad == "ninguna":
+        with open(ruta, modo) as f:
+            yield f
+        return
+
+    carpeta = os.path.dirname(os.path.abspath(ruta))
+    fd, temporal = _crear_temporal(ruta, carpeta)
+    try:
+        with os.fdopen(fd, modo) as f:
+            yield f
+            f.flush()
+            if durabilidad == "fsync":
+                os.fsync(f.fileno())
+        try:
+            # Si el archivo ya existía, el reemplazo conserva sus permisos
+            os.chmod(temporal, os.stat(ruta).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    if durabilidad == "fsync":
+        sincronizar_carpeta(carpeta)
+
+
+def _crear_temporal(ruta: str, carpeta: str) -> Tuple[int, str]:
+    """Crea '.<nombre>.<azar>.tmp' junto al destino con el modo por defecto de open() (0666 menos la umask)."""
+    while True:
+        temporal = os.path.join(carpeta, f".{os.path.basename(ruta)}.{os.urandom(4).hex()}.tmp")
+        try:
+            return os.open(temporal, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666), temporal
+        except FileExistsError:
+            continue
+
+
+def sincronizar_carpeta(carpeta: str) -> None:
+    """fsync de la carpeta para que el rename también quede en disco (no existe en Windows)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(carpeta, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def respaldar_corrupto(ruta: str) -> Optional[str]:
+    """Renombra un archivo ilegible a '<ruta>.corrupto' para que el próximo guardado no lo pise.
+
+    Retorna la ruta del respaldo (o None si no se pudo mover).
+    """
+    destino, n = ruta + ".corrupto", 1
+    while os.path.exists(destino):
+        destino, n = f"{ruta}.corrupto.{n}", n + 1
+    try:
+        os.replace(ruta, destino)
+    except OSError:
+        return None
+    print(f" ⚠️ '{ruta}' estaba dañado: se movió a '{destino}' y se continúa con una lista vacía.")
+    return destino
@@ -0,0 +1,328 @@
+import json
+import os
+import pickle
+import re
+import sqlite3
+from typing import List, Dict, Any, Iterable, Iterator
+
+from .atomico import escribir_atomico, respaldar_corrupto, validar_durabilidad
+
+# ====================================================================
+# --- BACKENDS DE ALMACENAMIENTO ---
+# ====================================================================
+# Todos los gestores Arch* guardan una lista de diccionarios. Un backend
+# decide cómo se representa esa lista en disco, sin que las clases de
+# entidad (to_dict / from_dict) se enteren.
+#
+# guardar() nunca trunca el archivo en el lugar: escribe un temporal y lo
+# renombra (ver atomico.py). El nivel de durabilidad se elige por backend.
+
+
+class ErrorAlmacenamiento(IOError):
+    """El archivo existe pero su contenido no se pudo interpretar."""
+
+
+class Backend:
+    """Interfaz común: cargar y guardar una lista de diccionarios."""
+
+    durabilidad = "flush"  # "ninguna" | "flush" | "fsync" (ver atomico.py)
+
+    def cargar(self, ruta: str) -> List[Dict[str, Any]]:
+        """Retorna los registros del archivo ([] si no existe)."""
+        raise NotImplementedError
+
+    def guardar(self, ruta: str, data: List[Dict[str, Any]]) -> None:
+        """Reemplaza el contenido del archivo por la lista dada."""
+        raise NotImplementedError
+
+    def agregar(self, ruta: str, registros: Iterable[Dict[str, Any]]) -> None:
+        """Añade registros al final. Por defecto carga, extiende y guarda todo."""
+        data = self.cargar(ruta)
+        data.extend(registros)
+        self.guardar(ruta, data)
+
+    def iterar(self, ruta: str) -> Iterator[Dict[str, Any]]:
+        """Recorre los registros de a uno. Por defecto carga la lista completa."""
+        yield from self.cargar(ruta)
+
+
+_SEPARADORES_ARREGLO = re.compile(r'[\s,]*')
+
+
+class BackendJSON(Backend):
+    """Arreglo JSON con sangría (formato original de los ejercicios)."""
+
+    tam_bloque = 1 << 16  # caracteres leídos por vez al iterar
+
+    def __init__(self, indent: int = 4, durabilidad: str = "flush"):
+        self.indent = indent
+        self.durabilidad = validar_durabilidad(durabilidad)
+
+    def cargar(self, ruta: str) -> List[Dict[str, Any]]:
+        if not os.path.exists(ruta):
+            return []
+        try:
+            with open(ruta, 'r') as f:
+                return json.load(f)
+        except json.JSONDecodeError as e:
+            raise ErrorAlmacenamiento(f"JSON inválido en '{ruta}': {e}") from e
+
+    def iterar(self, ruta: str) -> Iterator[Dict[str, Any]]:
+        """Decodifica el arreglo elemento por elemento leyendo bloques fijos.
+
+        En memoria solo están el bloque actual y el registro que se está armando.
+        """
+        if not os.path.exists(ruta):
+            return
+        decodificador = json.JSONDecoder()
+        with open(ruta, 'r') as f:
+            buf, fin_archivo = f.read(self.tam_bloque), False
+            pos = _SEPARADORES_ARREGLO.match(buf).end()
+            if not buf.startswith('[', pos):
+                raise ErrorAlmacenamiento(f"JSON inválido en '{ruta}': se esperaba un arreglo")
+            pos += 1
+            while True:
+                pos = _SEPARADORES_ARREGLO.match(buf, pos).end()
+                if buf.startswith(']', pos):
+                    return
+                try:
+                    registro, pos = decodificador.raw_decode(buf, pos)
+                except json.JSONDecodeError as e:
+                    if fin_archivo:
+                        raise ErrorAlmacenamiento(f"JSON inválido en '{ruta}': {e}") from e
+                    # El registro quedó cortado entre bloques: se descarta lo leído y se agrega otro bloque
+                    bloque = f.read(self.tam_bloque)
+                    buf, pos, fin_archivo = buf[pos:] + bloque, 0, not bloque
+                    continue
+                yield registro
+
+    def guardar(self, ruta: str, data: List[Dict[str, Any]]) -> None:
+        with escribir_atomico(ruta, 'w', self.durabilidad) as f:
+            json.dump(data, f, indent=self.indent)
+
+
+class BackendJSONCompacto(BackendJSON):
+    """Arreglo JSON sin espacios: archivos más chicos y lectura/escritura más rápidas."""
+
+    def __init__(self, durabilidad: str = "flush"):
+        super().__init__(indent=None, durabilidad=durabilidad)
+
+    def guardar(self, ruta: str, data: List[Dict[str, Any]]) -> None:
+        with escribir_atomico(ruta, 'w', self.durabilidad) as f:
+            json.dump(data, f, separators=(',', ':'))
+
+
+class BackendJSONL(Backend):
+    """JSON Lines: un registro por línea. Agregar solo escribe al final del archivo."""
+
+    def __init__(self, durabilidad: str = "flush"):
+        self.durabilidad = validar_durabilidad(durabilidad)
+
+    def cargar(self, ruta: str) -> List[Dict[str, Any]]:
+        if not os.path.exists(ruta):
+            return []
+        data = []
+        with open(ruta, 'r') as f:
+            for nro, linea in enumerate(f, 1):
+                if not linea.strip():
+                    continue
+                try:
+                    data.append(json.loads(linea))
+                except json.JSONDecodeError as e:
+                    raise ErrorAlmacenamiento(f"Línea {nro} inválida en '{ruta}': {e}") from e
+        return data
+
+    def iterar(self, ruta: str) -> Iterator[Dict[str, Any]]:
+        if not os.path.exists(ruta):
+            return
+        with open(ruta, 'r') as f:
+            for nro, linea in enumerate(f, 1):
+                if not linea.strip():
+                    continue
+                try:
+                    yield json.loads(linea)
+                except json.JSONDecodeError as e:
+                    raise ErrorAlmacenamiento(f"Línea {nro} inválida en '{ruta}': {e}") from e
+
+    def guardar(self, ruta: str, data: List[Dict[str, Any]]) -> None:
+        with escribir_atomico(ruta, 'w', self.durabilidad) as f:
+            for d in data:
+                f.write(json.dumps(d, separators=(',', ':')) + "\n")
+
+    def agregar(self, ruta: str, registros: Iterable[Dict[str, Any]]) -> None:
+        # Agregar al final no trunca nada: un corte solo puede dejar la última línea a medias
+        with open(ruta, 'a') as f:
+            for d in registros:
+                f.write(json.dumps(d, separators=(',', ':')) + "\n")
+            if self.durabilidad == "fsync":
+                f.flush()
+                os.fsync(f.fileno())
+
+
+class BackendSQLite(Backend):
+    """Base SQLite (stdlib): cada registro es una fila con su JSON, en orden de inserción.
+
+    SQLite ya escribe con transacciones atómicas; la durabilidad se traduce a
+    PRAGMA synchronous (ninguna=OFF, flush=NORMAL, fsync=FULL).
+    """
+
+    _SINCRONIZACION = {"ninguna": "OFF", "flush": "NORMAL", "fsync": "FULL"}
+
+    def __init__(self, tabla: str = "registros", durabilidad: str = "flush"):
+        self.tabla = tabla
+        self.durabilidad = validar_durabilidad(durabilidad)
+
+    def _conectar(self, ruta: str) -> sqlite3.Connection:
+        con = sqlite3.connect(ruta)
+        con.execute(f"PRAGMA synchronous = {self._SINCRONIZACION[self.durabilidad]}")
+        con.execute(f"CREATE TABLE IF NOT EXISTS {self.tabla} (pos INTEGER PRIMARY KEY, datos TEXT NOT NULL)")
+        return con
+
+    def cargar(self, ruta: str) -> List[Dict[str, Any]]:
+        if not os.path.exists(ruta):
+            return []
+        try:
+            con = self._conectar(ruta)
+            try:
+                filas = con.execute(f"SELECT datos FROM {self.tabla} ORDER BY pos").fetchall()
+            finally:
+                con.close()
+            return [json.loads(fila[0]) for fila in filas]
+        except (sqlite3.DatabaseError, json.JSONDecodeError) as e:
+            raise ErrorAlmacenamiento(f"Base SQLite inválida '{ruta}': {e}") from e
+
+    def iterar(self, ruta: str) -> Iterator[Dict[str, Any]]:
+        """Recorre las filas con el cursor, sin traerlas todas a memoria."""
+        if not os.path.exists(ruta):
+            return
+        con = self._conectar(ruta)
+        try:
+            for fila in con.execute(f"SELECT datos FROM {self.tabla} ORDER BY pos"):
+                yield json.loads(fila[0])
+        except (sqlite3.DatabaseError, json.JSONDecodeError) as e:
+            raise ErrorAlmacenamiento(f"Base SQLite inválida '{ruta}': {e}") from e
+        finally:
+            con.close()
+
+    def guardar(self, ruta: str, data: List[Dict[str, Any]]) -> None:
+        con = self._conectar(ruta)
+        try:
+            with con:
+                con.execute(f"DELETE FROM {self.tabla}")
+                con.executemany(f"INSERT INTO {self.tabla} (datos) VALUES (?)",
+                                ((json.dumps(d),) for d in data))
+        finally:
+            con.close()
+
+    def agregar(self, ruta: str, registros: Iterable[Dict[str, Any]]) -> None:
+        con = self._conectar(ruta)
+        try:
+            with con:
+                con.executemany(f"INSERT INTO {self.tabla} (datos) VALUES (?)",
+                                ((json.dumps(d),) for d in registros))
+        finally:
+            con.close()
+
+
+class BackendBinario(Backend):
+    """Secuencia de registros pickle (uno tras otro). Solo para archivos propios y de confianza."""
+
+    def __init__(self, durabilidad: str = "flush"):
+        self.durabilidad = validar_durabilidad(durabilidad)
+
+    def cargar(self, ruta: str) -> List[Dict[str, Any]]:
+        if not os.path.exists(ruta):
+            return []
+        data = []
+        try:
+            with open(ruta, 'rb') as f:
+                while True:
+                    try:
+                        data.append(pickle.load(f))
+                    except EOFError:
+                        break
+        except (pickle.UnpicklingError, ValueError) as e:
+            raise ErrorAlmacenamiento(f"Archivo binario inválido '{ruta}': {e}") from e
+        return data
+
+    def iterar(self, ruta: str) -> Iterator[Dict[str, Any]]:
+        if not os.path.exists(ruta):
+            return
+        with open(ruta, 'rb') as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+                except (pickle.UnpicklingError, ValueError) as e:
+                    raise ErrorAlmacenamiento(f"Archivo binario inválido '{ruta}': {e}") from e
+
+    def guardar(self, ruta: str, data: List[Dict[str, Any]]) -> None:
+        with escribir_atomico(ruta, 'wb', self.durabilidad) as f:
+            for d in data:
+                pickle.dump(d, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def agregar(self, ruta: str, registros: Iterable[Dict[str, Any]]) -> None:
+        with open(ruta, 'ab') as f:
+            for d in registros:
+                pickle.dump(d, f, protocol=pickle.HIGHEST_PROTOCOL)
+            if self.durabilidad == "fsync":
+                f.flush()
+                os.fsync(f.fileno())
+
+
+# ====================================================================
+# --- Helpers de Persistencia (reemplazan a los _cargar_data/_guardar_data de cada ejercicio) ---
+# ====================================================================
+
+def cargar_data(nombre_archivo: str, backend: Backend = None) -> List[Dict[str, Any]]:
+    """Carga datos crudos (lista de diccionarios). Retorna [] si el archivo falta o es inválido.
+
+    Un archivo inválido se respalda como '<nombre>.corrupto' antes de retornar [],
+    así el próximo guardado no borra los datos que todavía se puedan rescatar.
+    """
+    backend = backend or BackendJSON()
+    try:
+        return backend.cargar(nombre_archivo)
+    except ErrorAlmacenamiento:
+        respaldar_corrupto(nombre_archivo)
+        return []
+    except IOError:
+        return []
+
+
+def iterar_data(nombre_archivo: str, backend: Backend = None) -> Iterator[Dict[str, Any]]:
+    """Versión en flujo de cargar_data: si el archivo falta no recorre nada.
+
+    Si es inválido desde el principio se respalda y tampoco recorre nada, como
+    cargar_data. Si falla después de haber entregado registros se relanza el
+    error (sin mover el archivo): quien acumula (sumas, promedios, máximos) no
+    debe confundir un archivo cortado con uno más corto.
+    """
+    backend = backend or BackendJSON()
+    entregados = 0
+    try:
+        for registro in backend.iterar(nombre_archivo):
+            yield registro
+            entregados += 1
+    except FileNotFoundError:
+        if entregados:
+            raise
+    except ErrorAlmacenamiento:
+        if entregados:
+            raise
+        respaldar_corrupto(nombre_archivo)
+
+
+def guardar_data(nombre_archivo: str, data: List[Dict[str, Any]], backend: Backend = None) -> bool:
+    """Guarda una lista de diccionarios con el backend dado (JSON con sangría por defecto).
+
+    Retorna False (y muestra el error) si no se pudo guardar.
+    """
+    backend = backend or BackendJSON()
+    try:
+        backend.guardar(nombre_archivo, data)
+        return True
+    except Exception as e:
+        print(f" Error al guardar en {nombre_archivo}: {e}")
+        return False
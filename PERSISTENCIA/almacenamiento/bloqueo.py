@@ -0,0 +1,177 @@
+import functools
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from .backends import ErrorAlmacenamiento
+from .cache import firma_archivo
+
+try:
+    import fcntl
+except ImportError:  # Windows: solo se excluyen los hilos del mismo proceso
+    fcntl = None
+
+# ====================================================================
+# --- BLOQUEOS ENTRE PROCESOS ---
+# ====================================================================
+# Los gestores cargan la lista, la modifican y la reescriben completa. Si dos
+# procesos lo hacen a la vez sobre el mismo archivo, el último en escribir pisa
+# el cambio del otro. Aquí cada archivo de datos tiene un "<archivo>.lock"
+# (vacío) sobre el que se toma un flock consultivo:
+#   lectura()   -> LOCK_SH: varios lectores a la vez, ningún escritor
+#   escritura() -> LOCK_EX: un solo proceso, durante todo el ciclo cargar/modificar/guardar
+# Es consultivo: solo se respeta entre gestores creados con bloqueo=True.
+# Los recorridos en flujo (iterar) no lo toman: el reemplazo atómico de
+# atomico.py ya les garantiza ver el archivo viejo completo o el nuevo.
+#
+# Dentro de un proceso hay un solo BloqueoArchivo por archivo (ver para()):
+# flock se toma por descriptor, y dos descriptores del mismo proceso se
+# bloquearían entre sí. Los hilos del proceso se turnan con un RLock.
+
+
+class ConflictoVersion(ErrorAlmacenamiento):
+    """El archivo cambió desde que se leyó la versión con la que se quería escribir."""
+
+
+class BloqueoArchivo:
+    """Bloqueo reentrante de lectura/escritura sobre un archivo de datos.
+
+    Las secciones se pueden anidar: una lectura dentro de una escritura no
+    hace nada, y una escritura dentro de una lectura convierte el flock a
+    exclusivo (como flock, sin atomicidad: otro escritor puede entrar en el
+    medio) y lo mantiene así hasta salir de la sección más externa.
+    """
+
+    _por_ruta: Dict[str, "BloqueoArchivo"] = {}
+    _registro = threading.Lock()
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self.ruta_lock = ruta + ".lock"
+        self._hilos = threading.RLock()
+        self._fd: Optional[int] = None
+        self._pid: Optional[int] = None
+        self._nivel = 0
+        self._exclusivo = False
+        self._stat_inicio: Optional[os.stat_result] = None
+
+    @classmethod
+    def para(cls, ruta: str) -> "BloqueoArchivo":
+        """El bloqueo compartido por todos los gestores del proceso sobre ese archivo."""
+        clave = os.path.abspath(ruta)
+        with cls._registro:
+            bloqueo = cls._por_ruta.get(clave)
+            if bloqueo is None:
+                bloqueo = cls._por_ruta[clave] = cls(ruta)
+            return bloqueo
+
+    def version(self) -> Optional[Tuple[int, int]]:
+        """Versión actual del archivo de datos, para una escritura optimista posterior."""
+        with self.lectura():
+            return firma_archivo(self.ruta)
+
+    @contextmanager
+    def lectura(self) -> Iterator[None]:
+        with self._hilos:
+            self._entrar(exclusivo=False)
+            try:
+                yield
+            finally:
+                self._salir()
+
+    @contextmanager
+    def escritura(self, version_esperada: Optional[Tuple[int, int]] = None) -> Iterator[None]:
+        """Sección exclusiva; con version_esperada lanza ConflictoVersion si el archivo cambió desde version()."""
+        with self._hilos:
+            self._entrar(exclusivo=True)
+            try:
+                if version_esperada is not None and _como_tupla(firma_archivo(self.ruta)) != _como_tupla(version_esperada):
+                    raise ConflictoVersion(f"'{self.ruta}' cambió desde la versión {tuple(version_esperada)}.")
+                yield
+            finally:
+                self._salir()
+
+    def _entrar(self, exclusivo: bool) -> None:
+        if self._nivel == 0:
+            self._flock(exclusivo)
+            self._exclusivo = exclusivo
+            self._stat_inicio = _stat(self.ruta) if exclusivo else None
+        elif exclusivo and not self._exclusivo:
+            self._flock(True)
+            self._exclusivo = True
+            self._stat_inicio = _stat(self.ruta)
+        self._nivel += 1
+
+    def _salir(self) -> None:
+        self._nivel -= 1
+        if self._nivel:
+            return
+        try:
+            if self._exclusivo:
+                self._marcar_cambio()
+        finally:
+            if fcntl is not None and self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._exclusivo, self._stat_inicio = False, None
+
+    def _flock(self, exclusivo: bool) -> None:
+        if fcntl is None:
+            return
+        if self._fd is None or self._pid != os.getpid():
+            # Tras un fork el descriptor heredado comparte el flock con el padre: se abre uno propio
+            self._fd, self._pid = os.open(self.ruta_lock, os.O_RDWR | os.O_CREAT, 0o666), os.getpid()
+        fcntl.flock(self._fd, fcntl.LOCK_EX if exclusivo else fcntl.LOCK_SH)
+
+    def _marcar_cambio(self) -> None:
+        """Si el archivo se reemplazó sin que cambie su firma (mismo tamaño, mismo tick de reloj),
+        adelanta el mtime 1 ns: los caches e índices validados por firma_archivo lo notan."""
+        antes, despues = self._stat_inicio, _stat(self.ruta)
+        if antes is None or despues is None or antes.st_ino == despues.st_ino:
+            return
+        if (despues.st_mtime_ns, despues.st_size) == (antes.st_mtime_ns, antes.st_size):
+            os.utime(self.ruta, ns=(despues.st_atime_ns, despues.st_mtime_ns + 1))
+
+
+def bloqueo_lectura(metodo: Callable) -> Callable:
+    """Ejecuta el método de un gestor con el bloqueo compartido de self.bloqueo (si tiene)."""
+    @functools.wraps(metodo)
+    def envuelto(self, *args, **kwargs):
+        if self.bloqueo is None:
+            return metodo(self, *args, **kwargs)
+        with self.bloqueo.lectura():
+            return metodo(self, *args, **kwargs)
+    return envuelto
+
+
+def bloqueo_escritura(metodo: Callable) -> Callable:
+    """Ejecuta el método de un gestor con el bloqueo exclusivo de self.bloqueo (si tiene).
+
+    Si el método lanza una excepción, los objetos del cache pudieron quedar a
+    medio modificar (cargar/modificar/guardar se cortó antes de guardar): se
+    llama a self._descartar_cache() si el gestor lo define.
+    """
+    @functools.wraps(metodo)
+    def envuelto(self, *args, **kwargs):
+        try:
+            if self.bloqueo is None:
+                return metodo(self, *args, **kwargs)
+            with self.bloqueo.escritura():
+                return metodo(self, *args, **kwargs)
+        except BaseException:
+            descartar = getattr(self, "_descartar_cache", None)
+            if descartar is not None:
+                descartar()
+            raise
+    return envuelto
+
+
+def _stat(ruta: str) -> Optional[os.stat_result]:
+    try:
+        return os.stat(ruta)
+    except OSError:
+        return None
+
+
+def _como_tupla(firma: Any) -> Any:
+    return tuple(firma) if firma is not None else None
@@ -0,0 +1,118 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# ====================================================================
+# --- CACHE DE OBJETOS (MAPA DE IDENTIDAD) ---
+# ====================================================================
+# Guarda en memoria la lista de objetos ya parseados de cada archivo. Solo se
+# vuelve a leer el archivo cuando cambia su firma (mtime en ns + tamaño).
+# La misma instancia puede compartirse entre varios gestores: el límite de
+# registros es global y se expulsa primero el archivo usado hace más tiempo.
+
+
+def firma_archivo(ruta: str) -> Optional[Tuple[int, int]]:
+    """Retorna (mtime_ns, tamaño) del archivo, o None si no existe."""
+    try:
+        st = os.stat(ruta)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class CacheArchivos:
+    """Cache LRU de listas de objetos por archivo, invalidada por mtime/tamaño.
+
+    Los objetos retornados se comparten entre llamadas (mapa de identidad):
+    quien los modifique debe guardarlos con su gestor para que el cache se
+    actualice.
+    """
+
+    def __init__(self, max_registros: int = 1_000_000):
+        self.max_registros = max_registros
+        self._entradas: "OrderedDict[str, Tuple[Tuple[int, int], List[Any]]]" = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+
+    def obtener(self, ruta: str, cargador: Callable[[], List[Any]]) -> List[Any]:
+        """Retorna los objetos del archivo, llamando a cargador() solo si cambió."""
+        clave = os.path.abspath(ruta)
+        firma = firma_archivo(ruta)
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and firma is not None and entrada[0] == firma:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return list(entrada[1])
+            self.fallos += 1
+
+        objetos = cargador()
+        if firma is None:
+            firma = firma_archivo(ruta)  # el cargador pudo crear el archivo
+        if firma is not None:
+            self._registrar(clave, firma, objetos)
+        return list(objetos)
+
+    def vigente(self, ruta: str) -> Optional[List[Any]]:
+        """Retorna los objetos en cache si siguen al día, sin cargar nada si no lo están."""
+        clave = os.path.abspath(ruta)
+        firma = firma_archivo(ruta)
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None or firma is None or entrada[0] != firma:
+                return None
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return list(entrada[1])
+
+    def recordar(self, ruta: str, objetos: List[Any]) -> None:
+        """Escritura a través: tras guardar un archivo, guarda su nueva lista sin releerlo."""
+        firma = firma_archivo(ruta)
+        if firma is None:
+            self.invalidar(ruta)
+            return
+        self._registrar(os.path.abspath(ruta), firma, list(objetos))
+
+    def invalidar(self, ruta: str) -> None:
+        """Descarta la entrada del archivo (si existe)."""
+        with self._lock:
+            entrada = self._entradas.pop(os.path.abspath(ruta), None)
+            if entrada is not None:
+                self._total -= len(entrada[1])
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+            self._total = 0
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Aciertos, fallos, expulsiones y ocupación actual del cache."""
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "expulsiones": self.expulsiones,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+                "archivos": len(self._entradas),
+                "registros": self._total,
+                "max_registros": self.max_registros,
+            }
+
+    def _registrar(self, clave: str, firma: Tuple[int, int], objetos: List[Any]) -> None:
+        with self._lock:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self._total -= len(anterior[1])
+            if len(objetos) > self.max_registros:
+                return  # no entra ni vaciando el cache entero
+            self._entradas[clave] = (firma, objetos)
+            self._total += len(objetos)
+            while self._total > self.max_registros:
+                _, (_, expulsados) = self._entradas.popitem(last=False)
+                self._total -= len(expulsados)
+                self.expulsiones += 1
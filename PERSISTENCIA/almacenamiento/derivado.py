@@ -0,0 +1,114 @@
+import json
+import os
+from typing import Any, Callable, Dict
+
+from .atomico import escribir_atomico
+
+# ====================================================================
+# --- ESTRUCTURAS DERIVADAS CON FIRMA ---
+# ====================================================================
+# Índices y contadores que se arman a partir de un archivo de datos y se
+# guardan en un JSON aparte ("sidecar") junto con la firma de los datos que
+# reflejan. Los gestores los actualizan en forma incremental después de cada
+# cambio ya guardado; si los datos cambiaron por otro camino, la firma no
+# coincide y se reconstruyen con una pasada sobre los datos.
+
+
+class ArchivoDerivado:
+    """Base de las estructuras derivadas guardadas en "ruta" con la firma de sus datos.
+
+    firma_datos() retorna la firma actual de los datos (None si no existen).
+    Las subclases definen _vaciar, _contar (armar todo desde los datos),
+    _a_dict y _de_dict (el contenido sin la firma).
+    """
+
+    def __init__(self, ruta: str, firma_datos: Callable[[], Any]):
+        self.ruta = ruta
+        self._firma_datos = firma_datos
+        self._firma: Any = None
+        self._cargado = False
+        self._vaciar()
+
+    def al_dia(self, firma: Any) -> bool:
+        """True si el contenido refleja la versión de los datos con esa firma."""
+        if not self._cargado:
+            self._leer()
+        return self._cargado and self._firma == _normalizar(firma)
+
+    def aplicar(self, firma_antes: Any, *cambios: Callable[[Any], None]) -> None:
+        """Aplica cambios ya guardados en los datos si el contenido estaba al día con la versión anterior.
+
+        Si no lo estaba, no se toca: la próxima consulta lo reconstruye.
+        """
+        if self.al_dia(firma_antes):
+            for cambio in cambios:
+                cambio(self)
+            self.guardar()
+
+    def reconstruir(self, *fuente: Any) -> None:
+        """Vuelve a armar todo con una pasada sobre los datos."""
+        firma = self._firma_datos()
+        self._vaciar()
+        self._contar(*fuente)
+        self._cargado = True
+        self._firma = _normalizar(firma)
+        self._escribir()
+
+    def guardar(self) -> None:
+        """Marca el contenido con la firma actual de los datos y lo escribe."""
+        self._firma = _normalizar(self._firma_datos())
+        self._escribir()
+
+    def invalidar(self) -> None:
+        """Olvida el estado en memoria (tras un cambio que no se pudo reflejar)."""
+        self._cargado, self._firma = False, None
+        self._vaciar()
+
+    def _asegurar(self) -> None:
+        firma = self._firma_datos()
+        if self.al_dia(firma):
+            return
+        self._leer()  # otro proceso pudo haberlo actualizado en disco
+        if not (self._cargado and self._firma == _normalizar(firma)):
+            self.reconstruir()
+
+    def _leer(self) -> None:
+        self._cargado, self._firma = False, None
+        if not os.path.exists(self.ruta):
+            return
+        try:
+            with open(self.ruta, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._vaciar()
+            self._de_dict(data)
+        except (OSError, ValueError, KeyError, TypeError):
+            self._vaciar()  # archivo dañado: se reconstruye
+            return
+        self._firma = data.get("firma")
+        self._cargado = True
+
+    def _escribir(self) -> None:
+        if self._firma is None:
+            return  # sin datos en disco no hay nada que reflejar
+        try:
+            with escribir_atomico(self.ruta, 'w') as f:
+                json.dump({"firma": self._firma, **self._a_dict()}, f, ensure_ascii=False, separators=(',', ':'))
+        except OSError as e:
+            print(f" No se pudo escribir '{self.ruta}': {e}")
+
+    def _vaciar(self) -> None:
+        raise NotImplementedError
+
+    def _contar(self, *fuente: Any) -> None:
+        raise NotImplementedError
+
+    def _a_dict(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def _de_dict(self, data: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+
+def _normalizar(firma: Any) -> Any:
+    """Las firmas se comparan como listas (así vuelven del JSON)."""
+    return json.loads(json.dumps(firma)) if firma is not None else None
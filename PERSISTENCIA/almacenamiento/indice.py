@@ -0,0 +1,305 @@
+import json
+import os
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .atomico import escribir_atomico
+from .backends import Backend, BackendJSON, BackendJSONL
+from .cache import firma_archivo
+
+# ====================================================================
+# --- ÍNDICE PRIMARIO PERSISTENTE ---
+# ====================================================================
+# Archivo auxiliar "<datos>.idx" con la posición (offset y largo en bytes) de
+# cada registro dentro del archivo de datos. Una búsqueda por clave hace un
+# seek y decodifica solo ese registro. Sirve para arreglos JSON (con o sin
+# sangría) y para JSON Lines.
+
+_SEPARADORES = re.compile(r'[\s,\[\]]*')
+
+
+def recorrer_registros(texto: str) -> Iterator[Tuple[Any, int, int]]:
+    """Recorre un arreglo JSON o un archivo JSON Lines: (registro, inicio, fin) en caracteres."""
+    decodificador = json.JSONDecoder()
+    pos = _SEPARADORES.match(texto, 0).end()
+    while pos < len(texto):
+        registro, fin = decodificador.raw_decode(texto, pos)
+        yield registro, pos, fin
+        pos = _SEPARADORES.match(texto, fin).end()
+
+
+def posiciones_registros(crudo: bytes, base: int = 0) -> Iterator[Tuple[Any, int, int]]:
+    """Como recorrer_registros, pero con (offset, largo) en bytes; 'base' es el offset de 'crudo' en el archivo."""
+    texto = crudo.decode('utf-8')
+    ascii_puro = len(texto) == len(crudo)
+    pos_texto, pos_bytes = 0, base
+    for registro, inicio, fin in recorrer_registros(texto):
+        if ascii_puro:
+            yield registro, base + inicio, fin - inicio
+            continue
+        offset = pos_bytes + len(texto[pos_texto:inicio].encode('utf-8'))
+        largo = len(texto[inicio:fin].encode('utf-8'))
+        pos_texto, pos_bytes = fin, offset + largo
+        yield registro, offset, largo
+
+
+def prefijo_intacto(ruta: str, ultimo: int, fin: int) -> bool:
+    """El último registro indexado (en [ultimo, fin)) sigue en su lugar: el archivo solo creció al final."""
+    if not fin:
+        return True
+    try:
+        with open(ruta, 'rb') as f:
+            f.seek(ultimo)
+            return isinstance(json.loads(f.read(fin - ultimo)), dict)
+    except (OSError, ValueError):
+        return False
+
+
+class IndicePrimario:
+    """Índice clave -> (offset, largo) de los registros de un archivo JSON/JSONL."""
+
+    def __init__(self, ruta: str, campo: str, backend: Optional[Backend] = None):
+        if backend is not None and not isinstance(backend, (BackendJSON, BackendJSONL)):
+            raise ValueError(f"El índice primario solo admite archivos JSON o JSON Lines, no {type(backend).__name__}.")
+        self.ruta = ruta
+        self.campo = campo
+        self.ruta_indice = ruta + ".idx"
+        self._firma: Optional[Tuple[int, int]] = None
+        self._claves: Set[Any] = set()
+        # None = se conocen las claves pero no las posiciones (se reconstruyen al buscar)
+        self._posiciones: Optional[Dict[Any, Tuple[int, int]]] = {}
+        self._ultimo = 0  # offset del último registro del archivo
+        self._fin = 0     # byte donde termina el último registro indexado
+
+    def contiene(self, clave: Any) -> bool:
+        """Chequeo de unicidad O(1), sin deserializar registros."""
+        self._asegurar_claves()
+        return clave in self._claves
+
+    def claves(self) -> Set[Any]:
+        self._asegurar_claves()
+        return set(self._claves)
+
+    def buscar(self, clave: Any) -> Optional[Dict[str, Any]]:
+        """Retorna el diccionario del registro con esa clave, leyendo solo sus bytes."""
+        self._asegurar_claves()
+        if self._posiciones is None:
+            self.reconstruir()
+        posicion = self._posiciones.get(clave)
+        if posicion is None:
+            return None
+        offset, largo = posicion
+        with open(self.ruta, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.read(largo))
+
+    def registrar_agregados(self, firma_antes: Optional[Tuple[int, int]]) -> None:
+        """Tras agregar registros al final del archivo: indexa solo la cola nueva y guarda el .idx.
+
+        Si el índice no reflejaba la versión anterior del archivo (firma_antes),
+        o lo ya indexado cambió de lugar, se reconstruye completo.
+        """
+        al_dia = self._firma is not None and self._firma == firma_antes and self._posiciones is not None
+        if not al_dia and not (firma_antes is not None and self._leer_indice(firma_antes)):
+            self.reconstruir()
+            return
+        if not prefijo_intacto(self.ruta, self._ultimo, self._fin):
+            self.reconstruir()
+            return
+        with open(self.ruta, 'rb') as f:
+            f.seek(self._fin)
+            cola = f.read()
+        for registro, offset, largo in posiciones_registros(cola, self._fin):
+            self._posiciones.setdefault(registro[self.campo], (offset, largo))
+            self._claves.add(registro[self.campo])
+            self._ultimo, self._fin = offset, offset + largo
+        self._firma = firma_archivo(self.ruta)
+        self._escribir()
+
+    def registrar_claves(self, claves: Iterable[Any]) -> None:
+        """Tras reescribir el archivo completo (no solo agregar): actualiza las claves sin releerlo.
+
+        Las posiciones quedan pendientes y se recalculan en la próxima búsqueda.
+        """
+        self._claves = set(claves)
+        self._posiciones = None
+        self._firma = firma_archivo(self.ruta)
+
+    def reconstruir(self) -> None:
+        """Recorre el archivo de datos una vez y reescribe el índice auxiliar."""
+        self._firma = firma_archivo(self.ruta)
+        self._posiciones = {}
+        self._ultimo = self._fin = 0
+        if self._firma is not None:
+            with open(self.ruta, 'rb') as f:
+                crudo = f.read()
+            for registro, offset, largo in posiciones_registros(crudo):
+                self._posiciones.setdefault(registro[self.campo], (offset, largo))
+                self._ultimo, self._fin = offset, offset + largo
+        self._claves = set(self._posiciones)
+        self._escribir()
+
+    def _escribir(self) -> None:
+        try:
+            with escribir_atomico(self.ruta_indice) as f:
+                json.dump({"firma": self._firma, "ultimo": self._ultimo, "fin": self._fin,
+                           "posiciones": [[c, o, l] for c, (o, l) in self._posiciones.items()]}, f)
+        except OSError as e:
+            print(f" No se pudo escribir el índice '{self.ruta_indice}': {e}")
+
+
+    def _asegurar_claves(self) -> None:
+        firma = firma_archivo(self.ruta)
+        if firma is None:
+            self._firma, self._claves, self._posiciones = None, set(), {}
+            return
+        if firma == self._firma:
+            return
+        if not self._leer_indice(firma):
+            self.reconstruir()
+
+    def _leer_indice(self, firma: Tuple[int, int]) -> bool:
+        """Carga el índice auxiliar si corresponde a la versión actual del archivo."""
+        if not os.path.exists(self.ruta_indice):
+            return False
+        try:
+            with open(self.ruta_indice, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+        if data.get("firma") != list(firma) or "fin" not in data:
+            return False
+        self._posiciones = {c: (o, l) for c, o, l in data["posiciones"]}
+        self._claves = set(self._posiciones)
+        self._ultimo, self._fin = data["ultimo"], data["fin"]
+        self._firma = firma
+        return True
+
+
+# ====================================================================
+# --- ÍNDICE SECUNDARIO ORDENADO ---
+# ====================================================================
+# Archivo auxiliar "<datos>.<campo>.ord": una línea JSON de cabecera y luego
+# tres arreglos compactos (array) paralelos ordenados por valor: el valor del
+# campo, el offset y el largo en bytes de cada registro. Una consulta por
+# rango son dos bisect y un seek por resultado. Los arreglos se escriben en el
+# orden de bytes de la máquina: el .ord no se copia entre equipos (se regenera).
+
+
+class IndiceOrdenado:
+    """Índice valor -> (offset, largo) ordenado por un campo numérico, para consultas por rango."""
+
+    def __init__(self, ruta: str, campo: str, backend: Optional[Backend] = None):
+        if backend is not None and not isinstance(backend, (BackendJSON, BackendJSONL)):
+            raise ValueError(f"El índice ordenado solo admite archivos JSON o JSON Lines, no {type(backend).__name__}.")
+        self.ruta = ruta
+        self.campo = campo
+        self.ruta_indice = f"{ruta}.{campo}.ord"
+        self._firma: Optional[Tuple[int, int]] = None
+        self._valores = array('d')
+        self._offsets = array('q')
+        self._largos = array('q')
+        self._ultimo = 0  # offset del último registro del archivo
+        self._fin = 0     # byte donde termina el último registro indexado
+
+    def rango(self, x: float, y: float) -> List[Dict[str, Any]]:
+        """Registros con x <= campo <= y, en el orden del archivo: O(log n + k)."""
+        self._asegurar()
+        desde, hasta = bisect_left(self._valores, x), bisect_right(self._valores, y)
+        if desde >= hasta:
+            return []
+        elegidos = sorted(zip(self._offsets[desde:hasta], self._largos[desde:hasta]))
+        registros = []
+        with open(self.ruta, 'rb') as f:
+            for offset, largo in elegidos:
+                f.seek(offset)
+                registros.append(json.loads(f.read(largo)))
+        return registros
+
+    def registrar_agregados(self, firma_antes: Optional[Tuple[int, int]]) -> None:
+        """Tras agregar registros al final del archivo: indexa solo la cola nueva.
+
+        Si el índice no reflejaba la versión anterior del archivo (firma_antes),
+        o lo ya indexado cambió de lugar, se reconstruye completo.
+        """
+        al_dia = self._firma is not None and self._firma == firma_antes
+        if not al_dia and not (firma_antes is not None and self._leer_indice(firma_antes)):
+            self.reconstruir()
+            return
+        if not prefijo_intacto(self.ruta, self._ultimo, self._fin):
+            self.reconstruir()
+            return
+        with open(self.ruta, 'rb') as f:
+            f.seek(self._fin)
+            cola = f.read()
+        for registro, offset, largo in posiciones_registros(cola, self._fin):
+            i = bisect_right(self._valores, registro[self.campo])
+            self._valores.insert(i, registro[self.campo])
+            self._offsets.insert(i, offset)
+            self._largos.insert(i, largo)
+            self._ultimo, self._fin = offset, offset + largo
+        self._firma = firma_archivo(self.ruta)
+        self._escribir()
+
+    def reconstruir(self) -> None:
+        """Recorre el archivo de datos una vez, ordena y reescribe el índice auxiliar."""
+        self._firma = firma_archivo(self.ruta)
+        filas: List[Tuple[float, int, int]] = []
+        self._ultimo = self._fin = 0
+        if self._firma is not None:
+            with open(self.ruta, 'rb') as f:
+                crudo = f.read()
+            for registro, offset, largo in posiciones_registros(crudo):
+                filas.append((registro[self.campo], offset, largo))
+                self._ultimo, self._fin = offset, offset + largo
+        filas.sort()
+        self._valores = array('d', (v for v, _, _ in filas))
+        self._offsets = array('q', (o for _, o, _ in filas))
+        self._largos = array('q', (l for _, _, l in filas))
+        self._escribir()
+
+    def _asegurar(self) -> None:
+        firma = firma_archivo(self.ruta)
+        if firma is None:
+            self._firma, self._valores, self._offsets, self._largos = None, array('d'), array('q'), array('q')
+            self._ultimo = self._fin = 0
+            return
+        if firma == self._firma:
+            return
+        if not self._leer_indice(firma):
+            self.reconstruir()
+
+
+    def _leer_indice(self, firma: Tuple[int, int]) -> bool:
+        """Carga el índice auxiliar si corresponde a esa versión del archivo."""
+        if not os.path.exists(self.ruta_indice):
+            return False
+        try:
+            with open(self.ruta_indice, 'rb') as f:
+                cabecera = json.loads(f.readline())
+                if cabecera.get("firma") != list(firma) or cabecera.get("campo") != self.campo:
+                    return False
+                valores, offsets, largos = array('d'), array('q'), array('q')
+                for arreglo in (valores, offsets, largos):
+                    arreglo.fromfile(f, cabecera["n"])
+        except (OSError, ValueError, KeyError, EOFError):
+            return False
+        self._valores, self._offsets, self._largos = valores, offsets, largos
+        self._ultimo, self._fin = cabecera["ultimo"], cabecera["fin"]
+        self._firma = firma
+        return True
+
+    def _escribir(self) -> None:
+        if self._firma is None:
+            return
+        cabecera = {"firma": self._firma, "campo": self.campo, "n": len(self._valores),
+                    "ultimo": self._ultimo, "fin": self._fin}
+        try:
+            with escribir_atomico(self.ruta_indice, 'wb') as f:
+                f.write(json.dumps(cabecera).encode('utf-8') + b"\n")
+                for arreglo in (self._valores, self._offsets, self._largos):
+                    arreglo.tofile(f)
+        except OSError as e:
+            print(f" No se pudo escribir el índice '{self.ruta_indice}': {e}")
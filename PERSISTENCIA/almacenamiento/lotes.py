@@ -0,0 +1,54 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .backends import Backend
+from .cache import CacheArchivos, firma_archivo
+from .indice import IndicePrimario
+
+# ====================================================================
+# --- ALTAS POR LOTE ---
+# ====================================================================
+
+
+def separar_duplicados(items: Iterable[Any], existentes: Set[Any],
+                       clave: Callable[[Any], Any]) -> Tuple[List[Any], Dict[str, Any]]:
+    """Separa los items nuevos de los repetidos (contra el archivo y dentro del mismo lote).
+
+    Retorna (nuevos, reporte) con reporte = {"guardados": int, "duplicados": [claves]}.
+    """
+    vistas = set(existentes)
+    nuevos: List[Any] = []
+    duplicados: List[Any] = []
+    for item in items:
+        k = clave(item)
+        if k in vistas:
+            duplicados.append(k)
+        else:
+            vistas.add(k)
+            nuevos.append(item)
+    return nuevos, {"guardados": len(nuevos), "duplicados": duplicados}
+
+
+def agregar_registros(ruta: str, objetos: List[Any], backend: Backend,
+                      indice: Optional[IndicePrimario] = None, cache: Optional[CacheArchivos] = None) -> bool:
+    """Añade objetos (con to_dict) al final del archivo sin armar los que ya estaban.
+
+    El cache, si estaba vigente, recibe los objetos nuevos; el índice primario
+    indexa solo la cola agregada. Retorna False si no se pudo escribir.
+    """
+    antes = firma_archivo(ruta)
+    en_cache = cache.vigente(ruta) if cache is not None else None
+    try:
+        backend.agregar(ruta, [o.to_dict() for o in objetos])
+    except Exception as e:
+        if cache is not None:
+            cache.invalidar(ruta)
+        print(f" Error al guardar en {ruta}: {e}")
+        return False
+    if cache is not None:
+        if en_cache is not None:
+            cache.recordar(ruta, en_cache + list(objetos))
+        else:
+            cache.invalidar(ruta)
+    if indice is not None:
+        indice.registrar_agregados(antes)
+    return True
@@ -0,0 +1,68 @@
+import io
+import time
+from contextlib import nullcontext, redirect_stdout
+from typing import Any, Callable, Iterable, List, Sequence, Tuple
+
+# ====================================================================
+# --- MEDICIÓN (benchmarks de los ejercicios) ---
+# ====================================================================
+# Los benchmark_*.py de cada ejercicio arman sus datos y sus casos, y toman
+# los tiempos con estas funciones. Los tiempos son en segundos; cada script
+# los convierte a la unidad de su tabla.
+
+
+def medir(funcion: Callable[[], Any], veces: int = 1, silencioso: bool = False) -> Tuple[float, Any]:
+    """Segundos promedio por llamada de funcion() en veces llamadas, y el resultado de la última.
+
+    Con silencioso=True los print de lo medido no salen por pantalla (igual cuentan en el tiempo).
+    """
+    resultado = None
+    with redirect_stdout(io.StringIO()) if silencioso else nullcontext():
+        inicio = time.perf_counter()
+        for _ in range(veces):
+            resultado = funcion()
+        segundos = time.perf_counter() - inicio
+    return segundos / veces, resultado
+
+
+def mejor_de(funcion: Callable[[], Any], veces: int, silencioso: bool = False) -> Tuple[float, Any]:
+    """Segundos de la llamada más rápida de funcion() entre veces llamadas, y el resultado de la última."""
+    mejor, resultado = float("inf"), None
+    for _ in range(veces):
+        segundos, resultado = medir(funcion, silencioso=silencioso)
+        mejor = min(mejor, segundos)
+    return mejor, resultado
+
+
+# --- Inventarios en memoria (Farmacia con medicamentos, Zoologico con animales) ---
+
+N_ELIMINAR = 1_000
+
+
+def medir_inventario(tamanos: Iterable[int],
+                     construir: Callable[[int], Any],
+                     mover: Callable[[int], Callable[[], Any]],
+                     eliminar: Callable[[int, int], Callable[[], Any]]) -> List[Tuple[int, float, float, float, float]]:
+    """Filas (n, construir, from_dict, mover, eliminar) en ms para cada tamaño n.
+
+    construir(n) arma el contenedor con n elementos de a uno; mover(n) y
+    eliminar(n, paso) preparan el caso y retornan la operación a medir
+    (eliminar, uno de cada paso elementos: N_ELIMINAR en total).
+    """
+    filas = []
+    for n in tamanos:
+        t_construir, contenedor = medir(lambda: construir(n), silencioso=True)
+        data = contenedor.to_dict()
+        t_cargar, _ = medir(lambda: type(contenedor).from_dict(data), silencioso=True)
+        t_mover, _ = medir(mover(n), silencioso=True)
+        t_eliminar, _ = medir(eliminar(n, max(1, n // N_ELIMINAR)), silencioso=True)
+        filas.append((n, t_construir * 1000, t_cargar * 1000, t_mover * 1000, t_eliminar * 1000))
+    return filas
+
+
+def imprimir_inventario(elementos: str, operacion_mover: str,
+                        filas: Sequence[Tuple[int, float, float, float, float]]) -> None:
+    print(f"{elementos:>12} {'construir (ms)':>15} {'from_dict (ms)':>15} {operacion_mover + ' (ms)':>15} "
+          f"{f'eliminar {N_ELIMINAR} (ms)':>19}")
+    for n, t_construir, t_cargar, t_mover, t_eliminar in filas:
+        print(f"{n:12,} {t_construir:15.1f} {t_cargar:15.1f} {t_mover:15.1f} {t_eliminar:19.1f}")
@@ -0,0 +1,78 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .backends import Backend, BackendJSON, BackendJSONL, ErrorAlmacenamiento
+
+# ====================================================================
+# --- CARGA EN PARALELO (JSON LINES) ---
+# ====================================================================
+# Parsear un archivo grande es trabajo de CPU que corre en un solo núcleo. En
+# JSON Lines cada registro ocupa una línea, así que el archivo se puede cortar
+# en rangos de bytes y repartirlos entre procesos: cada uno alinea su rango al
+# siguiente salto de línea y parsea sus registros; el proceso principal los
+# recibe en orden y arma los objetos (from_dict). Un arreglo JSON no se puede
+# cortar sin recorrerlo: con otros backends (o archivos chicos) se carga en
+# serie como siempre.
+#
+# Los objetos se arman en el proceso principal y no en los hijos porque
+# tienen que terminar en su memoria de todos modos: recibirlos por pickle
+# (crear cada instancia y su __dict__) cuesta más que construirlos con
+# from_dict a partir de diccionarios, que llegan por pickle bastante más
+# rápido de lo que json.loads los parsea. Ver EJERCICIO9/benchmark_carga_paralela.py.
+
+MINIMO_PARALELO = 1 << 20  # Debajo de 1 MB levantar procesos cuesta más que parsear
+
+
+def rangos_lineas(ruta: str, partes: int) -> List[Tuple[int, int]]:
+    """Corta el archivo en hasta 'partes' rangos [inicio, fin) de bytes que empiezan y terminan en un salto de línea."""
+    tamano = os.path.getsize(ruta)
+    cortes = [0]
+    with open(ruta, 'rb') as f:
+        for i in range(1, partes):
+            objetivo = tamano * i // partes
+            if objetivo <= cortes[-1]:
+                continue
+            f.seek(objetivo)
+            f.readline()  # Termina la línea en curso: el corte queda justo después de un '\n'
+            pos = f.tell()
+            if cortes[-1] < pos < tamano:
+                cortes.append(pos)
+    cortes.append(tamano)
+    return [(a, b) for a, b in zip(cortes, cortes[1:]) if a < b]
+
+
+def _parsear_rango(ruta: str, inicio: int, fin: int) -> List[Dict[str, Any]]:
+    with open(ruta, 'rb') as f:
+        f.seek(inicio)
+        crudo = f.read(fin - inicio)
+    data = []
+    for nro, linea in enumerate(crudo.splitlines(), 1):
+        if not linea.strip():
+            continue
+        try:
+            data.append(json.loads(linea))
+        except json.JSONDecodeError as e:
+            raise ErrorAlmacenamiento(f"Línea {nro} del bloque que empieza en el byte {inicio} "
+                                      f"inválida en '{ruta}': {e}") from e
+    return data
+
+
+def cargar_paralelo(ruta: str, convertir: Callable[[Dict[str, Any]], Any], procesos: int,
+                    backend: Optional[Backend] = None) -> List[Any]:
+    """Carga y convierte todos los registros del archivo repartiendo el parseo en 'procesos' procesos.
+
+    Mismo resultado (y mismo orden) que [convertir(d) for d in backend.cargar(ruta)], incluido
+    ErrorAlmacenamiento si hay una línea inválida: el que llama decide si respalda el archivo.
+    """
+    backend = backend or BackendJSON()
+    if (procesos <= 1 or not isinstance(backend, BackendJSONL) or not os.path.exists(ruta)
+            or os.path.getsize(ruta) < MINIMO_PARALELO):
+        return [convertir(d) for d in backend.cargar(ruta)]
+
+    rangos = rangos_lineas(ruta, procesos * 4)  # Rangos más chicos que procesos: el principal empieza a convertir antes
+    with ProcessPoolExecutor(max_workers=min(procesos, len(rangos))) as pool:
+        partes = pool.map(_parsear_rango, [ruta] * len(rangos), [a for a, _ in rangos], [b for _, b in rangos])
+        # map entrega en orden: mientras se convierte un rango los hijos siguen parseando los siguientes
+        return [convertir(d) for parte in partes for d in parte]
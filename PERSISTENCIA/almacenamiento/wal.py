@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from .atomico import sincronizar_carpeta
+
+try:
+    import fcntl
+except ImportError:  # Windows: el .wal no se puede reservar entre procesos
+    fcntl = None
+
+# ====================================================================
+# --- REGISTRO DE TRANSACCIONES (WAL) ---
+# ====================================================================
+# Archivo "<datos>.wal" con una línea JSON por entrada:
+#   {"base": sha256 del archivo de datos al abrir la transacción}
+#   {"op": {...}}            una por operación lógica (se reaplican en orden)
+#   {"commit": true}         se escribe y se fuerza a disco al confirmar
+# Si el programa se corta después del commit pero antes de reescribir el
+# archivo de datos, al reiniciar el gestor vuelve a aplicar las operaciones.
+# Si el archivo ya no coincide con "base", los cambios ya estaban guardados.
+#
+# Quien abre la transacción toma un flock exclusivo sobre el .wal y lo
+# mantiene hasta descartarlo o soltarlo. Un gestor que busca transacciones
+# pendientes (otra instancia, otro proceso) solo lee o borra el .wal si
+# puede tomar ese flock: un .wal con dueño vivo no se toca. Si el dueño se
+# cae, el sistema libera el flock y el .wal queda para recuperar.
+
+
+def huella_archivo(ruta: str) -> str:
+    """sha256 del contenido del archivo ("" si no existe)."""
+    if not os.path.exists(ruta):
+        return ""
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+class RegistroTransacciones:
+    """Registro de escritura anticipada de un archivo de datos."""
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self.ruta_wal = ruta + ".wal"
+        self._f = None
+        self._base: Optional[str] = None
+
+    @property
+    def abierta(self) -> bool:
+        return self._f is not None
+
+    def iniciar(self) -> None:
+        """Abre una transacción nueva sobre un .wal vacío.
+
+        Se niega (RuntimeError) si el .wal tiene una transacción confirmada que
+        todavía no llegó al archivo de datos: hay que recuperarla antes
+        (pendientes()), si no se perdería al truncar.
+        """
+        if self._f is not None:
+            raise RuntimeError("Ya hay una transacción abierta.")
+        if not self._tomar(crear=True):
+            raise RuntimeError(f"Otra transacción está abierta sobre '{self.ruta}'.")
+        if self._leer_confirmadas() is not None:
+            self.soltar()
+            raise RuntimeError(f"Hay una transacción confirmada sin aplicar en '{self.ruta_wal}'.")
+        self._f.seek(0)
+        self._f.truncate()
+        self._base = huella_archivo(self.ruta)
+        self._escribir({"base": self._base})
+
+    def registrar(self, operacion: Dict[str, Any]) -> None:
+        self._verificar_abierta()
+        self._escribir({"op": operacion})
+
+    def confirmar(self) -> bool:
+        """Punto de durabilidad: anota el commit y fuerza el registro a disco.
+
+        Retorna False (y descarta la transacción) si el archivo de datos cambió
+        por otro camino desde iniciar().
+        """
+        self._verificar_abierta()
+        if huella_archivo(self.ruta) != self._base:
+            self.descartar()
+            return False
+        self._escribir({"commit": True})
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        sincronizar_carpeta(os.path.dirname(os.path.abspath(self.ruta_wal)))
+        return True  # el .wal sigue reservado hasta descartar() o soltar()
+
+    def descartar(self) -> None:
+        """Cierra y borra el registro (tras aplicarlo o al hacer rollback).
+
+        Sin una transacción propia, solo lo borra si nadie más lo tiene reservado.
+        """
+        if self._f is None and not self._tomar(crear=False):
+            return
+        try:
+            os.remove(self.ruta_wal)
+        except FileNotFoundError:
+            pass
+        self.soltar()
+
+    def soltar(self) -> None:
+        """Libera el registro sin borrarlo (un commit que no llegó al archivo de datos queda para recuperar)."""
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def pendientes(self) -> Optional[List[Dict[str, Any]]]:
+        """Operaciones confirmadas que todavía no llegaron al archivo de datos (None si no hay).
+
+        Si hay, el registro queda reservado: después de aplicarlas hay que
+        llamar a descartar() (o a soltar() si no se pudieron guardar).
+        """
+        if self._f is not None or not self._tomar(crear=False):
+            return None  # transacción propia en curso, no hay .wal o tiene dueño vivo
+        operaciones = self._leer_confirmadas()
+        if operaciones is None:
+            self.descartar()  # sin commit (se revierte) o ya aplicada
+        return operaciones
+
+    def _leer_confirmadas(self) -> Optional[List[Dict[str, Any]]]:
+        """Operaciones del .wal ya reservado si están confirmadas y sin aplicar (None si no)."""
+        entradas = []
+        self._f.seek(0)
+        for linea in self._f:
+            try:
+                entradas.append(json.loads(linea))
+            except json.JSONDecodeError:
+                break  # línea cortada: la transacción no llegó a confirmarse
+        confirmada = len(entradas) >= 2 and entradas[-1].get("commit") is True
+        if not confirmada or entradas[0].get("base") != huella_archivo(self.ruta):
+            return None
+        return [e["op"] for e in entradas[1:-1]]
+
+    def _tomar(self, crear: bool) -> bool:
+        """Abre el .wal y lo reserva con un flock exclusivo. False si no existe o lo tiene otra transacción."""
+        while True:
+            try:
+                fd = os.open(self.ruta_wal, os.O_RDWR | (os.O_CREAT if crear else 0), 0o666)
+            except FileNotFoundError:
+                return False
+            if fcntl is not None:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    os.close(fd)
+                    return False
+            try:
+                mismo = os.fstat(fd).st_ino == os.stat(self.ruta_wal).st_ino
+            except FileNotFoundError:
+                mismo = False
+            if mismo:
+                self._f = os.fdopen(fd, 'r+')
+                return True
+            os.close(fd)  # el dueño anterior lo borró mientras se esperaba: se intenta con el actual
+            if not crear:
+                return False
+
+    def _escribir(self, entrada: Dict[str, Any]) -> None:
+        self._f.write(json.dumps(entrada, separators=(',', ':')) + "\n")
+
+    def _verificar_abierta(self) -> None:
+        if self._f is None:
+            raise RuntimeError("No hay una transacción abierta.")
@@ -0,0 +1,75 @@
+import os
+import sys
+import tracemalloc
+
+# Las entidades viven en las carpetas de cada ejercicio
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+for ejercicio in ("EJERCICIO2", "EJERCICIO3", "EJERCICIO4", "EJERCICIO5", "EJERCICIO6",
+                  "EJERCICIO7", "EJERCICIO8", "EJERCICIO9", "EJERCICIO10"):
+    sys.path.append(os.path.join(CARPETA, ejercicio))
+
+from trabajador import Trabajador
+from producto import Producto
+from modelo import Estudiante
+from farmacia import Medicamento
+from biblioteca import Libro, Prestamo
+from nino import Nino
+from alimento import Alimento
+from zoo import Animal
+from jugador import Jugador
+
+# Uso: python benchmark_memoria.py [REGISTROS]
+# Bytes por registro (tracemalloc) de cada entidad con __slots__ contra la misma
+# entidad guardando sus atributos en un __dict__, como eran antes. Los valores
+# (strings, números) se crean antes de medir y son los mismos en las dos
+# versiones: solo se cuenta el objeto (y su lugar en la lista).
+N_REGISTROS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+ENTIDADES = [
+    (Trabajador, lambda i: (f"Trabajador{i}", i, 1000.0 + i)),
+    (Producto, lambda i: (i, f"Producto{i}", 1.5 + i)),
+    (Estudiante, lambda i: (i, f"Estudiante{i}", "Perez", "Lopez", 20)),
+    (Medicamento, lambda i: (f"Med{i}", i, "Tos", 2.0 + i)),
+    (Libro, lambda i: (i, f"Libro{i}", 10.0 + i)),
+    (Prestamo, lambda i: (i, i, "2024-05-01", 1 + i % 3)),
+    (Nino, lambda i: (f"Nino{i}", "Perez", "Lopez", i, 5, "20 kg", "110 cm")),
+    (Alimento, lambda i: (f"Alimento{i}", "2025-01-01", i)),
+    (Animal, lambda i: ("Ave", f"Animal{i}", i)),
+    (Jugador, lambda i: (f"Jugador{i}", i % 10, i)),
+]
+
+
+class ConDict:
+    """Registro con los mismos atributos que la entidad, asignados uno por uno en __dict__."""
+    def __init__(self, valores):
+        for nombre, valor in valores:
+            setattr(self, nombre, valor)
+
+
+def nombres_slots(clase):
+    # Los de la clase base primero: es el orden en que __init__ los asigna (Persona -> Nino)
+    return [s for c in reversed(clase.__mro__) for s in c.__dict__.get("__slots__", ())]
+
+
+def bytes_por_objeto(crear, argumentos):
+    tracemalloc.start()
+    objetos = [crear(a) for a in argumentos]
+    bytes_usados = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objetos
+    return bytes_usados / len(argumentos)
+
+
+if __name__ == "__main__":
+    print(f"{N_REGISTROS:,} registros por entidad (bytes por objeto, sin contar los valores)")
+    print(f"{'Entidad':12} {'__dict__':>9} {'__slots__':>10} {'ahorro':>7} {'ahorro a 10^7 registros':>24}")
+    for clase, valores in ENTIDADES:
+        argumentos = [valores(i) for i in range(N_REGISTROS)]
+        nombres = nombres_slots(clase)
+        pares = [tuple(zip(nombres, a)) for a in argumentos]
+        con_dict = type(f"{clase.__name__}ConDict", (ConDict,), {}) # Una clase por entidad: comparte las claves del dict
+        b_dict = bytes_por_objeto(con_dict, pares)
+        b_slots = bytes_por_objeto(lambda a: clase(*a), argumentos)
+        ahorro = b_dict - b_slots
+        print(f"{clase.__name__:12} {b_dict:9.0f} {b_slots:10.0f} {ahorro / b_dict:6.0%} "
+              f"{ahorro * 10**7 / 2**30:20.2f} GiB")